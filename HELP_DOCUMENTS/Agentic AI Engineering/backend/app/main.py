@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 import structlog
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import get_settings
@@ -63,6 +64,8 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
     allow_headers=["*"],
 )
+# Habit lists are repetitive JSON; skip bodies too small to be worth it
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # Routers
 app.include_router(habits.router, prefix="/api")
@@ -0,0 +1,265 @@
+"""
+==============================================================================
+Benchmark: HTTP Layer Throughput and Latency
+==============================================================================
+Location: benchmarks/http_overhead.py
+Purpose: Requests/second and p50/p99 latency per endpoint at several
+         concurrency levels, saved as JSON for run-to-run comparison
+Usage: python -m benchmarks.http_overhead --concurrency 1,8,32 --requests 2000
+==============================================================================
+
+Requests go through the full ASGI app (middleware, routing, validation,
+coalescing, serialization) in-process over httpx's ASGI transport, so no
+sockets or server are involved. The database is a FakePool answering every
+statement after `--latency-ms` (plus up to `--jitter-ms` of random extra),
+so the numbers show the app's own overhead on top of a known query cost.
+
+Concurrent identical reads are coalesced by the single-flight layer, just as
+in production, so at high concurrency the fake pool sees fewer statements
+than there are requests.
+
+Each run writes a JSON file (default: benchmarks/results/http_overhead-<UTC
+time>.json). Pass an earlier file as --baseline to print the change in rps
+and p99 for every endpoint and concurrency level.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.fakes import FakePool
+from src.main import app, get_db_pool
+
+# name -> path; {user_id} / {user_ids} are filled from the fake rows
+ENDPOINTS = {
+    "liveness": "/health/live",
+    "list_users": "/users?limit=20",
+    "get_user": "/users/{user_id}",
+    "users_by_ids": "/users?ids={user_ids}",
+    "list_projects": "/projects?limit=20",
+    "sparse_users": "/users?limit=20&fields=id,username",
+}
+
+# Planner estimate returned for the X-Total-Count EXPLAIN (skips count(*))
+ESTIMATED_ROWS = 100_000
+
+
+def make_rows(count: int):
+    """Users and projects shaped like the listing SELECTs"""
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    users = [
+        {
+            "id": f"00000000-0000-4000-8000-{i:012d}",
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "full_name": f"User Number {i}",
+            "is_active": True,
+            "created_at": base - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+    projects = [
+        {
+            "id": f"00000000-0000-4000-9000-{i:012d}",
+            "name": f"Project {i}",
+            "description": "Benchmark project",
+            "status": "active",
+            "created_at": base - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+    return users, projects
+
+
+def make_pool(latency_ms: float, jitter_ms: float, rows: int) -> FakePool:
+    """FakePool answering the listing, lookup and count statements"""
+    users, projects = make_rows(rows)
+    by_id = {user["id"]: user for user in users}
+    plan = json.dumps([{"Plan": {"Plan Rows": ESTIMATED_ROWS}}])
+
+    def respond(method, query, args):
+        if method == "fetchval":
+            return plan if query.startswith("EXPLAIN") else ESTIMATED_ROWS
+        if method == "fetchrow":
+            return by_id.get(args[0])
+        if "ANY(" in query:
+            return [by_id[key] for key in args[0] if key in by_id]
+        return projects if "FROM projects" in query else users
+
+    latency, jitter = latency_ms / 1000, jitter_ms / 1000
+    return FakePool(
+        responder=respond,
+        latency=(lambda: latency + random.uniform(0, jitter)) if jitter else latency,
+    )
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_level(client: httpx.AsyncClient, path: str, concurrency: int,
+                    requests: int, warmup: int) -> Dict[str, Any]:
+    """
+    Send `requests` GETs to `path` from `concurrency` workers.
+
+    Returns:
+        dict: Throughput, latency percentiles (ms) and error count
+    """
+    for _ in range(warmup):
+        await client.get(path)
+
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def run_suite(endpoints: Dict[str, str], concurrency: List[int], requests: int,
+                    warmup: int, pool: FakePool) -> List[Dict[str, Any]]:
+    """Every endpoint at every concurrency level, against `pool`"""
+    app.dependency_overrides[get_db_pool] = lambda: pool
+    transport = httpx.ASGITransport(app=app)
+    results = []
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, path in endpoints.items():
+                for level in concurrency:
+                    result = await run_level(client, path, level, requests, warmup)
+                    results.append({"endpoint": name, "path": path, **result})
+                    print(format_row(results[-1]))
+    finally:
+        app.dependency_overrides.clear()
+    return results
+
+
+def format_row(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    line = (
+        f"  {result['endpoint']:<14} c={result['concurrency']:<4} "
+        f"{result['rps']:>9.1f} rps   p50 {result['p50_ms']:>8.3f} ms   "
+        f"p99 {result['p99_ms']:>8.3f} ms   errors {result['errors']}"
+    )
+    if baseline:
+        rps = (result["rps"] / baseline["rps"] - 1) * 100 if baseline["rps"] else 0.0
+        p99 = (result["p99_ms"] / baseline["p99_ms"] - 1) * 100 if baseline["p99_ms"] else 0.0
+        line += f"   (rps {rps:+.1f}%, p99 {p99:+.1f}%)"
+    return line
+
+
+def git_commit() -> Optional[str]:
+    """Current commit, if run from a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    """Print each result next to the same endpoint/concurrency in a saved run"""
+    with open(baseline_path) as f:
+        previous = {
+            (row["endpoint"], row["concurrency"]): row for row in json.load(f)["results"]
+        }
+    print(f"Compared with {baseline_path}")
+    for result in results:
+        print(format_row(result, previous.get((result["endpoint"], result["concurrency"]))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--concurrency", default="1,8,32,128",
+                        help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per level")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per level")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Fake query latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency (max)")
+    parser.add_argument("--rows", type=int, default=100, help="Rows the fake pool holds")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS),
+                        help=f"Comma-separated subset of: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--output", help="JSON results file (default: timestamped, benchmarks/results/)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    # Per-request access logs would dominate the measurement
+    logging.disable(logging.INFO)
+
+    users, _ = make_rows(args.rows)
+    ids = ",".join(user["id"] for user in users[:10])
+    endpoints = {
+        name: ENDPOINTS[name].format(user_id=users[0]["id"], user_ids=ids)
+        for name in args.endpoints.split(",")
+    }
+    concurrency = [int(level) for level in args.concurrency.split(",")]
+    pool = make_pool(args.latency_ms, args.jitter_ms, args.rows)
+
+    print(f"{args.requests} requests per level, fake query latency {args.latency_ms} ms "
+          f"(+ up to {args.jitter_ms} ms)")
+    results = asyncio.run(run_suite(endpoints, concurrency, args.requests, args.warmup, pool))
+
+    started = datetime.now(timezone.utc)
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"http_overhead-{started:%Y%m%dT%H%M%SZ}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "benchmark": "http_overhead",
+            "timestamp": started.isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "settings": {
+                "requests": args.requests,
+                "warmup": args.warmup,
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "rows": args.rows,
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"Saved {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
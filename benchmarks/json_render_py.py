@@ -0,0 +1,107 @@
+"""
+==============================================================================
+Benchmark: Model-Built vs Database-Rendered Listing Pages
+==============================================================================
+Location: benchmarks/json_render.py
+Purpose: Compare per-row Pydantic serialization with the json_agg fast path
+Usage: python -m benchmarks.json_render --limit 100 --iterations 2000
+==============================================================================
+
+Both paths are driven through the real ASGI app with an in-memory pool, so
+the numbers capture framework + serialization cost only (no Postgres time).
+For the fast path the pool returns the page pre-rendered, the same way
+Postgres hands back the json_agg text. The X-Total-Count EXPLAIN gets a
+large planner estimate, so both paths take the cached-estimate route and
+no count(*) is timed.
+"""
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.fakes import FakePool
+from src.main import app, get_db_pool
+
+# Planner estimate returned for the X-Total-Count EXPLAIN (skips count(*))
+ESTIMATED_ROWS = 100_000
+
+
+def make_user_rows(count: int):
+    """Build `count` rows shaped like the users SELECT"""
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "full_name": f"User Number {i}",
+            "is_active": True,
+            "created_at": base - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def render_like_postgres(rows) -> str:
+    """Render rows the way json_agg(row_to_json(...)) would"""
+    return json.dumps(
+        [{k: v.isoformat() if isinstance(v, datetime) else v for k, v in row.items()}
+         for row in rows]
+    )
+
+
+def time_requests(client: TestClient, url: str, iterations: int) -> float:
+    """Return mean seconds per request"""
+    for _ in range(min(50, iterations)):
+        client.get(url)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        client.get(url)
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--limit", type=int, default=100, help="Rows per page")
+    parser.add_argument("--iterations", type=int, default=2000, help="Requests per path")
+    args = parser.parse_args()
+
+    # Per-request access logs would dominate the measurement
+    logging.disable(logging.INFO)
+
+    rows = make_user_rows(args.limit)
+    payload = render_like_postgres(rows)
+    plan = json.dumps([{"Plan": {"Plan Rows": ESTIMATED_ROWS}}])
+
+    def respond(method, query, params):
+        # fetch -> canned rows, EXPLAIN -> plan, other fetchval -> json_agg text
+        if method == "fetch":
+            return rows
+        return plan if query.startswith("EXPLAIN") else payload
+
+    pool = FakePool(responder=respond)
+    app.dependency_overrides[get_db_pool] = lambda: pool
+    url = f"/users?limit={args.limit}"
+
+    try:
+        client = TestClient(app)
+        with patch("src.main.JSON_FAST_PATH", False):
+            model_path = time_requests(client, url, args.iterations)
+        with patch("src.main.JSON_FAST_PATH", True):
+            fast_path = time_requests(client, url, args.iterations)
+    finally:
+        app.dependency_overrides.clear()
+
+    print(f"GET {url} ({args.iterations} requests per path)")
+    print(f"  pydantic models : {model_path * 1e6:9.1f} us/request")
+    print(f"  json_agg bytes  : {fast_path * 1e6:9.1f} us/request")
+    print(f"  speedup         : {model_path / fast_path:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+==============================================================================
+Benchmark: JWT Verification With and Without the Claims Cache
+==============================================================================
+Location: benchmarks/jwt_verify.py
+Purpose: Measure per-request token verification cost (HS256 and RS256)
+Usage: python -m benchmarks.jwt_verify --iterations 5000
+==============================================================================
+"""
+
+import argparse
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+from src.auth import TokenVerifier
+
+
+def rsa_keypair():
+    """Generate a PEM (private, public) pair for RS256"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private, public
+
+
+def time_verify(verifier: TokenVerifier, token: str, iterations: int) -> float:
+    """Return mean seconds per verify() call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        verifier.verify(token)
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--iterations", type=int, default=5000, help="Verifications per case")
+    args = parser.parse_args()
+
+    claims = {"sub": "user-1", "exp": int(time.time()) + 3600}
+    private, public = rsa_keypair()
+    cases = {
+        "HS256": ("bench-secret", jwt.encode(claims, "bench-secret", algorithm="HS256")),
+        "RS256": (public, jwt.encode(claims, private, algorithm="RS256")),
+    }
+
+    print(f"verify() cost, {args.iterations} calls per case")
+    for algorithm, (key, token) in cases.items():
+        uncached = time_verify(TokenVerifier(key, [algorithm], cache_size=0), token, args.iterations)
+        cached = time_verify(TokenVerifier(key, [algorithm]), token, args.iterations)
+        print(f"  {algorithm}  uncached: {uncached * 1e6:8.1f} us   "
+              f"cached: {cached * 1e6:6.2f} us   speedup: {uncached / cached:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
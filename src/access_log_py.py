@@ -0,0 +1,184 @@
+"""
+==============================================================================
+Access Logging
+==============================================================================
+Location: src/access_log.py
+Purpose: Non-blocking log output and a sampled, structured access log
+==============================================================================
+
+Two costs used to sit on the event loop for every request: building an
+f-string log line and writing it through a blocking StreamHandler.
+
+    - configure_queue_logging() puts a QueueHandler on the root logger; a
+      QueueListener thread does the formatting-to-stream and the write
+    - AccessLogMiddleware logs a sample of successful requests, but always
+      logs server errors (5xx) and requests slower than `slow_threshold`
+
+Access lines are logfmt (key=value) with a fixed key order, so they stay
+grep- and parser-friendly as span fields are added:
+
+    method=GET path=/users status=200 duration_ms=4.120 client=10.0.0.7 sample_rate=0.1 acquire_ms=0.41 query_ms=3.02 ...
+
+`sample_rate` is written on every line so counts can be re-weighted.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import queue
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from src.tracing import current_trace
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_queue_logging(level: str, fmt: str, stream=None) -> QueueListener:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Replaces the root logger's handlers; safe to call more than once.
+
+    Args:
+        level: Root log level name (e.g. "INFO")
+        fmt: logging.Formatter format string for the output stream
+        stream: Output stream (default: stderr)
+
+    Returns:
+        QueueListener: The running listener (stopped at interpreter exit)
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level))
+    if _listener is not None:
+        return _listener
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(logging.Formatter(fmt))
+
+    root.handlers = [QueueHandler(log_queue)]
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener, _listener)
+    return _listener
+
+
+def _stop_listener(listener: QueueListener) -> None:
+    """Flush and stop a listener unless it was already stopped"""
+    if listener._thread is not None:
+        listener.stop()
+
+
+def logfmt(fields: Dict[str, Any]) -> str:
+    """Render fields as key=value pairs, quoting values that need it"""
+    parts = []
+    for key, value in fields.items():
+        text = "-" if value is None else str(value)
+        if not text or any(ch in text for ch in ' "='):
+            text = json.dumps(text)
+        parts.append(f"{key}={text}")
+    return " ".join(parts)
+
+
+class AccessLog:
+    """
+    Sampling policy and counters for the access log.
+
+    Args:
+        sample_rate: Fraction of ordinary requests logged (0.0 - 1.0)
+        slow_threshold: Requests at least this slow (seconds) are always logged
+        logger: Destination logger
+    """
+
+    def __init__(self, sample_rate: float = 1.0, slow_threshold: float = 1.0,
+                 logger: Optional[logging.Logger] = None):
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.logger = logger or logging.getLogger("src.access")
+
+        self.logged = 0
+        self.sampled_out = 0
+
+    def level_for(self, status_code: int, duration: float) -> Optional[int]:
+        """Log level for a finished request, or None if it is sampled out"""
+        if status_code >= 500:
+            return logging.ERROR
+        if duration >= self.slow_threshold:
+            return logging.WARNING
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            return logging.INFO
+        return None
+
+    def emit(self, scope, status_code: int, duration: float) -> None:
+        """Write one access line if the request is selected"""
+        level = self.level_for(status_code, duration)
+        if level is None:
+            self.sampled_out += 1
+            return
+        self.logged += 1
+
+        client = scope.get("client")
+        fields: Dict[str, Any] = {
+            "method": scope.get("method"),
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": f"{duration * 1000:.3f}",
+            "client": client[0] if client else None,
+            "sample_rate": self.sample_rate if level == logging.INFO else 1,
+        }
+        trace = current_trace()
+        if trace is not None:
+            fields.update((k, v) for k, v in trace.fields().items() if k != "total_ms")
+
+        self.logger.log(level, logfmt(fields), extra={"access": fields})
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics"""
+        return {
+            "sample_rate": self.sample_rate,
+            "slow_threshold_ms": self.slow_threshold * 1000,
+            "logged": self.logged,
+            "sampled_out": self.sampled_out,
+        }
+
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware feeding finished HTTP requests to an AccessLog.
+
+    Requests whose handler raised are logged as 500 before the exception
+    propagates; requests cancelled because the client went away as 499.
+    """
+
+    def __init__(self, app, access_log: AccessLog):
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = current_trace()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except asyncio.CancelledError:
+            status_code = 499  # client closed request
+            raise
+        finally:
+            duration = trace.elapsed() if trace is not None else time.perf_counter() - started
+            self.access_log.emit(scope, status_code, duration)
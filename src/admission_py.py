@@ -0,0 +1,272 @@
+"""
+==============================================================================
+Admission Control & Load Shedding
+==============================================================================
+Location: src/admission.py
+Purpose: Cap concurrent requests, queue a bounded backlog by priority, and
+         fail fast with 503 + Retry-After when the wait would be too long
+==============================================================================
+
+Without a limit, a slow database turns into an unbounded pile of requests
+waiting on pool.acquire(), and latency climbs for everyone. The controller
+admits up to `max_concurrency` requests (typically tied to the pool's
+current target size), queues a bounded number more, and rejects the rest
+immediately. Higher-priority routes (single-row lookups) jump the queue and
+can displace queued low-priority work (listings). Exempt routes (health
+probes, metrics) never take a slot: an orchestrator must be able to see a
+saturated worker is alive, or it restarts a healthy process under load.
+
+    controller = AdmissionController(max_concurrency=20, max_queue=50, wait_budget=0.5,
+                                     priorities=[("/users/", 1)], exempt=["/health"])
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from starlette.responses import JSONResponse
+
+
+def path_matches(path: str, prefix: str) -> bool:
+    """
+    Route-prefix match shared by the path-keyed middleware tables.
+
+    "/users" matches /users and everything below it; "/users/" matches only
+    what is below it.
+    """
+    if prefix.endswith("/"):
+        return path.startswith(prefix)
+    return path == prefix or path.startswith(prefix + "/")
+
+
+class RequestShed(Exception):
+    """Raised when a request is rejected instead of admitted"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Priority-aware concurrency limiter with a bounded wait queue.
+
+    Args:
+        max_concurrency: Requests allowed in flight; an int or a callable
+            returning the current limit (e.g. from the pool's target size)
+        max_queue: Requests allowed to wait for a slot
+        wait_budget: Longest acceptable wait (seconds); requests whose
+            expected wait exceeds it are shed up front
+        priorities: (path prefix, priority) pairs; lower numbers win and
+            the longest matching prefix applies (see path_matches)
+        default_priority: Priority for paths matching no prefix
+        long_running: Path prefixes (streams, exports) that hold a slot far
+            longer than a normal request; they are admitted as usual but
+            kept out of the service-time estimate
+        exempt: Path prefixes that bypass admission entirely; they must be
+            cheap and independent of the database
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Union[int, Callable[[], int]],
+        max_queue: int = 100,
+        wait_budget: float = 1.0,
+        priorities: Sequence[Tuple[str, int]] = (),
+        default_priority: int = 1,
+        long_running: Sequence[str] = (),
+        exempt: Sequence[str] = (),
+    ):
+        self._limit = max_concurrency
+        self.max_queue = max_queue
+        self.wait_budget = wait_budget
+        self.priorities = sorted(priorities, key=lambda item: len(item[0]), reverse=True)
+        self.default_priority = default_priority
+        self.long_running = tuple(long_running)
+        self.exempt = tuple(exempt)
+
+        self.in_flight = 0
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._service_time = 0.0   # EWMA of seconds per admitted request
+
+        self.admitted = 0
+        self.exempted = 0
+        self.shed: Dict[str, int] = {}
+        self.shed_by_priority: Dict[int, int] = {}
+
+    # ------------------------------------------------------------------
+    # Policy
+    # ------------------------------------------------------------------
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit"""
+        value = self._limit() if callable(self._limit) else self._limit
+        return max(1, int(value))
+
+    def priority_for(self, path: str) -> int:
+        """Priority for a request path (longest matching prefix)"""
+        for prefix, priority in self.priorities:
+            if path_matches(path, prefix):
+                return priority
+        return self.default_priority
+
+    def is_long_running(self, path: str) -> bool:
+        """Whether a path's duration should stay out of the estimate"""
+        return any(path_matches(path, prefix) for prefix in self.long_running)
+
+    def is_exempt(self, path: str) -> bool:
+        """Whether a path bypasses admission (probes, metrics)"""
+        return any(path_matches(path, prefix) for prefix in self.exempt)
+
+    def expected_wait(self, priority: int) -> float:
+        """Estimated seconds until a new request of `priority` is admitted"""
+        ahead = sum(1 for queued, _, _ in self._queue if queued <= priority)
+        return (ahead + 1) * self._service_time / self.limit
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _reject(self, reason: str, priority: int, retry_after: float) -> RequestShed:
+        self.shed[reason] = self.shed.get(reason, 0) + 1
+        self.shed_by_priority[priority] = self.shed_by_priority.get(priority, 0) + 1
+        return RequestShed(reason, retry_after)
+
+    async def acquire(self, priority: int) -> None:
+        """
+        Wait for a slot.
+
+        Raises:
+            RequestShed: If the queue is full, the expected wait exceeds the
+                budget, or the wait actually ran past the budget
+        """
+        if self.in_flight < self.limit and not self._queue:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        expected = self.expected_wait(priority)
+        if expected > self.wait_budget:
+            raise self._reject("wait_budget", priority, expected)
+
+        if len(self._queue) >= self.max_queue:
+            worst = max(self._queue)
+            if worst[0] <= priority:
+                raise self._reject("queue_full", priority, expected)
+            # Displace the lowest-priority, most recent waiter
+            self._queue.remove(worst)
+            heapq.heapify(self._queue)
+            worst[2].set_exception(self._reject("displaced", worst[0], expected))
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._queue, entry)
+
+        try:
+            done, _ = await asyncio.wait({future}, timeout=self.wait_budget)
+        except asyncio.CancelledError:
+            self._abandon(entry)
+            raise
+
+        if not done:
+            self._abandon(entry)
+            raise self._reject("timeout", priority, self.wait_budget)
+        future.result()  # re-raises RequestShed if displaced
+
+    def _abandon(self, entry: Tuple[int, int, asyncio.Future]) -> None:
+        """Drop a waiter that gave up; hand back a slot it was just granted"""
+        if entry in self._queue:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+        future = entry[2]
+        if future.done() and not future.cancelled() and future.exception() is None:
+            self.release(None)
+        else:
+            future.cancel()
+
+    def release(self, service_time: Optional[float]) -> None:
+        """Free a slot, update the service-time estimate and admit waiters"""
+        self.in_flight -= 1
+        if service_time is not None:
+            if self._service_time:
+                self._service_time = 0.9 * self._service_time + 0.1 * service_time
+            else:
+                self._service_time = service_time
+
+        while self._queue and self.in_flight < self.limit:
+            _, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self.in_flight += 1
+            self.admitted += 1
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics"""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._queue),
+            "admitted": self.admitted,
+            "exempted": self.exempted,
+            "shed_total": sum(self.shed.values()),
+            "shed_by_reason": dict(self.shed),
+            "shed_by_priority": {str(k): v for k, v in sorted(self.shed_by_priority.items())},
+            "avg_service_ms": round(self._service_time * 1000, 3),
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware applying an AdmissionController to HTTP requests.
+
+    Shed requests get a 503 in the app's standard error format with a
+    Retry-After header; they never reach the route handler. Exempt paths
+    pass straight through.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self.controller.is_exempt(scope["path"]):
+            self.controller.exempted += 1
+            await self.app(scope, receive, send)
+            return
+
+        priority = self.controller.priority_for(scope["path"])
+        try:
+            await self.controller.acquire(priority)
+        except RequestShed as shed:
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "error": "Service overloaded, retry later",
+                    "status_code": 503,
+                    "timestamp": datetime.utcnow().isoformat()
+                },
+                headers={"Retry-After": str(max(1, math.ceil(shed.retry_after)))}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.monotonic() - started
+            self.controller.release(
+                None if self.controller.is_long_running(scope["path"]) else elapsed
+            )
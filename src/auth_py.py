@@ -0,0 +1,184 @@
+"""
+==============================================================================
+JWT Verification with a Claims Cache
+==============================================================================
+Location: src/auth.py
+Purpose: Verify bearer tokens once, then serve repeat requests from a cache
+==============================================================================
+
+Signature verification (especially RS256/ES256) costs far more than the rest
+of a small request. Clients reuse the same token for its whole lifetime, so
+verified claims are cached under the token's SHA-256 digest until the
+token's own `exp`. Rotating the signing keys clears the cache.
+
+    verifier = TokenVerifier("secret", algorithms=["HS256"], cache_size=10_000)
+    claims = verifier.verify(token)      # raises InvalidTokenError
+    verifier.rotate_keys("new-secret")   # drops every cached entry
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from jose import JWTError, jwt
+
+
+class InvalidTokenError(Exception):
+    """Raised when a bearer token is malformed, expired or badly signed"""
+
+
+@dataclass
+class TokenCacheStats:
+    """Cache effectiveness counters"""
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    rotations: int = 0
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified claims keyed by token digest.
+
+    Args:
+        max_size: Maximum number of cached tokens
+        clock: Time source (seconds since epoch)
+    """
+
+    def __init__(self, max_size: int = 10_000, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats = TokenCacheStats()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """Cache key for a token (the raw token is never stored)"""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return cached claims, or None if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, claims = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.stats.expired += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return claims
+
+    def put(self, key: bytes, claims: Dict[str, Any], expires_at: float) -> None:
+        """Cache claims until `expires_at`, evicting the LRU entry when full"""
+        self._entries[key] = (expires_at, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenVerifier:
+    """
+    Verify JWTs with python-jose, caching the verified claims.
+
+    Args:
+        keys: Signing key, or several keys accepted during a rotation overlap
+        algorithms: Accepted JWS algorithms
+        cache_size: Maximum cached tokens (0 disables caching)
+        max_ttl: Upper bound on how long any token stays cached (seconds);
+            also the TTL for tokens without `exp`
+        audience / issuer: Optional claims to enforce
+        clock: Time source (seconds since epoch)
+    """
+
+    def __init__(
+        self,
+        keys: Union[str, Sequence[str]],
+        algorithms: Sequence[str] = ("HS256",),
+        cache_size: int = 10_000,
+        max_ttl: float = 300.0,
+        audience: Optional[str] = None,
+        issuer: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.keys: List[str] = [keys] if isinstance(keys, str) else list(keys)
+        self.algorithms = list(algorithms)
+        self.max_ttl = max_ttl
+        self.audience = audience
+        self.issuer = issuer
+        self.clock = clock
+        self.cache = TokenCache(cache_size, clock) if cache_size > 0 else None
+        self._generation = 0
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Return the token's claims, verifying the signature on a cache miss.
+
+        Raises:
+            InvalidTokenError: If no key verifies the token or it has expired
+        """
+        key = TokenCache.digest(token) if self.cache is not None else b""
+        if self.cache is not None:
+            claims = self.cache.get(key)
+            if claims is not None:
+                return claims
+
+        generation = self._generation
+        claims = self._decode(token)
+
+        # Skip caching if the keys were rotated while we were verifying
+        if self.cache is not None and generation == self._generation:
+            now = self.clock()
+            expires_at = now + self.max_ttl
+            if "exp" in claims:
+                expires_at = min(expires_at, float(claims["exp"]))
+            if expires_at > now:
+                self.cache.put(key, claims, expires_at)
+
+        return claims
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        options = {"verify_aud": self.audience is not None}
+        last_error: Optional[Exception] = None
+        for signing_key in self.keys:
+            try:
+                return jwt.decode(
+                    token, signing_key,
+                    algorithms=self.algorithms,
+                    audience=self.audience,
+                    issuer=self.issuer,
+                    options=options,
+                )
+            except JWTError as e:
+                last_error = e
+        raise InvalidTokenError(str(last_error or "No signing key configured"))
+
+    def rotate_keys(self, keys: Union[str, Sequence[str]]) -> None:
+        """Replace the signing keys and invalidate every cached token"""
+        self.keys = [keys] if isinstance(keys, str) else list(keys)
+        self._generation += 1
+        if self.cache is not None:
+            self.cache.clear()
+            self.cache.stats.rotations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters plus current size"""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, "size": len(self.cache), **asdict(self.cache.stats)}
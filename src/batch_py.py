@@ -0,0 +1,172 @@
+"""
+==============================================================================
+Batched Sub-Requests
+==============================================================================
+Location: src/batch.py
+Purpose: Run many GETs from one HTTP request, concurrently and in-process
+==============================================================================
+
+A screen that needs several users and a project list costs a client 5-20
+round trips, each paying for HTTP, auth, admission and a pool acquire.
+POST /batch sends them all at once. The dispatcher runs each sub-request
+straight into the router (below the middleware stack, which the batch
+request itself has already passed through), at most `max_concurrency` at a
+time, and collects status, headers and body per item.
+
+Sub-requests inherit the batch request's context (deadline, trace) and
+its auth and consistency headers. They run concurrently, so
+`GET /users/{id}` items coalesce in the user batch loader into one
+`ANY($1)` query on one connection.
+
+    dispatcher = SubRequestDispatcher(inner_app, max_concurrency=4)
+    results = await dispatcher.dispatch(request.scope, ["/users/1", "/projects?limit=5"])
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.admission import path_matches
+
+# Parent headers a sub-request sees (everything else is per-request)
+FORWARDED_HEADERS = {b"authorization", b"x-consistency-token", b"accept", b"accept-language"}
+
+
+@dataclass
+class SubResponse:
+    """Outcome of one sub-request"""
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Any = None
+
+
+class SubRequestDispatcher:
+    """
+    Execute GET sub-requests against an ASGI app inside the current request.
+
+    Args:
+        app: ASGI app to dispatch to (the router wrapped in the exception
+            handlers, not the full middleware stack)
+        error_handler: (request, exc) -> Response for unhandled exceptions
+        max_concurrency: Sub-requests running at once, per batch
+        excluded: Path prefixes that can't be batched (streams, /batch itself)
+    """
+
+    def __init__(
+        self,
+        app,
+        error_handler: Optional[Callable[[Request, Exception], Awaitable[Response]]] = None,
+        max_concurrency: int = 4,
+        excluded: Sequence[str] = (),
+    ):
+        self.app = app
+        self.error_handler = error_handler
+        self.max_concurrency = max(1, max_concurrency)
+        self.excluded = tuple(excluded)
+
+        self.batches = 0
+        self.sub_requests = 0
+
+    async def dispatch(self, parent_scope: Dict[str, Any], paths: Sequence[str]) -> List[SubResponse]:
+        """
+        Run every path, in parallel up to the cap.
+
+        Returns:
+            List[SubResponse]: One per path, in request order
+        """
+        self.batches += 1
+        self.sub_requests += len(paths)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(path: str) -> SubResponse:
+            async with semaphore:
+                return await self.get(parent_scope, path)
+
+        return list(await asyncio.gather(*(run(path) for path in paths)))
+
+    def _reject(self, path: str) -> Optional[SubResponse]:
+        parts = urlsplit(path)
+        if parts.scheme or parts.netloc or not parts.path.startswith("/"):
+            return self._error(400, "Sub-request path must be an absolute path like /users/123")
+        if any(path_matches(parts.path, prefix) for prefix in self.excluded):
+            return self._error(400, f"{parts.path} can't be batched")
+        return None
+
+    @staticmethod
+    def _error(status: int, detail: str) -> SubResponse:
+        return SubResponse(status=status, body={"error": detail, "status_code": status})
+
+    async def get(self, parent_scope: Dict[str, Any], path: str) -> SubResponse:
+        """Run one GET sub-request"""
+        rejected = self._reject(path)
+        if rejected is not None:
+            return rejected
+
+        parts = urlsplit(path)
+        scope = {
+            key: value for key, value in parent_scope.items()
+            if key not in ("route", "endpoint", "path_params")
+        }
+        scope.update({
+            "method": "GET",
+            "path": parts.path,
+            "raw_path": parts.path.encode(),
+            "query_string": parts.query.encode(),
+            "headers": [
+                (name, value) for name, value in parent_scope["headers"]
+                if name in FORWARDED_HEADERS
+            ],
+        })
+
+        started: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.Event().wait()   # no disconnect: the batch owns the socket
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                started.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception as exc:
+            if self.error_handler is None:
+                raise
+            response = await self.error_handler(Request(scope), exc)
+            return self._collect(response.status_code, response.raw_headers, [response.body])
+
+        return self._collect(started.get("status", 500), started.get("headers", []), chunks)
+
+    @staticmethod
+    def _collect(status: int, raw_headers: List[Tuple[bytes, bytes]], chunks: List[bytes]) -> SubResponse:
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in raw_headers
+            if name not in (b"content-length", b"content-type")
+        }
+        content_type = next(
+            (value for name, value in raw_headers if name == b"content-type"), b""
+        )
+        body = b"".join(chunks)
+        if content_type.startswith(b"application/json") and body:
+            payload = json.loads(body)
+        else:
+            payload = body.decode("utf-8", errors="replace") or None
+        return SubResponse(status=status, headers=headers, body=payload)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics"""
+        return {"batches": self.batches, "sub_requests": self.sub_requests}
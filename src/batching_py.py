@@ -0,0 +1,139 @@
+"""
+==============================================================================
+DataLoader-Style Micro-Batching
+==============================================================================
+Location: src/batching.py
+Purpose: Merge single-key lookups arriving together into one batched query
+==============================================================================
+
+Every load(key) issued within the same event-loop tick (window=0) or within
+a short window (e.g. 1 ms) is queued; the whole batch is then resolved with
+one call to the batch function and results are fanned back out per caller.
+
+    async def load_users(keys, pool):
+        rows = await pool.fetch("... WHERE id = ANY($1)", keys)
+        return {str(r["id"]): r for r in rows}
+
+    loader = BatchLoader(load_users, window=0.001)
+    row = await loader.load(user_id, pool)
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+# batch_fn(keys, context) -> {key: value}; keys missing from the result load as None
+BatchFunction = Callable[[List[Hashable], Any], Awaitable[Dict[Hashable, Any]]]
+
+
+@dataclass
+class BatchLoaderStats:
+    """Counters describing batching efficiency"""
+    loads: int = 0      # Total load() calls
+    batches: int = 0    # Batch function invocations
+    keys: int = 0       # Distinct keys sent to the batch function
+    errors: int = 0     # Batches that raised
+
+
+@dataclass
+class _PendingBatch:
+    """Keys collected so far for one context, plus their waiters"""
+    waiters: Dict[Hashable, List[asyncio.Future]] = field(default_factory=dict)
+    handle: Optional[asyncio.Handle] = None
+
+
+class BatchLoader:
+    """
+    Collect individual loads into batched calls.
+
+    Batches are grouped by `context` (typically the connection pool), so
+    callers using different pools never share a query.
+
+    Args:
+        batch_fn: Coroutine resolving a list of keys to a {key: value} dict
+        window: Seconds to wait for more keys (0 = flush on the next tick)
+        max_batch_size: Flush immediately once this many keys are queued
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFunction,
+        window: float = 0.001,
+        max_batch_size: int = 100,
+    ):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Any, _PendingBatch] = {}
+        self._stats = BatchLoaderStats()
+
+    async def load(self, key: Hashable, context: Any = None) -> Any:
+        """
+        Queue a key and wait for its batch to resolve.
+
+        Args:
+            key: Lookup key
+            context: Resource handed to batch_fn (e.g. the pool)
+
+        Returns:
+            The value for `key`, or None if the batch did not return it
+
+        Raises:
+            Exception: Whatever batch_fn raised, delivered to every caller
+        """
+        self._stats.loads += 1
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(context)
+
+        if batch is None:
+            batch = self._pending[context] = _PendingBatch()
+            if self.window > 0:
+                batch.handle = loop.call_later(self.window, self._dispatch, context)
+            else:
+                batch.handle = loop.call_soon(self._dispatch, context)
+
+        future = loop.create_future()
+        batch.waiters.setdefault(key, []).append(future)
+
+        if len(batch.waiters) >= self.max_batch_size:
+            batch.handle.cancel()
+            self._dispatch(context)
+
+        return await future
+
+    def _dispatch(self, context: Any) -> None:
+        """Detach the pending batch for `context` and resolve it in a task"""
+        batch = self._pending.pop(context, None)
+        if batch is not None:
+            asyncio.ensure_future(self._resolve(batch, context))
+
+    async def _resolve(self, batch: _PendingBatch, context: Any) -> None:
+        """Run batch_fn once and fan the results out to every waiter"""
+        keys = list(batch.waiters)
+        self._stats.batches += 1
+        self._stats.keys += len(keys)
+
+        try:
+            results = await self.batch_fn(keys, context)
+        except Exception as exc:
+            self._stats.errors += 1
+            for futures in batch.waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        for key, futures in batch.waiters.items():
+            value = results.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of counters plus the average batch size"""
+        data = asdict(self._stats)
+        data["avg_batch_size"] = (
+            round(self._stats.keys / self._stats.batches, 2) if self._stats.batches else 0.0
+        )
+        return data
@@ -0,0 +1,307 @@
+"""
+==============================================================================
+Response Compression
+==============================================================================
+Location: src/compression.py
+Purpose: Negotiate zstd / brotli / gzip, compress large text responses off
+         the event loop, and reuse compressed bytes for repeated pages
+==============================================================================
+
+JSON listings compress 5-10x. The middleware picks the best encoding the
+client accepts (by q-value, then zstd > br > gzip) and leaves small
+responses alone: below `minimum_size` the headers cost more than the
+compression saves. Compression is CPU work, so bodies above `offload_size`
+are compressed in a worker thread and the event loop keeps serving.
+
+Hot pages (the first page of /users, a popular project list) repeat
+byte-for-byte. Compressed output is cached by a digest of the body, so a
+repeated page costs a hash instead of a compression, whether it came from
+the database, the single-flight layer or any response cache. Streaming
+bodies (exports) are gzip-compressed chunk by chunk and never cached.
+
+brotli and zstd are used when their packages (`brotli`, `zstandard`) are
+installed; gzip is always available.
+
+    policy = CompressionPolicy(minimum_size=1024, cache=CompressedCache(16 * 2**20))
+    app.add_middleware(CompressionMiddleware, policy=policy)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.tracing import record
+
+try:
+    import brotli
+except ImportError:   # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:   # optional
+    zstandard = None
+
+
+def _codecs() -> Dict[str, Callable[[bytes], bytes]]:
+    """Available encoders, in server preference order"""
+    codecs: Dict[str, Callable[[bytes], bytes]] = {}
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=3)
+        codecs["zstd"] = compressor.compress
+    if brotli is not None:
+        codecs["br"] = lambda data: brotli.compress(data, quality=4)
+    codecs["gzip"] = lambda data: gzip.compress(data, compresslevel=6, mtime=0)
+    return codecs
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def negotiate(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """
+    Choose a content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, br;q=0.9, *;q=0"
+        available: Encodings we can produce, in preference order
+
+    Returns:
+        Best encoding (highest q, then our preference), or None for identity
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressedCache:
+    """
+    LRU of compressed bodies keyed by (encoding, body digest).
+
+    Args:
+        max_bytes: Budget for stored compressed bytes
+    """
+
+    def __init__(self, max_bytes: int = 16 * 2**20):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Tuple[str, bytes], value: bytes) -> None:
+        if len(value) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "bytes": self.size,
+                "hits": self.hits, "misses": self.misses}
+
+
+class CompressionPolicy:
+    """
+    What to compress, how, and the counters.
+
+    Args:
+        minimum_size: Bodies smaller than this (bytes) are sent as-is
+        offload_size: Bodies (or stream chunks) at least this large are
+            compressed in a worker thread
+        cache: Shared cache of compressed bodies (None disables it)
+    """
+
+    def __init__(self, minimum_size: int = 1024, offload_size: int = 64 * 1024,
+                 cache: Optional[CompressedCache] = None):
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.cache = cache
+        self.codecs = _codecs()
+
+        self.compressed = 0
+        self.skipped_small = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def choose(self, accept_encoding: str) -> Optional[str]:
+        """Encoding for a request's Accept-Encoding (None = identity)"""
+        return negotiate(accept_encoding, list(self.codecs))
+
+    async def run(self, function: Callable[..., bytes], data: bytes, *args) -> bytes:
+        """Call `function(data, *args)`, in a thread when `data` is large"""
+        if len(data) >= self.offload_size:
+            return await asyncio.to_thread(function, data, *args)
+        return function(data, *args)
+
+    async def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compressed `body`, from the cache when this exact body was seen"""
+        key = None
+        if self.cache is not None:
+            key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count(body, cached)
+                return cached
+
+        compressed = await self.run(self.codecs[encoding], body)
+        if key is not None:
+            self.cache.put(key, compressed)
+        self._count(body, compressed)
+        return compressed
+
+    def _count(self, body: bytes, compressed: bytes) -> None:
+        self.compressed += 1
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics"""
+        return {
+            "encodings": list(self.codecs),
+            "compressed": self.compressed,
+            "skipped_small": self.skipped_small,
+            "ratio": round(self.bytes_in / self.bytes_out, 2) if self.bytes_out else None,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _gzip_chunk(data: bytes, compressor, mode: int) -> bytes:
+    return compressor.compress(data) + compressor.flush(mode)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware applying a CompressionPolicy.
+
+    The response start is held until the first body chunk shows whether the
+    body is complete (compress it whole) or streamed (gzip it per chunk).
+    """
+
+    def __init__(self, app, policy: CompressionPolicy):
+        self.app = app
+        self.policy = policy
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encoding = self.policy.choose(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        stream_encoding = "gzip" if negotiate(accept, ["gzip"]) else None
+
+        policy = self.policy
+        start: Dict[str, Any] = {}
+        state = {"mode": None}     # None until decided: "identity", "whole", "stream"
+        gzipper: List[Any] = []
+
+        async def compressed_send(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+                return
+            if message["type"] != "http.response.body" or state["mode"] == "identity":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+
+            if state["mode"] is None:
+                if not _compressible(headers) or start["status"] in (204, 304):
+                    state["mode"] = "identity"
+                elif not more_body:
+                    state["mode"] = "whole"
+                elif stream_encoding is not None:
+                    state["mode"] = "stream"
+                    gzipper.append(zlib.compressobj(6, zlib.DEFLATED, 31))
+                else:
+                    state["mode"] = "identity"
+
+                if state["mode"] != "identity" or _compressible(headers):
+                    headers.add_vary_header("Accept-Encoding")
+
+                if state["mode"] == "whole" and len(body) < policy.minimum_size:
+                    policy.skipped_small += 1
+                    state["mode"] = "identity"
+
+                if state["mode"] == "identity":
+                    await send({**start, "headers": headers.raw})
+                    await send(message)
+                    return
+
+                started = time.perf_counter()
+                if state["mode"] == "whole":
+                    body = await policy.compress(body, encoding)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                else:
+                    body = await policy.run(_gzip_chunk, body, gzipper[0], zlib.Z_SYNC_FLUSH)
+                    headers["Content-Encoding"] = stream_encoding
+                    del headers["Content-Length"]
+                record("compress", started)
+
+                await send({**start, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            # Later chunks of a gzip stream
+            started = time.perf_counter()
+            mode = zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+            body = await policy.run(_gzip_chunk, body, gzipper[0], mode)
+            record("compress", started)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, compressed_send)
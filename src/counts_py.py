@@ -0,0 +1,144 @@
+"""
+==============================================================================
+Total Counts
+==============================================================================
+Location: src/counts.py
+Purpose: Cheap X-Total-Count for paginated listings: exact for small
+         tables, planner estimates for large ones, cached briefly
+==============================================================================
+
+`SELECT count(*)` has to visit every visible row, so counting a large
+table on each page request costs more than the page itself. The planner
+already keeps a row estimate. `EXPLAIN (FORMAT JSON)` returns it, with the
+WHERE clause applied, in well under a millisecond.
+
+CountService asks for the estimate first. Below `exact_threshold` rows an
+exact count is cheap, so it runs one. Either result is cached for `ttl`
+seconds, and concurrent misses share a single lookup. So is a failure: the
+first one is raised, and for the next `ttl` seconds count() returns None
+(no header) instead of asking a failing database on every page request:
+
+    counts = CountService(exact_threshold=10_000, ttl=5)
+    total = await counts.count("users", estimate=..., exact=...)
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total.value)
+    response.headers["X-Total-Count-Estimated"] = "true" if total.estimated else "false"
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from src.singleflight import SingleFlight
+
+
+@dataclass(frozen=True)
+class TotalCount:
+    """A row count and whether it came from the planner"""
+    value: int
+    estimated: bool
+
+
+def plan_rows(explain_output: Any) -> int:
+    """
+    Row estimate from `EXPLAIN (FORMAT JSON) ...` output.
+
+    Args:
+        explain_output: The JSON text (or decoded list) Postgres returned
+
+    Raises:
+        ValueError: If the output is not an EXPLAIN plan
+    """
+    plan = json.loads(explain_output) if isinstance(explain_output, str) else explain_output
+    try:
+        return max(0, int(plan[0]["Plan"]["Plan Rows"]))
+    except (LookupError, TypeError) as e:
+        raise ValueError(f"Not an EXPLAIN (FORMAT JSON) plan: {explain_output!r}") from e
+
+
+class CountService:
+    """
+    Cached, estimate-first row counts.
+
+    Args:
+        exact_threshold: Estimated row counts below this get an exact count
+        ttl: Seconds a count (or a failure to get one) is served from cache
+        clock: Time source (seconds)
+    """
+
+    def __init__(self, exact_threshold: int = 10_000, ttl: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.exact_threshold = exact_threshold
+        self.ttl = ttl
+        self.clock = clock
+        # A None count is a recent failure
+        self._cache: Dict[Hashable, Tuple[float, Optional[TotalCount]]] = {}
+        self._flight = SingleFlight()
+
+        self.hits = 0
+        self.exact_counts = 0
+        self.estimates = 0
+        self.failures = 0
+
+    async def count(
+        self,
+        key: Hashable,
+        estimate: Callable[[], Awaitable[int]],
+        exact: Callable[[], Awaitable[int]],
+    ) -> TotalCount:
+        """
+        Total rows for `key`.
+
+        Args:
+            key: Cache key (e.g. the table name)
+            estimate: Returns the planner's row estimate
+            exact: Returns count(*)
+
+        Returns:
+            TotalCount: Cached if fresh, otherwise freshly computed; None
+                while a recent failure is cached
+
+        Raises:
+            Exception: Whatever `estimate` or `exact` raised, on the first
+                failure only
+        """
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > self.clock():
+            self.hits += 1
+            return cached[1]
+        return await self._flight.do(key, lambda: self._refresh(key, estimate, exact))
+
+    async def _refresh(self, key, estimate, exact) -> TotalCount:
+        try:
+            rows = await estimate()
+            exact_rows = await exact() if rows < self.exact_threshold else None
+        except Exception:
+            self.failures += 1
+            self._cache[key] = (self.clock() + self.ttl, None)
+            raise
+
+        if exact_rows is not None:
+            total = TotalCount(int(exact_rows), estimated=False)
+            self.exact_counts += 1
+        else:
+            total = TotalCount(rows, estimated=True)
+            self.estimates += 1
+        self._cache[key] = (self.clock() + self.ttl, total)
+        return total
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drop one cached count (or all of them)"""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics"""
+        return {
+            "cache_hits": self.hits,
+            "exact_counts": self.exact_counts,
+            "estimates": self.estimates,
+            "failures": self.failures,
+        }
@@ -0,0 +1,214 @@
+"""
+==============================================================================
+Request Deadlines & Disconnect Cancellation
+==============================================================================
+Location: src/deadlines.py
+Purpose: Give every request a deadline that bounds its pool acquire and
+         queries, and stop work for clients that have already gone away
+==============================================================================
+
+The pool-wide `command_timeout` is a backstop, not a deadline: a client that
+gave up after 2 seconds would otherwise keep a connection busy for up to a
+minute. DeadlineMiddleware stamps each request with an absolute deadline -
+the X-Request-Timeout header (seconds) if the client sent one, capped by the
+route's default - and the query helpers pass `remaining()` as the asyncpg
+`timeout`. When the client disconnects mid-request, the handler task is
+cancelled; asyncpg then cancels the running statement and the connection
+goes straight back to the pool.
+
+    policy = DeadlinePolicy(default_timeout=10, route_timeouts=[("/users:bulk", 300)])
+    app.add_middleware(DeadlineMiddleware, policy=policy)
+    rows = await conn.fetch(query, timeout=remaining())
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from src.admission import path_matches
+
+
+class SharedDeadline:
+    """
+    Deadline of work done on behalf of several requests (see src/singleflight.py).
+
+    It is the latest of the requests' deadlines, so it only ever moves later
+    as requests join; None means at least one of them has no deadline.
+    """
+
+    def __init__(self, at: Optional[float]):
+        self.at = at
+
+    def extend(self, at: Optional[float]) -> None:
+        """Cover one more request whose deadline is `at`"""
+        if self.at is not None and (at is None or at > self.at):
+            self.at = at
+
+
+# Absolute time.monotonic() deadline of the current request (None = no deadline)
+_deadline: ContextVar[Union[None, float, SharedDeadline]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes before its work could start"""
+
+
+def current_deadline() -> Optional[float]:
+    """Absolute time.monotonic() deadline of the current context (None = no deadline)"""
+    deadline = _deadline.get()
+    return deadline.at if isinstance(deadline, SharedDeadline) else deadline
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left before the current request's deadline.
+
+    Returns:
+        float: Time budget for the next acquire/query, or None outside a
+            request (the pool's command_timeout then applies)
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return left
+
+
+def set_deadline(timeout: Optional[float]):
+    """Set the current context's deadline `timeout` seconds from now; returns a reset token"""
+    return _deadline.set(None if timeout is None else time.monotonic() + timeout)
+
+
+def share_deadline(deadline: SharedDeadline):
+    """Make `deadline` the current context's deadline; returns a reset token"""
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token) -> None:
+    """Restore the deadline that was active before set_deadline()"""
+    _deadline.reset(token)
+
+
+class DeadlinePolicy:
+    """
+    Per-route request deadlines with an optional client override.
+
+    Args:
+        default_timeout: Deadline (seconds) for routes without their own
+        route_timeouts: (path prefix, seconds) pairs; the longest matching
+            prefix applies (see src.admission.path_matches)
+        header: Request header carrying the client's own timeout in seconds;
+            it can shorten the route's deadline but never extend it
+    """
+
+    def __init__(
+        self,
+        default_timeout: float = 10.0,
+        route_timeouts: Sequence[Tuple[str, float]] = (),
+        header: str = "x-request-timeout",
+    ):
+        self.default_timeout = default_timeout
+        self.route_timeouts = sorted(route_timeouts, key=lambda item: len(item[0]), reverse=True)
+        self.header = header.lower().encode("latin-1")
+
+        self.client_deadlines = 0
+        self.disconnects_cancelled = 0
+
+    def timeout_for(self, path: str, headers: Sequence[Tuple[bytes, bytes]] = ()) -> float:
+        """Deadline (seconds) for a request: route default, shortened by the header"""
+        timeout = self.default_timeout
+        for prefix, seconds in self.route_timeouts:
+            if path_matches(path, prefix):
+                timeout = seconds
+                break
+
+        for name, value in headers:
+            if name == self.header:
+                try:
+                    requested = float(value.decode("latin-1"))
+                except ValueError:
+                    break
+                if requested > 0:
+                    self.client_deadlines += 1
+                    timeout = min(timeout, requested)
+                break
+        return timeout
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics"""
+        return {
+            "default_timeout": self.default_timeout,
+            "client_deadlines": self.client_deadlines,
+            "disconnects_cancelled": self.disconnects_cancelled,
+        }
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware applying a DeadlinePolicy to HTTP requests.
+
+    The deadline is visible to the handler through remaining(). If the
+    client disconnects before the response is finished, the handler is
+    cancelled (and with it any running query).
+    """
+
+    def __init__(self, app, policy: DeadlinePolicy):
+        self.app = app
+        self.policy = policy
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = set_deadline(self.policy.timeout_for(scope["path"], scope.get("headers", ())))
+        try:
+            await self._run_until_disconnect(scope, receive, send)
+        finally:
+            reset_deadline(token)
+
+    async def _run_until_disconnect(self, scope, receive, send) -> None:
+        # A single reader owns the real `receive` and forwards every message,
+        # so it sees http.disconnect even while the handler never reads again
+        messages: asyncio.Queue = asyncio.Queue()
+        response_complete = False
+
+        async def pump() -> None:
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        async def tracking_send(message) -> None:
+            nonlocal response_complete
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+
+        handler = asyncio.ensure_future(self.app(scope, messages.get, tracking_send))
+        listener = asyncio.ensure_future(pump())
+        try:
+            await asyncio.wait({handler, listener}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            handler.cancel()
+            listener.cancel()
+            raise
+
+        # Servers report a disconnect once the response is sent, too; only an
+        # unfinished response means the client gave up (background tasks live on)
+        if not handler.done() and not response_complete:
+            self.policy.disconnects_cancelled += 1
+            handler.cancel()
+            await asyncio.gather(handler, return_exceptions=True)
+            return
+
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+        await handler  # propagate handler errors to outer middleware
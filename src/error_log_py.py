@@ -0,0 +1,130 @@
+"""
+==============================================================================
+Error Log Aggregation
+==============================================================================
+Location: src/error_log.py
+Purpose: Log each distinct error once per interval, then summarize repeats
+==============================================================================
+
+When Postgres goes down every request fails the same way. Logging a full
+traceback per request floods the logs, and the formatting costs CPU just
+when the service is struggling. ErrorLog logs the first occurrence of an
+error normally (with its traceback) and only counts identical ones after
+that. Every `interval` seconds a background task writes one summary line per
+repeated error and starts a new window:
+
+    Error fetching users: connection refused (repeated 1841 times in the last 60s)
+
+Errors are "identical" when the message and exception type match. At most
+`max_keys` distinct errors are tracked per window; beyond that, errors are
+counted together as "other errors".
+
+    error_log = ErrorLog(logger, interval=60)
+    await error_log.start()
+    error_log.error(f"Unhandled exception: {exc}", exc_info=exc)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Counts errors beyond max_keys distinct errors per window
+OVERFLOW_KEY = ("other errors", "")
+
+
+class ErrorLog:
+    """
+    Rate-limited, aggregated error logging.
+
+    Args:
+        logger: Where lines are written
+        interval: Summary window (seconds)
+        max_keys: Distinct errors tracked per window
+        clock: Time source (seconds)
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 60.0, max_keys: int = 1000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.logger = logger
+        self.interval = interval
+        self.max_keys = max_keys
+        self.clock = clock
+        self._repeats: Dict[Tuple[str, str], int] = {}
+        self._window_started = clock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.logged = 0
+        self.suppressed = 0
+
+    def error(self, message: str, exc_info: Optional[BaseException] = None) -> bool:
+        """
+        Log `message` at ERROR unless it was already logged this window.
+
+        Args:
+            message: Log line
+            exc_info: Exception whose traceback accompanies the first line
+
+        Returns:
+            bool: True if the line was written, False if it was only counted
+        """
+        key = (message, type(exc_info).__qualname__ if exc_info is not None else "")
+        if key not in self._repeats and len(self._repeats) >= self.max_keys:
+            key = OVERFLOW_KEY
+
+        if key in self._repeats:
+            self._repeats[key] += 1
+            self.suppressed += 1
+            return False
+
+        self._repeats[key] = 0
+        self.logged += 1
+        self.logger.error(message, exc_info=exc_info)
+        return True
+
+    def flush(self) -> int:
+        """
+        Write one summary line per repeated error and start a new window.
+
+        Returns:
+            int: Number of summary lines written
+        """
+        elapsed = self.clock() - self._window_started
+        repeats, self._repeats = self._repeats, {}
+        self._window_started = self.clock()
+
+        written = 0
+        for (message, _), count in repeats.items():
+            if count:
+                self.logger.error(f"{message} (repeated {count} times in the last {elapsed:.0f}s)")
+                written += 1
+        return written
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    async def start(self) -> None:
+        """Start writing periodic summaries"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the summary task and write the final summaries"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics"""
+        return {
+            "logged": self.logged,
+            "suppressed": self.suppressed,
+            "tracked": len(self._repeats),
+        }
@@ -0,0 +1,177 @@
+"""
+==============================================================================
+Fake Connection Pool
+==============================================================================
+Location: src/fakes.py
+Purpose: In-memory asyncpg.Pool stand-in with injectable latency and
+         failures, for tests and benchmarks
+==============================================================================
+
+FakePool implements the subset of the asyncpg API the app uses (acquire,
+fetch, fetchrow, fetchval, execute, transaction, cursor,
+copy_records_to_table) and
+answers every statement through a `responder(method, query, args)` callable.
+Latency and failures are injected per call:
+
+    pool = FakePool(
+        responder=lambda method, query, args: rows,
+        latency=0.005,                              # seconds, or a callable
+        failures=[ConnectionResetError(), None],    # 1st call fails, 2nd ok
+    )
+    app.dependency_overrides[get_db_pool] = lambda: pool
+
+`timeout` arguments are honoured like asyncpg's: a call slower than its
+timeout raises asyncio.TimeoutError.
+"""
+
+import asyncio
+import random
+from collections import deque
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+Responder = Callable[[str, str, Tuple[Any, ...]], Any]
+
+
+class FakeConnection:
+    """Connection whose statements are answered by the owning FakePool"""
+
+    def __init__(self, pool: "FakePool"):
+        self.pool = pool
+
+    async def fetch(self, query: str, *args, timeout: Optional[float] = None) -> List[Any]:
+        return await self.pool.call("fetch", query, args, timeout)
+
+    async def fetchrow(self, query: str, *args, timeout: Optional[float] = None) -> Any:
+        return await self.pool.call("fetchrow", query, args, timeout)
+
+    async def fetchval(self, query: str, *args, timeout: Optional[float] = None) -> Any:
+        return await self.pool.call("fetchval", query, args, timeout)
+
+    async def execute(self, query: str, *args, timeout: Optional[float] = None) -> str:
+        return await self.pool.call("execute", query, args, timeout)
+
+    async def copy_records_to_table(self, table_name: str, *, records, columns=None,
+                                    timeout: Optional[float] = None) -> str:
+        return await self.pool.call("copy", table_name, (list(records), columns), timeout)
+
+    async def cursor(self, query: str, *args, timeout: Optional[float] = None) -> "FakeCursor":
+        rows = await self.pool.call("cursor", query, args, timeout)
+        return FakeCursor(self.pool, rows or [])
+
+    def transaction(self, **options) -> "_FakeTransaction":
+        return _FakeTransaction()
+
+
+class FakeCursor:
+    """Server-side cursor over the rows the responder returned for cursor()"""
+
+    def __init__(self, pool: "FakePool", rows: Iterable[Any]):
+        self.pool = pool
+        self.rows = iter(rows)
+
+    async def fetch(self, n: int, *, timeout: Optional[float] = None) -> List[Any]:
+        await self.pool.simulate(timeout)
+        batch = []
+        for row in self.rows:
+            batch.append(row)
+            if len(batch) == n:
+                break
+        self.pool.fetched_batches += 1
+        return batch
+
+
+class _FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+class _FakeAcquire:
+    def __init__(self, pool: "FakePool", timeout: Optional[float]):
+        self.pool = pool
+        self.timeout = timeout
+
+    async def __aenter__(self) -> FakeConnection:
+        pool = self.pool
+        if pool.acquire_latency:
+            if self.timeout is not None and pool.acquire_latency > self.timeout:
+                await asyncio.sleep(self.timeout)
+                raise asyncio.TimeoutError()
+            await asyncio.sleep(pool.acquire_latency)
+        pool.in_use += 1
+        return FakeConnection(pool)
+
+    async def __aexit__(self, *exc):
+        self.pool.in_use -= 1
+        return None
+
+
+class FakePool:
+    """
+    asyncpg.Pool stand-in.
+
+    Args:
+        responder: Returns the result for (method, query, args); default
+            answers [] / None / "OK" depending on the method
+        latency: Seconds per statement, or a callable returning them
+        failures: Exceptions raised by successive statements (None = succeed);
+            once exhausted, statements succeed
+        failure_rate: Probability that a statement raises `failure_error`
+        failure_error: Factory for random failures
+        acquire_latency: Seconds each acquire() takes
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Responder] = None,
+        latency: Union[float, Callable[[], float]] = 0.0,
+        failures: Iterable[Optional[BaseException]] = (),
+        failure_rate: float = 0.0,
+        failure_error: Callable[[], BaseException] = ConnectionResetError,
+        acquire_latency: float = 0.0,
+    ):
+        self.responder = responder or self._default_response
+        self.latency = latency
+        self.failures = deque(failures)
+        self.failure_rate = failure_rate
+        self.failure_error = failure_error
+        self.acquire_latency = acquire_latency
+
+        self.calls: List[Tuple[str, str, Tuple[Any, ...]]] = []
+        self.in_use = 0
+        self.fetched_batches = 0
+
+    @staticmethod
+    def _default_response(method: str, query: str, args: Tuple[Any, ...]) -> Any:
+        return {"fetch": [], "execute": "OK", "copy": "COPY 0"}.get(method)
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _FakeAcquire:
+        return _FakeAcquire(self, timeout)
+
+    async def call(self, method: str, query: str, args: Tuple[Any, ...],
+                   timeout: Optional[float]) -> Any:
+        """Run one statement: record it, wait, maybe fail, then respond"""
+        self.calls.append((method, query, args))
+        await self.simulate(timeout)
+        return self.responder(method, query, args)
+
+    async def simulate(self, timeout: Optional[float]) -> None:
+        """Apply one round trip's latency and injected failure"""
+        delay = self.latency() if callable(self.latency) else self.latency
+
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError()
+        if delay:
+            await asyncio.sleep(delay)
+
+        error = self.failures.popleft() if self.failures else None
+        if error is None and self.failure_rate and random.random() < self.failure_rate:
+            error = self.failure_error()
+        if error is not None:
+            raise error
+
+    async def close(self) -> None:
+        return None
@@ -0,0 +1,108 @@
+"""
+==============================================================================
+Sparse Fieldsets
+==============================================================================
+Location: src/fieldsets.py
+Purpose: `?fields=id,username` selects and serializes only the requested
+         columns of a response model
+==============================================================================
+
+Column names come only from the response model's fields, so a fieldset
+never puts client text into SQL. Each distinct fieldset is normalized to
+model order and mapped to one generated statement. Identical SQL text means
+asyncpg reuses its prepared statement, and the cache is bounded. The same
+normalized key selects a cached partial model, so the trimmed response is
+validated and encoded like the full one.
+
+    user_fields = SparseFields(UserResponse)
+    fields = user_fields.parse("username,id")      # ("id", "username")
+    sql = user_fields.statement(USERS_PAGE_TEMPLATE, fields)
+    body = user_fields.render(rows, fields)        # JSON bytes
+"""
+
+import uuid
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, create_model
+
+
+class SparseFields:
+    """
+    Fieldset whitelist and caches for one response model.
+
+    Args:
+        model: Response model; its field names are the allowed columns
+        always: Fields included in every fieldset (e.g. the key)
+        max_cached: Distinct fieldsets kept (statements and partial models)
+    """
+
+    def __init__(self, model: Type[BaseModel], always: Sequence[str] = ("id",),
+                 max_cached: int = 128):
+        self.model = model
+        self.allowed = tuple(model.model_fields)
+        self.always = tuple(always)
+        self.statement = lru_cache(maxsize=max_cached * 4)(self._statement)
+        self._model = lru_cache(maxsize=max_cached)(self._build_model)
+        self._list_adapter = lru_cache(maxsize=max_cached)(lambda partial: TypeAdapter(List[partial]))
+
+    def parse(self, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Normalize a `fields=` value.
+
+        Returns:
+            Requested fields plus `always`, in model order; None when
+            `fields` is absent or names every field (the full response)
+
+        Raises:
+            ValueError: If a name is not a field of the model
+        """
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(self.allowed)
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(sorted(unknown))}; "
+                f"allowed: {', '.join(self.allowed)}"
+            )
+        requested.update(self.always)
+        if len(requested) == len(self.allowed):
+            return None
+        return tuple(name for name in self.allowed if name in requested)
+
+    def columns(self, fields: Optional[Tuple[str, ...]]) -> str:
+        """SELECT list for a normalized fieldset"""
+        return ", ".join(fields or self.allowed)
+
+    def _statement(self, template: str, fields: Optional[Tuple[str, ...]]) -> str:
+        """`template` with its {columns} placeholder filled (cached)"""
+        return template.format(columns=self.columns(fields))
+
+    def _build_model(self, fields: Tuple[str, ...]) -> Type[BaseModel]:
+        return create_model(
+            f"{self.model.__name__}_{'_'.join(fields)}",
+            **{name: (self.model.model_fields[name].annotation, self.model.model_fields[name])
+               for name in fields}
+        )
+
+    def _values(self, row: Any, fields: Tuple[str, ...]) -> dict:
+        return {
+            name: str(row[name]) if isinstance(row[name], uuid.UUID) else row[name]
+            for name in fields
+        }
+
+    def render(self, rows: Iterable[Any], fields: Tuple[str, ...]) -> bytes:
+        """Validate and JSON-encode the requested fields of each row"""
+        partial = self._model(fields)
+        items = [partial.model_validate(self._values(row, fields)) for row in rows]
+        return self._list_adapter(partial).dump_json(items)
+
+    def render_one(self, row: Any, fields: Tuple[str, ...]) -> bytes:
+        """Like render() for a single object"""
+        return self._model(fields).model_validate(self._values(row, fields)).model_dump_json().encode()
+
+    def stats(self) -> dict:
+        """Cache counters for /metrics"""
+        info = self._model.cache_info()
+        return {"fieldsets": info.currsize, "hits": info.hits, "misses": info.misses}
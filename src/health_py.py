@@ -0,0 +1,168 @@
+"""
+==============================================================================
+Background Health Prober
+==============================================================================
+Location: src/health.py
+Purpose: Probe the database on a timer so /health never touches the pool
+==============================================================================
+
+Orchestrators and load balancers may hit /health every second from several
+places. Running `SELECT 1` per call steals pool connections from real
+traffic, so a single background task probes at a fixed interval and /health
+serves the cached result. A result older than `stale_after` means the
+prober itself is stuck, and the service reports "degraded". During an
+outage every probe fails the same way; with an ErrorLog (src/error_log.py)
+those failures are logged once per window and then summarized.
+
+    prober = HealthProber(interval=5, stale_after=15, error_log=error_log)
+    await prober.start(lambda: db_pool)
+    state = prober.snapshot()
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from src.error_log import ErrorLog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one probe"""
+    database: str                         # connected | disconnected | connecting
+    latency_ms: Optional[float]           # SELECT 1 round trip (incl. acquire)
+    pool_utilization: Optional[float]     # in_use / target (ManagedPool only)
+    pool_waiters: Optional[int]           # requests queued for a connection
+    checked_at: datetime                  # wall-clock time of the probe
+    monotonic: float                      # time.monotonic() of the probe
+    error: Optional[str] = None
+
+
+@dataclass
+class HealthSnapshot:
+    """What /health reports"""
+    status: str                           # healthy | degraded
+    database: str                         # connected | disconnected | connecting | unknown
+    latency_ms: Optional[float]
+    pool_utilization: Optional[float]
+    pool_waiters: Optional[int]
+    checked_at: Optional[datetime]
+    age_seconds: Optional[float]
+
+
+class HealthProber:
+    """
+    Periodically probe the database and cache the result.
+
+    Args:
+        interval: Seconds between probes
+        stale_after: Age (seconds) after which cached data counts as stale
+        timeout: Per-probe timeout for acquire + query
+        on_probe: Called with each ProbeResult (e.g. to feed a circuit breaker)
+        error_log: Aggregates repeated probe failures (None = log each one)
+    """
+
+    def __init__(self, interval: float = 5.0, stale_after: float = 15.0, timeout: float = 2.0,
+                 on_probe: Optional[Callable[[ProbeResult], None]] = None,
+                 error_log: Optional[ErrorLog] = None):
+        self.interval = interval
+        self.stale_after = stale_after
+        self.timeout = timeout
+        self.on_probe = on_probe
+        self.error_log = error_log
+        self.last: Optional[ProbeResult] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def probe(self, pool: Any) -> ProbeResult:
+        """Run one probe against `pool` (None = still connecting) and cache it"""
+        utilization = waiters = None
+        if pool is not None and callable(getattr(type(pool), "stats", None)):
+            stats = pool.stats()
+            utilization, waiters = stats.get("utilization"), stats.get("waiters")
+
+        started = time.perf_counter()
+        latency = error = None
+        if pool is None:
+            database = "connecting"
+        else:
+            try:
+                await asyncio.wait_for(self._select_one(pool), self.timeout)
+                latency = round((time.perf_counter() - started) * 1000, 3)
+                database = "connected"
+            except Exception as e:
+                self._error(f"Database health probe failed: {e!r}")
+                database, error = "disconnected", repr(e)
+
+        self.last = ProbeResult(
+            database=database,
+            latency_ms=latency,
+            pool_utilization=utilization,
+            pool_waiters=waiters,
+            checked_at=datetime.utcnow(),
+            monotonic=time.monotonic(),
+            error=error,
+        )
+        if self.on_probe is not None:
+            self.on_probe(self.last)
+        return self.last
+
+    def _error(self, message: str, exc_info: Optional[BaseException] = None) -> None:
+        if self.error_log is not None:
+            self.error_log.error(message, exc_info=exc_info)
+        else:
+            logger.error(message, exc_info=exc_info)
+
+    @staticmethod
+    async def _select_one(pool: Any) -> None:
+        async with pool.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+
+    def snapshot(self) -> HealthSnapshot:
+        """Cached health state; never performs I/O"""
+        last = self.last
+        if last is None:
+            return HealthSnapshot("degraded", "unknown", None, None, None, None, None)
+
+        age = time.monotonic() - last.monotonic
+        healthy = age <= self.stale_after and last.database == "connected"
+        return HealthSnapshot(
+            status="healthy" if healthy else "degraded",
+            database=last.database,
+            latency_ms=last.latency_ms,
+            pool_utilization=last.pool_utilization,
+            pool_waiters=last.pool_waiters,
+            checked_at=last.checked_at,
+            age_seconds=round(age, 3),
+        )
+
+    async def _run(self, get_pool: Callable[[], Any]) -> None:
+        while True:
+            try:
+                await self.probe(get_pool())
+            except Exception as e:
+                self._error(f"Health prober iteration failed: {e}", e)
+            await asyncio.sleep(self.interval)
+
+    async def start(self, get_pool: Callable[[], Any]) -> None:
+        """Start probing; `get_pool` is called each time (pool may appear later)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(get_pool))
+
+    async def stop(self) -> None:
+        """Stop probing"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self) -> None:
+        """Forget the cached result"""
+        self.last = None
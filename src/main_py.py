@@ -9,17 +9,63 @@ Framework: FastAPI (high-performance async web framework)
 """
 
 import os
+import asyncio
+import json
 import logging
+import math
+import random
+import signal
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.requests import Request
 from pydantic import BaseModel, Field, EmailStr
 import asyncpg
 
+from src.access_log import AccessLog, AccessLogMiddleware, configure_queue_logging
+from src.admission import AdmissionControlMiddleware, AdmissionController
+from src.auth import InvalidTokenError, TokenVerifier
+from src.batch import SubRequestDispatcher
+from src.batching import BatchLoader
+from src.compression import CompressedCache, CompressionMiddleware, CompressionPolicy
+from src.counts import CountService, TotalCount, plan_rows
+from src.deadlines import DeadlineExceeded, DeadlineMiddleware, DeadlinePolicy, remaining
+from src.export import EXPORT_MEDIA_TYPES, prefetched, stream_query
+from src.fieldsets import SparseFields
+from src.error_log import ErrorLog
+from src.health import HealthProber, ProbeResult
+from src.passwords import PasswordHasher
+from src.repository import Repository, open_repository
+from src.replicas import CURRENT_LSN_SQL, ReplicaPool, ReplicaRouter
+from src.search import (
+    PROJECTS_SEARCH_CONFIG,
+    PROJECTS_SEARCH_VECTOR,
+    USERS_SEARCH_CONFIG,
+    USERS_SEARCH_VECTOR,
+    decode_cursor,
+    encode_cursor,
+    normalize_query,
+)
+from src.resilience import CircuitBreaker, CircuitOpenError, Hedger, ResilientReader, RetryPolicy
+from src.pool import ManagedPool, pool_budget
+from src.singleflight import SingleFlight
+from src.tracing import (
+    JsonlTraceExporter,
+    TracedJSONResponse,
+    TracingMiddleware,
+    record,
+    span,
+)
+
 # ==============================================================================
 # CONFIGURATION
 # ==============================================================================
@@ -29,19 +75,175 @@ ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/myapp")
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Optional streaming replicas for GET traffic (comma-separated DSNs); clients
+# get read-your-writes via the consistency token (see src/replicas.py)
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+REPLICA_POLL_INTERVAL = float(os.getenv("REPLICA_POLL_INTERVAL", "0.2"))
+CONSISTENCY_HEADER = "X-Consistency-Token"
+
+# Listing totals: exact count(*) below the threshold, planner estimate above
+# it, cached for COUNT_CACHE_TTL seconds (see src/counts.py)
+COUNT_EXACT_THRESHOLD = int(os.getenv("COUNT_EXACT_THRESHOLD", "10000"))
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "5"))
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+
+# Search: page size cap, index matches read per query (bounds the heap
+# fetches and ranking for very common terms), best-ranked matches kept for
+# paging, and a server-side statement_timeout in seconds (create the indexes
+# with `python -m src.migrations`)
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+SEARCH_MAX_SCANNED = int(os.getenv("SEARCH_MAX_SCANNED", "10000"))
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "1000"))
+SEARCH_STATEMENT_TIMEOUT = float(os.getenv("SEARCH_STATEMENT_TIMEOUT", "2"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Let Postgres render listing pages as JSON (skips per-row Pydantic models)
+JSON_FAST_PATH = os.getenv("JSON_FAST_PATH", "false").lower() == "true"
+
+# Upper bound (seconds) for a coalesced read shared by concurrent requests
+SINGLEFLIGHT_TIMEOUT = float(os.getenv("SINGLEFLIGHT_TIMEOUT", "10"))
+
+# Window (ms) during which get_user lookups are merged into one query
+USER_BATCH_WINDOW_MS = float(os.getenv("USER_BATCH_WINDOW_MS", "1"))
+MAX_IDS_PER_REQUEST = int(os.getenv("MAX_IDS_PER_REQUEST", "100"))
+
+# Connection pool bounds (the pool grows/shrinks between MIN and MAX)
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "20"))
+DB_POOL_INITIAL = int(os.getenv("DB_POOL_INITIAL", "10"))
+DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "60"))
+DB_POOL_SCALE_INTERVAL = float(os.getenv("DB_POOL_SCALE_INTERVAL", "1"))
+
+# Postgres connection budget shared by all worker processes
+PG_MAX_CONNECTIONS = int(os.getenv("PG_MAX_CONNECTIONS", "100"))
+PG_RESERVED_CONNECTIONS = int(os.getenv("PG_RESERVED_CONNECTIONS", "10"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# User creation (bcrypt runs in worker processes, see src/passwords.py). A bulk
+# request must hash within BULK_REQUEST_TIMEOUT: at the default cost (12, about
+# 0.25 s per hash) 1000 users take ~250 s on a single worker. Each extra
+# BCRYPT_ROUNDS doubles the cost, so halve this cap along with it.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or None
+MAX_BULK_USERS = int(os.getenv("MAX_BULK_USERS", "1000"))
+
+# Bearer-token authentication (verified claims are cached, see src/auth.py).
+# With AUTH_ENABLED the app refuses to start on the placeholder secret. Keys
+# can instead come from JWT_SECRET_FILE (one per line, all accepted, so old
+# and new overlap during a rotation); SIGHUP re-reads the file.
+AUTH_ENABLED = os.getenv("AUTH_ENABLED", "false").lower() == "true"
+DEFAULT_JWT_SECRET_KEY = "change-me-in-production"
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", DEFAULT_JWT_SECRET_KEY)
+JWT_SECRET_FILE = os.getenv("JWT_SECRET_FILE", "")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+
+# "background": serve immediately, connect with retry; "blocking": old behaviour
+DB_STARTUP_MODE = os.getenv("DB_STARTUP_MODE", "background")
+DB_CONNECT_RETRY_BASE = float(os.getenv("DB_CONNECT_RETRY_BASE", "0.5"))
+DB_CONNECT_RETRY_MAX = float(os.getenv("DB_CONNECT_RETRY_MAX", "30"))
+
+# Background health probing (/health serves the cached result)
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+HEALTH_STALE_AFTER = float(os.getenv("HEALTH_STALE_AFTER", "15"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+
+# Admission control: in-flight limit (0 = pool target size x multiplier),
+# bounded wait queue and the longest wait worth queueing for (seconds)
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "0"))
+ADMISSION_POOL_MULTIPLIER = float(os.getenv("ADMISSION_POOL_MULTIPLIER", "2"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "100"))
+ADMISSION_WAIT_BUDGET = float(os.getenv("ADMISSION_WAIT_BUDGET", "0.5"))
+
+# Request deadlines (seconds): bound every pool acquire and query; clients may
+# ask for less with the X-Request-Timeout header (see src/deadlines.py)
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "10"))
+BULK_REQUEST_TIMEOUT = float(os.getenv("BULK_REQUEST_TIMEOUT", "300"))
+
+# POST /batch: sub-requests per batch and how many run at once
+MAX_BATCH_REQUESTS = int(os.getenv("MAX_BATCH_REQUESTS", "20"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+# Projects embedded by GET /users/{id}?include=projects
+INCLUDE_PROJECTS_LIMIT = int(os.getenv("INCLUDE_PROJECTS_LIMIT", "20"))
+
+# Streaming exports: whole-request deadline (seconds) and rows fetched from
+# the server-side cursor per round trip (see src/export.py)
+EXPORT_REQUEST_TIMEOUT = float(os.getenv("EXPORT_REQUEST_TIMEOUT", "3600"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Response compression (zstd / br / gzip): bodies under the minimum are sent
+# as-is, larger ones are compressed in a thread, and compressed pages are
+# cached by body digest (see src/compression.py)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_OFFLOAD_SIZE = int(os.getenv("COMPRESSION_OFFLOAD_SIZE", "65536"))
+COMPRESSION_CACHE_MB = float(os.getenv("COMPRESSION_CACHE_MB", "16"))
+
+# Tracing: every response carries Server-Timing; a sample of full traces can
+# be appended to a JSONL file (empty path = export disabled)
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+
+# Read resilience: attempts per read for transient connection errors, hedged
+# duplicates after each statement's p95 latency (only to another replica, so
+# on by default only when replicas are configured), and a breaker that fails
+# fast (503) after consecutive connection failures (see src/resilience.py)
+DB_READ_ATTEMPTS = int(os.getenv("DB_READ_ATTEMPTS", "3"))
+DB_RETRY_BASE_DELAY = float(os.getenv("DB_RETRY_BASE_DELAY", "0.05"))
+DB_HEDGE_READS = os.getenv(
+    "DB_HEDGE_READS", "true" if DATABASE_REPLICA_URLS else "false"
+).lower() == "true"
+DB_BREAKER_THRESHOLD = int(os.getenv("DB_BREAKER_THRESHOLD", "5"))
+DB_BREAKER_RESET = float(os.getenv("DB_BREAKER_RESET", "5"))
+
+# Access log: fraction of ordinary requests logged; 5xx and requests slower
+# than ACCESS_LOG_SLOW_MS are always logged (see src/access_log.py)
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", "500"))
+
+# Repeated identical errors are logged once per interval (seconds), then
+# summarized with a count (see src/error_log.py)
+ERROR_LOG_SUMMARY_INTERVAL = float(os.getenv("ERROR_LOG_SUMMARY_INTERVAL", "60"))
+
+# Configure logging (records are written by a background thread)
+configure_queue_logging(
+    LOG_LEVEL,
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
+error_log = ErrorLog(logger, interval=ERROR_LOG_SUMMARY_INTERVAL)
 
 # ==============================================================================
 # DATABASE CONNECTION POOL
 # ==============================================================================
 
-# Global database pool (initialized in lifespan)
-db_pool: Optional[asyncpg.Pool] = None
+# Global database pool (initialized in lifespan, see src/pool.py)
+db_pool: Optional[ManagedPool] = None
+
+# Background connect task and its progress (DB_STARTUP_MODE=background)
+db_connect_task: Optional[asyncio.Task] = None
+db_connect_attempts = 0
+db_connect_error: Optional[str] = None
+
+# Replica pools and their routing state (None = no replicas configured)
+replica_router: Optional[ReplicaRouter] = (
+    ReplicaRouter(poll_interval=REPLICA_POLL_INTERVAL) if DATABASE_REPLICA_URLS else None
+)
+replica_connect_task: Optional[asyncio.Task] = None
+
+# Local storage engine for the listing/lookup endpoints when DATABASE_URL is
+# memory:// or sqlite:// (None = PostgreSQL; see src/repository.py)
+local_repository: Optional[Repository] = open_repository(DATABASE_URL)
+
+# Probes the DB on a timer so /health never takes a pool connection
+health_prober = HealthProber(
+    interval=HEALTH_PROBE_INTERVAL,
+    stale_after=HEALTH_STALE_AFTER,
+    timeout=HEALTH_PROBE_TIMEOUT,
+    error_log=error_log
+)
 
 
 async def get_db_pool() -> asyncpg.Pool:
@@ -52,13 +254,241 @@ async def get_db_pool() -> asyncpg.Pool:
         asyncpg.Pool: Database connection pool
     
     Raises:
-        RuntimeError: If database pool is not initialized
+        HTTPException: If the pool is still connecting (503), or the app
+            runs on a local storage engine (501)
     """
+    if local_repository is not None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Not available with the {local_repository.name} storage backend"
+        )
     if db_pool is None:
-        raise RuntimeError("Database pool not initialized")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database not ready",
+            headers={"Retry-After": "1"}
+        )
     return db_pool
 
 
+async def get_read_pool(
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    consistency_token: Optional[str] = Header(None, alias=CONSISTENCY_HEADER)
+) -> asyncpg.Pool:
+    """
+    Dependency for read-only endpoints: a replica when one can serve the
+    request, otherwise the primary.
+    
+    Args:
+        pool: Primary pool (injected)
+        consistency_token: WAL position returned by the client's last write
+    
+    Returns:
+        asyncpg.Pool: The least-busy caught-up replica, or the primary
+    """
+    if replica_router is None:
+        return pool
+    return replica_router.route(pool, consistency_token)
+
+
+async def postgres_read_repository(pool: asyncpg.Pool = Depends(get_read_pool)) -> Repository:
+    """Dependency: the request's read pool as a Repository"""
+    return PostgresRepository(pool)
+
+
+async def local_read_repository() -> Repository:
+    """Dependency: the memory / SQLite engine chosen by DATABASE_URL"""
+    return local_repository
+
+
+# Dependency for GET /users, /users/{id} and /projects, chosen once from the
+# DATABASE_URL scheme
+get_read_repository = (
+    postgres_read_repository if local_repository is None else local_read_repository
+)
+
+
+async def connect_database(dsn: str = DATABASE_URL) -> ManagedPool:
+    """
+    Create a connection pool and verify it.
+    
+    asyncpg.create_pool opens min_size connections up front, so the pool
+    is warm once this returns.
+    
+    Args:
+        dsn: Server to connect to (the primary unless given a replica)
+    
+    Returns:
+        ManagedPool: Started, adaptively sized pool
+    """
+    # Per-worker share of the Postgres connection budget
+    pool_max = pool_budget(
+        PG_MAX_CONNECTIONS, PG_RESERVED_CONNECTIONS, WEB_CONCURRENCY, DB_POOL_MAX
+    )
+    pool_min = min(DB_POOL_MIN, pool_max)
+    
+    # Initialize database connection pool
+    logger.info("Connecting to database...")
+    raw_pool = await asyncpg.create_pool(
+        dsn,
+        min_size=pool_min,
+        max_size=pool_max,
+        max_inactive_connection_lifetime=DB_POOL_IDLE_TIMEOUT,
+        command_timeout=60
+    )
+    logger.info("Database connection pool created successfully")
+    
+    try:
+        # Test database connection
+        async with raw_pool.acquire() as conn:
+            version = await conn.fetchval("SELECT version()")
+            logger.info(f"Connected to: {version}")
+            server_max = int(await conn.fetchval("SHOW max_connections"))
+    except Exception:
+        await raw_pool.close()
+        raise
+    
+    # Never plan for more than the server actually allows
+    pool_max = min(pool_max, pool_budget(
+        server_max, PG_RESERVED_CONNECTIONS, WEB_CONCURRENCY, pool_max
+    ))
+    pool = ManagedPool(
+        raw_pool,
+        min_size=pool_min,
+        max_size=pool_max,
+        initial_size=DB_POOL_INITIAL,
+        interval=DB_POOL_SCALE_INTERVAL
+    )
+    await pool.start()
+    logger.info(f"Connection pool bounds: {pool_min}-{pool_max} per worker")
+    return pool
+
+
+async def connect_with_retry() -> None:
+    """
+    Keep trying to connect until it works (exponential backoff + jitter).
+    
+    Sets the global db_pool on success; readiness flips at that moment.
+    """
+    global db_pool, db_connect_attempts, db_connect_error
+    
+    delay = DB_CONNECT_RETRY_BASE
+    while db_pool is None:
+        db_connect_attempts += 1
+        try:
+            db_pool = await connect_database()
+            db_connect_error = None
+            logger.info(f"Database ready after {db_connect_attempts} attempt(s)")
+        except Exception as e:
+            db_connect_error = str(e)
+            logger.warning(
+                f"Database connect attempt {db_connect_attempts} failed: {e}; "
+                f"retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, DB_CONNECT_RETRY_MAX)
+
+
+async def connect_replicas() -> None:
+    """
+    Connect every DATABASE_REPLICA_URLS entry, retrying each in the
+    background; a replica joins the rotation once connected and polled.
+    """
+    async def connect(index: int, dsn: str) -> None:
+        delay = DB_CONNECT_RETRY_BASE
+        while True:
+            try:
+                pool = await connect_database(dsn)
+            except Exception as e:
+                logger.warning(
+                    f"Replica {index} connect failed: {e}; retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, DB_CONNECT_RETRY_MAX)
+                continue
+            replica = replica_router.add(f"replica-{index}", pool)
+            await replica_router.poll(replica)
+            return
+    
+    await replica_router.start()
+    await asyncio.gather(*(connect(i, dsn) for i, dsn in enumerate(DATABASE_REPLICA_URLS)))
+
+
+# ==============================================================================
+# AUTHENTICATION
+# ==============================================================================
+
+token_verifier = TokenVerifier(
+    JWT_SECRET_KEY,
+    algorithms=[JWT_ALGORITHM],
+    cache_size=JWT_CACHE_SIZE
+)
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def load_signing_keys() -> List[str]:
+    """
+    Signing keys from JWT_SECRET_FILE (one per line) or JWT_SECRET_KEY.
+    
+    Raises:
+        RuntimeError: If there is no key, or the placeholder default is used
+        OSError: If JWT_SECRET_FILE can't be read
+    """
+    if JWT_SECRET_FILE:
+        with open(JWT_SECRET_FILE) as f:
+            keys = [line.strip() for line in f if line.strip()]
+    else:
+        keys = [JWT_SECRET_KEY] if JWT_SECRET_KEY else []
+    
+    if not keys or DEFAULT_JWT_SECRET_KEY in keys:
+        raise RuntimeError(
+            "AUTH_ENABLED=true needs a real signing secret: set JWT_SECRET_KEY "
+            f"(or JWT_SECRET_FILE) to something other than {DEFAULT_JWT_SECRET_KEY!r}"
+        )
+    return keys
+
+
+def reload_signing_keys() -> None:
+    """SIGHUP handler: rotate to the current keys, keeping the old ones on error"""
+    try:
+        token_verifier.rotate_keys(load_signing_keys())
+        logger.info("Reloaded JWT signing keys")
+    except (OSError, RuntimeError) as e:
+        logger.error(f"Keeping the current JWT signing keys: {e}")
+
+
+async def require_auth(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Optional[Dict[str, Any]]:
+    """
+    Dependency enforcing a valid bearer token (when AUTH_ENABLED).
+    
+    Returns:
+        dict: Verified JWT claims (None when auth is disabled)
+    
+    Raises:
+        HTTPException: If the token is missing or invalid (401)
+    """
+    if not AUTH_ENABLED:
+        return None
+    
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    try:
+        return token_verifier.verify(credentials.credentials)
+    except InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -66,7 +496,8 @@ async def lifespan(app: FastAPI):
     Handles startup and shutdown events.
     
     Startup:
-        - Initialize database connection pool
+        - Initialize database connection pool (in the background by
+          default, so the app serves /health/live immediately)
         - Run migrations (if needed)
         - Initialize cache
     
@@ -74,39 +505,75 @@ async def lifespan(app: FastAPI):
         - Close database connections
         - Cleanup resources
     """
-    global db_pool
+    global db_pool, db_connect_task, replica_connect_task
     
     # STARTUP
     logger.info(f"Starting application in {ENVIRONMENT} mode...")
     
-    try:
-        # Initialize database connection pool
-        logger.info("Connecting to database...")
-        db_pool = await asyncpg.create_pool(
-            DATABASE_URL,
-            min_size=2,
-            max_size=10,
-            command_timeout=60
-        )
-        logger.info("Database connection pool created successfully")
-        
-        # Test database connection
-        async with db_pool.acquire() as conn:
-            version = await conn.fetchval("SELECT version()")
-            logger.info(f"Connected to: {version}")
-            
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
-        raise
+    if AUTH_ENABLED:
+        # Refuse to start rather than accept tokens anyone could sign
+        token_verifier.rotate_keys(load_signing_keys())
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_signing_keys)
+    
+    if local_repository is not None:
+        # No PostgreSQL: only the repository-backed endpoints are served
+        logger.info(f"Using the {local_repository.name} storage backend")
+        await local_repository.connect()
+    elif DB_STARTUP_MODE == "blocking":
+        try:
+            db_pool = await connect_database()
+        except Exception as e:
+            logger.error(f"Failed to initialize database: {e}")
+            raise
+    else:
+        db_connect_task = asyncio.create_task(connect_with_retry())
+    
+    if replica_router is not None:
+        replica_connect_task = asyncio.create_task(connect_replicas())
+    
+    await health_prober.start(lambda: db_pool)
+    await error_log.start()
     
     yield  # Application runs here
     
     # SHUTDOWN
     logger.info("Shutting down application...")
     
+    if AUTH_ENABLED:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    
+    await health_prober.stop()
+    await error_log.stop()
+    
+    if local_repository is not None:
+        await local_repository.close()
+    
+    if db_connect_task and not db_connect_task.done():
+        db_connect_task.cancel()
+        try:
+            await db_connect_task
+        except asyncio.CancelledError:
+            pass
+    
+    if replica_connect_task and not replica_connect_task.done():
+        replica_connect_task.cancel()
+        try:
+            await replica_connect_task
+        except asyncio.CancelledError:
+            pass
+    if replica_router is not None:
+        await replica_router.close()
+    
     if db_pool:
         await db_pool.close()
+        db_pool = None
         logger.info("Database connections closed")
+    
+    # Joins the worker processes; keep that wait off the event loop
+    await asyncio.to_thread(password_hasher.shutdown)
+    
+    if trace_exporter is not None:
+        trace_exporter.close()
 
 
 # ==============================================================================
@@ -118,6 +585,7 @@ app = FastAPI(
     description="Production-grade FastAPI microservice with Docker and WSL2",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=TracedJSONResponse,  # times JSON encoding
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc
 )
@@ -133,24 +601,83 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        CONSISTENCY_HEADER, TOTAL_COUNT_HEADER, TOTAL_COUNT_ESTIMATED_HEADER, NEXT_CURSOR_HEADER
+    ],
 )
 
 
-# Custom request logging middleware
-@app.middleware("http")
-async def log_requests(request, call_next):
-    """Log all HTTP requests"""
-    start_time = datetime.utcnow()
-    response = await call_next(request)
-    duration = (datetime.utcnow() - start_time).total_seconds()
-    
-    logger.info(
-        f"{request.method} {request.url.path} - "
-        f"Status: {response.status_code} - "
-        f"Duration: {duration:.3f}s"
-    )
-    
-    return response
+def admission_limit() -> int:
+    """In-flight request limit, following the pool's adaptive target size"""
+    if ADMISSION_MAX_CONCURRENCY:
+        return ADMISSION_MAX_CONCURRENCY
+    pool_size = db_pool.target_size if db_pool is not None else DB_POOL_INITIAL
+    return math.ceil(pool_size * ADMISSION_POOL_MULTIPLIER)
+
+
+# Admission control (lower number = higher priority; see src/admission.py)
+admission_controller = AdmissionController(
+    max_concurrency=admission_limit,
+    max_queue=ADMISSION_MAX_QUEUE,
+    wait_budget=ADMISSION_WAIT_BUDGET,
+    priorities=[
+        ("/users/", 1),     # single-row lookups
+        ("/users", 2),      # listings and search
+        ("/projects", 2),
+        ("/users/search", 2),
+        ("/projects/search", 2),
+        ("/users/export", 3),     # heavy work is shed first
+        ("/projects/export", 3),
+        ("/users:bulk", 3),
+        ("/batch", 3),
+    ],
+    default_priority=1,
+    # Minutes-long streams would inflate the service-time estimate
+    long_running=["/users/export", "/projects/export"],
+    # Probes and metrics must keep answering under load; they never touch
+    # the pool (/health serves the background prober's cached state)
+    exempt=["/health", "/metrics"]
+)
+app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
+
+# Sampled access log (wraps admission control so shed 503s are logged)
+access_log = AccessLog(
+    sample_rate=ACCESS_LOG_SAMPLE_RATE,
+    slow_threshold=ACCESS_LOG_SLOW_MS / 1000
+)
+app.add_middleware(AccessLogMiddleware, access_log=access_log)
+
+
+# Request deadlines and disconnect cancellation (wraps admission control, so
+# time spent queued counts against the deadline; see src/deadlines.py)
+deadline_policy = DeadlinePolicy(
+    default_timeout=REQUEST_TIMEOUT,
+    route_timeouts=[
+        ("/users:bulk", BULK_REQUEST_TIMEOUT),
+        ("/users/export", EXPORT_REQUEST_TIMEOUT),
+        ("/projects/export", EXPORT_REQUEST_TIMEOUT),
+    ]
+)
+app.add_middleware(DeadlineMiddleware, policy=deadline_policy)
+
+
+# Response compression (inside tracing, so compress time shows up as a span)
+compression_policy = CompressionPolicy(
+    minimum_size=COMPRESSION_MIN_SIZE,
+    offload_size=COMPRESSION_OFFLOAD_SIZE,
+    cache=CompressedCache(int(COMPRESSION_CACHE_MB * 2**20)) if COMPRESSION_CACHE_MB > 0 else None
+)
+app.add_middleware(CompressionMiddleware, policy=compression_policy)
+
+
+# Per-request spans -> Server-Timing header, access log fields and sampled
+# JSONL traces (outermost, so "total" covers everything; see src/tracing.py)
+trace_exporter = (
+    JsonlTraceExporter(TRACE_EXPORT_PATH, sample_rate=TRACE_SAMPLE_RATE)
+    if TRACE_EXPORT_PATH else None
+)
+app.add_middleware(TracingMiddleware, exporter=trace_exporter)
 
 
 # ==============================================================================
@@ -159,11 +686,40 @@ async def log_requests(request, call_next):
 
 class HealthResponse(BaseModel):
     """Health check response model"""
-    status: str = Field(..., description="Service status")
+    status: str = Field(..., description="Service status (healthy | degraded)")
     environment: str = Field(..., description="Current environment")
     version: str = Field(..., description="Application version")
     timestamp: datetime = Field(..., description="Current server time")
     database: str = Field(..., description="Database connection status")
+    db_latency_ms: Optional[float] = Field(None, description="Last probe round trip")
+    pool_utilization: Optional[float] = Field(None, description="Pool in_use / target at last probe")
+    pool_waiters: Optional[int] = Field(None, description="Requests waiting at last probe")
+    checked_at: Optional[datetime] = Field(None, description="When the DB was last probed")
+    probe_age_seconds: Optional[float] = Field(None, description="Age of the cached probe")
+    circuit: str = Field("closed", description="Database circuit breaker (closed | open | half_open)")
+
+
+class ProbeResponse(BaseModel):
+    """Liveness / readiness probe response model"""
+    status: str = Field(..., description="alive | ready | not_ready")
+    timestamp: datetime = Field(..., description="Current server time")
+    detail: Optional[str] = Field(None, description="Why the service is not ready")
+
+
+class PoolHealthResponse(BaseModel):
+    """Connection pool pressure and sizing"""
+    target_size: int = Field(..., description="Current adaptive connection limit")
+    min_size: int = Field(..., description="Lower bound for the target size")
+    max_size: int = Field(..., description="Upper bound (per-worker budget)")
+    open_connections: Optional[int] = Field(None, description="Connections currently open")
+    idle_connections: Optional[int] = Field(None, description="Open connections not in use")
+    in_use: int = Field(..., description="Connections currently held by requests")
+    waiters: int = Field(..., description="Requests waiting for a connection")
+    utilization: float = Field(..., description="in_use / target_size")
+    acquire_count: int = Field(..., description="Successful acquisitions")
+    acquire_timeouts: int = Field(..., description="Acquisitions that timed out")
+    acquire_wait_ms: Dict[str, float] = Field(..., description="Acquire wait percentiles")
+    resizes: int = Field(..., description="Number of target size changes")
 
 
 class UserCreate(BaseModel):
@@ -184,6 +740,53 @@ class UserCreate(BaseModel):
         }
 
 
+class BulkUserCreate(BaseModel):
+    """Bulk user creation request model"""
+    users: List[UserCreate] = Field(
+        ..., min_length=1, max_length=MAX_BULK_USERS, description="Users to create"
+    )
+
+
+class BulkUserConflict(BaseModel):
+    """A row from a bulk import that was not inserted"""
+    index: int = Field(..., description="Position in the request's users list")
+    username: str = Field(..., description="Username of the rejected row")
+    email: str = Field(..., description="Email of the rejected row")
+    reason: str = Field(..., description="Why the row was rejected")
+
+
+class BulkUserResult(BaseModel):
+    """Bulk user creation response model"""
+    created: int = Field(..., description="Number of users inserted")
+    conflicts: List[BulkUserConflict] = Field(..., description="Rows that were skipped")
+
+
+class BatchRequest(BaseModel):
+    """Batch of GET sub-requests"""
+    requests: List[str] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_REQUESTS,
+        description="Paths with query strings, e.g. /users/<uuid> or /projects?limit=5"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {"requests": ["/users/123e4567-e89b-12d3-a456-426614174000", "/projects?limit=5"]}
+        }
+
+
+class BatchResponseItem(BaseModel):
+    """Result of one sub-request"""
+    path: str = Field(..., description="The requested path")
+    status: int = Field(..., description="HTTP status of the sub-request")
+    headers: Dict[str, str] = Field(default_factory=dict, description="Response headers")
+    body: Any = Field(None, description="Decoded response body")
+
+
+class BatchResult(BaseModel):
+    """Batch response model"""
+    responses: List[BatchResponseItem] = Field(..., description="One result per request, in order")
+
+
 class UserResponse(BaseModel):
     """User response model (no password)"""
     id: str = Field(..., description="User UUID")
@@ -203,132 +806,1071 @@ class ProjectResponse(BaseModel):
     created_at: datetime = Field(..., description="Creation timestamp")
 
 
+class UserProjectsResponse(BaseModel):
+    """A user's projects plus counts by status"""
+    user_id: str = Field(..., description="User UUID")
+    projects: List[ProjectResponse] = Field(..., description="Projects, newest first")
+    status_counts: Dict[str, int] = Field(..., description="All of the user's projects by status")
+    total: int = Field(..., description="All of the user's projects")
+
+
+class UserWithProjectsResponse(UserResponse):
+    """User response with embedded projects (?include=projects)"""
+    projects: List[ProjectResponse] = Field(..., description="Newest projects")
+    project_counts: Dict[str, int] = Field(..., description="All of the user's projects by status")
+
+
+# `?fields=` whitelists: the response models' fields, which are also the
+# column names (see src/fieldsets.py)
+user_fields = SparseFields(UserResponse)
+project_fields = SparseFields(ProjectResponse)
+
+
 # ==============================================================================
-# API ENDPOINTS
+# SQL STATEMENTS
 # ==============================================================================
 
-@app.get(
-    "/",
-    summary="Root endpoint",
-    description="Welcome message and API information",
-    response_model=Dict[str, str]
-)
-async def root():
-    """
-    Root endpoint - API welcome message.
-    
-    Returns:
-        dict: Welcome message and documentation links
-    """
-    return {
-        "message": "Welcome to the Professional Microservice API",
-        "docs": "/docs",
-        "redoc": "/redoc",
-        "health": "/health",
-        "version": "0.1.0"
-    }
+# {columns} is filled from a fieldset whitelist (SparseFields.statement)
+USERS_PAGE_TEMPLATE = """
+    SELECT {columns}
+    FROM users
+    WHERE deleted_at IS NULL
+    ORDER BY created_at DESC
+    LIMIT $1 OFFSET $2
+"""
 
+USER_BY_ID_SQL = """
+    SELECT id, username, email, full_name, is_active, created_at
+    FROM users
+    WHERE id = $1 AND deleted_at IS NULL
+"""
 
-@app.get(
-    "/health",
-    summary="Health check",
-    description="Check API and database health",
-    response_model=HealthResponse,
-    status_code=status.HTTP_200_OK
-)
-async def health_check(pool: asyncpg.Pool = Depends(get_db_pool)):
-    """
-    Health check endpoint.
-    
-    Verifies:
-        - API is running
-        - Database connection is working
-        - System resources are available
-    
-    Returns:
-        HealthResponse: Health status information
-    
-    Raises:
-        HTTPException: If health check fails
-    """
-    try:
-        # Test database connection
-        async with pool.acquire() as conn:
-            await conn.fetchval("SELECT 1")
-        db_status = "connected"
-        
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        db_status = "disconnected"
-    
-    return HealthResponse(
-        status="healthy",
-        environment=ENVIRONMENT,
-        version="0.1.0",
-        timestamp=datetime.utcnow(),
-        database=db_status
+USERS_BY_IDS_TEMPLATE = """
+    SELECT {columns}
+    FROM users
+    WHERE id = ANY($1::uuid[]) AND deleted_at IS NULL
+"""
+
+INSERT_USER_SQL = """
+    INSERT INTO users (username, email, password_hash, full_name)
+    VALUES ($1, $2, $3, $4)
+    RETURNING id, username, email, full_name, is_active, created_at
+"""
+
+# Bulk import: COPY into a temp table, then insert what doesn't collide
+USERS_IMPORT_TABLE_SQL = """
+    CREATE TEMP TABLE users_import (
+        idx integer,
+        username text,
+        email text,
+        password_hash text,
+        full_name text
+    ) ON COMMIT DROP
+"""
+
+USERS_IMPORT_INSERT_SQL = """
+    INSERT INTO users (username, email, password_hash, full_name)
+    SELECT username, email, password_hash, full_name
+    FROM users_import
+    ORDER BY idx
+    ON CONFLICT DO NOTHING
+    RETURNING username
+"""
+
+USERS_IMPORT_CONFLICTS_SQL = """
+    SELECT i.idx, i.username, i.email,
+           EXISTS (SELECT 1 FROM users u WHERE u.username = i.username) AS username_taken
+    FROM users_import i
+    WHERE i.username <> ALL($1::text[])
+    ORDER BY i.idx
+"""
+
+PROJECTS_PAGE_TEMPLATE = """
+    SELECT {columns}
+    FROM projects
+    WHERE deleted_at IS NULL AND status = 'active'
+    ORDER BY created_at DESC
+    LIMIT $1 OFFSET $2
+"""
+
+# Listing totals: the estimate applies the same filter as the listing, so
+# the planner's row estimate accounts for soft deletes
+COUNT_SQL = {
+    "users": (
+        "SELECT count(*) FROM users WHERE deleted_at IS NULL",
+        "EXPLAIN (FORMAT JSON) SELECT 1 FROM users WHERE deleted_at IS NULL",
+    ),
+    "projects": (
+        "SELECT count(*) FROM projects WHERE deleted_at IS NULL AND status = 'active'",
+        "EXPLAIN (FORMAT JSON) SELECT 1 FROM projects WHERE deleted_at IS NULL AND status = 'active'",
+    ),
+}
+
+# A user's projects in one round trip: the page and the per-status counts are
+# aggregated in Postgres. Both subqueries use projects_owner_idx
+# (src/migrations.py): the counts are an index-only scan, the page reads
+# description from the heap. No row = no such user.
+USER_PROJECTS_AGGREGATES = """
+        (SELECT COALESCE(json_agg(row_to_json(p) ORDER BY p.created_at DESC), '[]'::json)
+         FROM (
+             SELECT id, name, description, status, created_at
+             FROM projects
+             WHERE owner_id = u.id AND deleted_at IS NULL
+               AND ($4::text IS NULL OR status = $4)
+             ORDER BY created_at DESC
+             LIMIT $2 OFFSET $3
+         ) p)::text AS projects,
+        (SELECT COALESCE(json_object_agg(status, n), '{}'::json)
+         FROM (
+             SELECT status, count(*) AS n
+             FROM projects
+             WHERE owner_id = u.id AND deleted_at IS NULL
+             GROUP BY status
+         ) c)::text AS project_counts
+"""
+
+USER_PROJECTS_SQL = f"""
+    SELECT u.id,
+{USER_PROJECTS_AGGREGATES}
+    FROM users u
+    WHERE u.id = $1 AND u.deleted_at IS NULL
+"""
+
+USER_WITH_PROJECTS_SQL = f"""
+    SELECT u.id, u.username, u.email, u.full_name, u.is_active, u.created_at,
+{USER_PROJECTS_AGGREGATES}
+    FROM users u
+    WHERE u.id = $1 AND u.deleted_at IS NULL
+"""
+
+# Ranked search with keyset pagination ($1 query, $2/$3 rank and id of the
+# previous page's last row, $4 page size, $5 candidate cap, $6 scan cap).
+# `hits` stops after $6 index matches, so a common term never fetches and
+# ranks every matching row; `matches` keeps the $5 best-ranked of those,
+# ordered like the pages, so every page is cut from the same candidate set.
+# The vector expressions and WHERE predicates must match the indexes built
+# in src/migrations.py.
+USERS_SEARCH_SQL = f"""
+    WITH hits AS (
+        SELECT id, username, email, full_name, is_active, created_at, query
+        FROM users, websearch_to_tsquery('{USERS_SEARCH_CONFIG}', $1) AS query
+        WHERE deleted_at IS NULL
+          AND ({USERS_SEARCH_VECTOR} @@ query OR username % $1)
+        LIMIT $6
+    ), matches AS (
+        SELECT id, username, email, full_name, is_active, created_at,
+               ts_rank({USERS_SEARCH_VECTOR}, query) + similarity(username, $1) AS rank
+        FROM hits
+        ORDER BY rank DESC, id DESC
+        LIMIT $5
     )
+    SELECT * FROM matches
+    WHERE $2::real IS NULL OR (rank, id) < ($2::real, $3::uuid)
+    ORDER BY rank DESC, id DESC
+    LIMIT $4
+"""
 
+PROJECTS_SEARCH_SQL = f"""
+    WITH hits AS (
+        SELECT id, name, description, status, created_at, query
+        FROM projects, websearch_to_tsquery('{PROJECTS_SEARCH_CONFIG}', $1) AS query
+        WHERE deleted_at IS NULL AND status = 'active'
+          AND ({PROJECTS_SEARCH_VECTOR} @@ query OR name % $1)
+        LIMIT $6
+    ), matches AS (
+        SELECT id, name, description, status, created_at,
+               ts_rank({PROJECTS_SEARCH_VECTOR}, query) + similarity(name, $1) AS rank
+        FROM hits
+        ORDER BY rank DESC, id DESC
+        LIMIT $5
+    )
+    SELECT * FROM matches
+    WHERE $2::real IS NULL OR (rank, id) < ($2::real, $3::uuid)
+    ORDER BY rank DESC, id DESC
+    LIMIT $4
+"""
 
-@app.get(
-    "/users",
-    summary="List users",
-    description="Get all users (paginated)",
-    response_model=List[UserResponse],
+# Streaming exports: one server-side cursor per request, same visibility
+# rules as the listings
+USERS_EXPORT_SQL = """
+    SELECT id, username, email, full_name, is_active, created_at
+    FROM users
+    WHERE deleted_at IS NULL
+    ORDER BY created_at DESC
+"""
+
+PROJECTS_EXPORT_SQL = """
+    SELECT id, name, description, status, created_at
+    FROM projects
+    WHERE deleted_at IS NULL AND status = 'active'
+    ORDER BY created_at DESC
+"""
+
+USER_EXPORT_COLUMNS = ["id", "username", "email", "full_name", "is_active", "created_at"]
+PROJECT_EXPORT_COLUMNS = ["id", "name", "description", "status", "created_at"]
+
+# Database-rendered JSON (fast path)
+#
+# The listing endpoints can ask Postgres to build the whole page with
+# json_agg(row_to_json(...)) and hand the text straight to the client.
+# UserResponse / ProjectResponse remain the schema contract: the column lists
+# below must stay in sync with those models.
+
+USERS_PAGE_JSON_SQL = """
+    SELECT COALESCE(json_agg(row_to_json(u) ORDER BY u.created_at DESC), '[]'::json)::text
+    FROM (
+        SELECT id, username, email, full_name, is_active, created_at
+        FROM users
+        WHERE deleted_at IS NULL
+        ORDER BY created_at DESC
+        LIMIT $1 OFFSET $2
+    ) u
+"""
+
+PROJECTS_PAGE_JSON_SQL = """
+    SELECT COALESCE(json_agg(row_to_json(p) ORDER BY p.created_at DESC), '[]'::json)::text
+    FROM (
+        SELECT id, name, description, status, created_at
+        FROM projects
+        WHERE deleted_at IS NULL AND status = 'active'
+        ORDER BY created_at DESC
+        LIMIT $1 OFFSET $2
+    ) p
+"""
+
+
+# ==============================================================================
+# QUERY HELPERS & READ COALESCING
+# ==============================================================================
+
+# Concurrent identical reads share one in-flight query (see src/singleflight.py).
+# The shared query runs under no single request's deadline; each waiter stops
+# at its own, and the query is cancelled once every waiter has gone.
+read_flight = SingleFlight(default_timeout=SINGLEFLIGHT_TIMEOUT)
+
+
+@asynccontextmanager
+async def acquire(pool: asyncpg.Pool):
+    """
+    pool.acquire() bounded by the request deadline, traced as "acquire".
+    
+    Yields:
+        asyncpg.Connection: Connection returned to the pool on exit
+    """
+    started = time.perf_counter()
+    async with pool.acquire(timeout=remaining()) as conn:
+        record("acquire", started)
+        yield conn
+
+
+async def fetch_rows(pool: asyncpg.Pool, query: str, *args) -> List[asyncpg.Record]:
+    """Acquire a connection and return all rows"""
+    async with acquire(pool) as conn:
+        with span("query"):
+            return await conn.fetch(query, *args, timeout=remaining())
+
+
+async def fetch_row(pool: asyncpg.Pool, query: str, *args) -> Optional[asyncpg.Record]:
+    """Acquire a connection and return the first row (or None)"""
+    async with acquire(pool) as conn:
+        with span("query"):
+            return await conn.fetchrow(query, *args, timeout=remaining())
+
+
+async def fetch_value(pool: asyncpg.Pool, query: str, *args):
+    """Acquire a connection and return the first column of the first row"""
+    async with acquire(pool) as conn:
+        with span("query"):
+            return await conn.fetchval(query, *args, timeout=remaining())
+
+
+async def fetch_rows_within(pool: asyncpg.Pool, statement_timeout: float, query: str, *args) -> List[asyncpg.Record]:
+    """
+    fetch_rows() with a server-side statement_timeout (seconds).
+    
+    The client timeout only abandons the wait; statement_timeout makes
+    Postgres cancel the statement, so a runaway query stops using the
+    server too. SET LOCAL scopes it to this read-only transaction.
+    """
+    async with acquire(pool) as conn:
+        async with conn.transaction(readonly=True):
+            await conn.execute(
+                f"SET LOCAL statement_timeout = {max(1, int(statement_timeout * 1000))}",
+                timeout=remaining()
+            )
+            with span("query"):
+                return await conn.fetch(query, *args, timeout=remaining())
+
+
+# Idempotent reads are retried, hedged and circuit-broken; writes bypass this.
+# db_breaker guards the primary (reads, writes and /health/ready); every
+# replica gets its own, so a failing replica only takes itself out of rotation
+db_breaker = CircuitBreaker(
+    failure_threshold=DB_BREAKER_THRESHOLD,
+    reset_timeout=DB_BREAKER_RESET
+)
+pool_breakers: Dict[str, CircuitBreaker] = {"primary": db_breaker}
+
+
+def breaker_for(pool: asyncpg.Pool) -> CircuitBreaker:
+    """The circuit breaker of `pool`, keyed by route_key()"""
+    key = route_key(pool)
+    breaker = pool_breakers.get(key)
+    if breaker is None:
+        breaker = pool_breakers[key] = CircuitBreaker(
+            failure_threshold=DB_BREAKER_THRESHOLD,
+            reset_timeout=DB_BREAKER_RESET
+        )
+    return breaker
+
+
+def fallback_pool(pool: asyncpg.Pool) -> Optional[asyncpg.Pool]:
+    """
+    Where a read goes after a transient failure on `pool` (or while its
+    circuit is open): another replica that has replayed at least as far and
+    whose circuit is closed, else the primary. Primary reads stay put.
+    """
+    if replica_router is None or not isinstance(pool, ReplicaPool):
+        return None
+    alternate = replica_router.alternate(pool)
+    if alternate is not pool and breaker_for(alternate).state == CircuitBreaker.CLOSED:
+        return alternate
+    return db_pool
+
+
+read_resilience = ResilientReader(
+    retry=RetryPolicy(attempts=DB_READ_ATTEMPTS, base_delay=DB_RETRY_BASE_DELAY),
+    breaker=db_breaker,
+    hedger=Hedger() if DB_HEDGE_READS else None,
+    hedge_pool=lambda pool: replica_router.alternate(pool) if replica_router else None,
+    breaker_for=breaker_for,
+    fallback_pool=fallback_pool
+)
+
+
+def observe_probe(result: ProbeResult) -> None:
+    """
+    Feed background health probes into the breaker.
+    
+    A successful probe closes an open circuit without waiting for a user
+    request to be the trial; a failed probe counts as a failure, so an
+    outage during quiet periods still opens the circuit.
+    """
+    if result.database == "connected" and db_breaker.state != CircuitBreaker.CLOSED:
+        db_breaker.record_success()
+    elif result.database == "disconnected":
+        db_breaker.record_failure()
+
+
+health_prober.on_probe = observe_probe
+
+
+async def read_rows(pool: asyncpg.Pool, query: str, *args) -> List[asyncpg.Record]:
+    """fetch_rows() for read-only statements (retried / hedged)"""
+    return await read_resilience.run(pool, lambda p: fetch_rows(p, query, *args), key=query)
+
+
+async def read_row(pool: asyncpg.Pool, query: str, *args) -> Optional[asyncpg.Record]:
+    """fetch_row() for read-only statements (retried / hedged)"""
+    return await read_resilience.run(pool, lambda p: fetch_row(p, query, *args), key=query)
+
+
+async def read_value(pool: asyncpg.Pool, query: str, *args):
+    """fetch_value() for read-only statements (retried / hedged)"""
+    return await read_resilience.run(pool, lambda p: fetch_value(p, query, *args), key=query)
+
+
+@dataclass(frozen=True)
+class PostgresRepository(Repository):
+    """
+    Repository over an asyncpg pool (the primary or a replica).
+    
+    Reads go through read_rows()/read_row() (retried, hedged, circuit
+    broken). Instances compare equal per pool, so the user batch loader
+    still merges concurrent lookups on the same pool.
+    """
+    pool: asyncpg.Pool
+    
+    @property
+    def name(self) -> str:
+        return route_key(self.pool)
+    
+    async def users_page(self, limit, offset, fields=None):
+        return await read_rows(self.pool, user_fields.statement(USERS_PAGE_TEMPLATE, fields), limit, offset)
+    
+    async def user_by_id(self, user_id):
+        return await read_row(self.pool, USER_BY_ID_SQL, user_id)
+    
+    async def users_by_ids(self, ids, fields=None):
+        return await read_rows(self.pool, user_fields.statement(USERS_BY_IDS_TEMPLATE, fields), list(ids))
+    
+    async def projects_page(self, limit, offset, fields=None):
+        return await read_rows(
+            self.pool, project_fields.statement(PROJECTS_PAGE_TEMPLATE, fields), limit, offset
+        )
+    
+    async def users_page_json(self, limit: int, offset: int) -> Optional[str]:
+        """A users page rendered as JSON text by the database"""
+        return await read_value(self.pool, USERS_PAGE_JSON_SQL, limit, offset)
+    
+    async def projects_page_json(self, limit: int, offset: int) -> Optional[str]:
+        """A projects page rendered as JSON text by the database"""
+        return await read_value(self.pool, PROJECTS_PAGE_JSON_SQL, limit, offset)
+    
+    async def estimate_count(self, table):
+        return plan_rows(await read_value(self.pool, COUNT_SQL[table][1]))
+    
+    async def exact_count(self, table):
+        return await read_value(self.pool, COUNT_SQL[table][0])
+
+
+total_counts = CountService(exact_threshold=COUNT_EXACT_THRESHOLD, ttl=COUNT_CACHE_TTL)
+
+
+async def total_count(table: str, repository: Repository) -> Optional[TotalCount]:
+    """
+    Cached total for a listing; None if it couldn't be computed.
+
+    The header is best-effort: a failed count never fails the page.
+    """
+    try:
+        return await total_counts.count(
+            table,
+            lambda: repository.estimate_count(table),
+            lambda: repository.exact_count(table)
+        )
+    except Exception as e:
+        logger.warning(f"Could not count {table}: {e}")
+        return None
+
+
+def set_total_count(response: Response, total: Optional[TotalCount]) -> None:
+    """Add X-Total-Count (and whether it is a planner estimate)"""
+    if total is None:
+        return
+    response.headers[TOTAL_COUNT_HEADER] = str(total.value)
+    response.headers[TOTAL_COUNT_ESTIMATED_HEADER] = "true" if total.estimated else "false"
+
+
+def route_key(pool: asyncpg.Pool) -> str:
+    """
+    Which server a read goes to, for coalescing keys: reads on different
+    replicas (or on the primary for a fresh token) must not share results.
+    """
+    return pool.name if isinstance(pool, ReplicaPool) else "primary"
+
+
+async def set_consistency_token(response: Response, pool: asyncpg.Pool) -> None:
+    """After a committed write, give the client the primary's WAL position"""
+    if replica_router is None:
+        return
+    try:
+        async with db_breaker.guard():
+            response.headers[CONSISTENCY_HEADER] = await fetch_value(pool, CURRENT_LSN_SQL)
+    except Exception as e:
+        # The write succeeded; without a token the client may read stale data
+        logger.warning(f"Could not read WAL position for consistency token: {e}")
+
+
+def database_error(error: Exception, detail: str) -> HTTPException:
+    """
+    HTTP error for a failed database call.
+    
+    Args:
+        error: What the acquire/query raised
+        detail: Message for unexpected failures
+    
+    Returns:
+        HTTPException: 503 while the circuit is open, 504 if the request
+            ran out of time, else 500
+    """
+    if isinstance(error, CircuitOpenError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable",
+            headers={"Retry-After": str(math.ceil(error.retry_after))}
+        )
+    if isinstance(error, (asyncio.TimeoutError, DeadlineExceeded)):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=detail
+    )
+
+
+def normalize_user_id(value: str) -> Optional[str]:
+    """Return the canonical UUID string, or None if `value` is not a UUID"""
+    try:
+        return str(uuid.UUID(value))
+    except (ValueError, AttributeError):
+        return None
+
+
+async def load_users_by_id(keys: List[str], repository: Repository) -> Dict[str, asyncpg.Record]:
+    """
+    Batch function for user lookups.
+    
+    A single key keeps the plain `id = $1` statement; larger batches use
+    one `id = ANY($1)` query.
+    
+    Args:
+        keys: Canonical user UUIDs
+        repository: Where the users are read from (batches are grouped by it)
+    
+    Returns:
+        dict: Rows keyed by user id (missing users are absent)
+    """
+    if len(keys) == 1:
+        row = await repository.user_by_id(keys[0])
+        return {keys[0]: row} if row else {}
+    
+    rows = await repository.users_by_ids(keys)
+    return {str(row["id"]): row for row in rows}
+
+
+# bcrypt hashing pool (worker processes start on first use)
+password_hasher = PasswordHasher(workers=PASSWORD_HASH_WORKERS)
+
+
+# get_user lookups arriving within the same window share one query
+user_loader = BatchLoader(
+    load_users_by_id,
+    window=USER_BATCH_WINDOW_MS / 1000,
+    max_batch_size=MAX_IDS_PER_REQUEST
+)
+
+
+def user_response(row) -> UserResponse:
+    """Build the public user model from a database row"""
+    return UserResponse(
+        id=str(row["id"]),
+        username=row["username"],
+        email=row["email"],
+        full_name=row["full_name"],
+        is_active=row["is_active"],
+        created_at=row["created_at"]
+    )
+
+
+def embedded_projects(row) -> Tuple[List[ProjectResponse], Dict[str, int]]:
+    """Decode the projects/project_counts columns of the USER_*PROJECTS_SQL queries"""
+    projects = [ProjectResponse.model_validate(item) for item in json.loads(row["projects"])]
+    return projects, json.loads(row["project_counts"])
+
+
+def parse_fields(sparse: SparseFields, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Validate a `fields=` parameter.
+    
+    Returns:
+        Normalized fieldset, or None for the full model
+    
+    Raises:
+        HTTPException: If a field is not allowed (400)
+    """
+    try:
+        return sparse.parse(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def sparse_response(content: bytes) -> Response:
+    """Wrap JSON already rendered by SparseFields"""
+    return Response(content=content, media_type="application/json")
+
+
+def project_response(row) -> ProjectResponse:
+    """Build the public project model from a database row"""
+    return ProjectResponse(
+        id=str(row["id"]),
+        name=row["name"],
+        description=row["description"],
+        status=row["status"],
+        created_at=row["created_at"]
+    )
+
+
+async def search_rows(
+    name: str,
+    query: str,
+    q: str,
+    limit: int,
+    cursor: Optional[str],
+    pool: asyncpg.Pool,
+    response: Response
+) -> List[asyncpg.Record]:
+    """
+    Run one ranked search page and set X-Next-Cursor if there may be more.
+    
+    Raises:
+        HTTPException: If q, limit or cursor is invalid (400)
+    """
+    text = normalize_query(q)
+    if text is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="q must be 2 to 200 characters"
+        )
+    if not 1 <= limit <= SEARCH_MAX_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {SEARCH_MAX_LIMIT}"
+        )
+    after_rank, after_id = None, None
+    if cursor:
+        try:
+            after_rank, after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    rows = await read_flight.do(
+        (name, text, after_rank, after_id, limit, route_key(pool)),
+        lambda: read_resilience.run(
+            pool,
+            lambda p: fetch_rows_within(
+                p, SEARCH_STATEMENT_TIMEOUT, query,
+                text, after_rank, after_id, limit, SEARCH_MAX_CANDIDATES, SEARCH_MAX_SCANNED
+            ),
+            key=query
+        )
+    )
+    if len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1]["rank"], rows[-1]["id"])
+    return rows
+
+
+async def export_response(
+    pool: asyncpg.Pool,
+    query: str,
+    columns: List[str],
+    fmt: str,
+    filename: str
+) -> StreamingResponse:
+    """
+    Stream a query result as NDJSON or CSV.
+
+    The cursor is opened and the first batch fetched before returning, so a
+    database failure is still reported as a proper error status; after that
+    a failure can only cut the stream short.
+
+    Raises:
+        Exception: Whatever opening the cursor raised
+    """
+    async with breaker_for(pool).guard():
+        with span("query"):
+            chunks = await prefetched(
+                stream_query(pool, query, columns, fmt, EXPORT_BATCH_SIZE)
+            )
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
+
+
+def json_page_response(payload: Optional[str]) -> Response:
+    """
+    Wrap database-rendered JSON text as-is.
+    
+    Args:
+        payload: JSON text produced by a *_JSON_SQL statement
+    
+    Returns:
+        Response: Raw application/json response (no re-encoding)
+    """
+    return Response(content=payload or "[]", media_type="application/json")
+
+
+# ==============================================================================
+# API ENDPOINTS
+# ==============================================================================
+
+@app.get(
+    "/",
+    summary="Root endpoint",
+    description="Welcome message and API information",
+    response_model=Dict[str, str]
+)
+async def root():
+    """
+    Root endpoint - API welcome message.
+    
+    Returns:
+        dict: Welcome message and documentation links
+    """
+    return {
+        "message": "Welcome to the Professional Microservice API",
+        "docs": "/docs",
+        "redoc": "/redoc",
+        "health": "/health",
+        "version": "0.1.0"
+    }
+
+
+@app.get(
+    "/health",
+    summary="Health check",
+    description="Check API and database health",
+    response_model=HealthResponse,
+    status_code=status.HTTP_200_OK
+)
+async def health_check():
+    """
+    Health check endpoint.
+    
+    Serves the state recorded by the background prober (src/health.py);
+    it never acquires a pool connection itself.
+    
+    Reports:
+        - API is running
+        - Database status and round-trip latency at the last probe
+        - Pool saturation at the last probe
+        - Database circuit breaker state
+        - "degraded" if the DB is down, the probe data is stale or the
+          circuit is not closed
+    
+    Returns:
+        HealthResponse: Health status information
+    """
+    state = health_prober.snapshot()
+    circuit = db_breaker.state
+    
+    return HealthResponse(
+        status=state.status if circuit == CircuitBreaker.CLOSED else "degraded",
+        environment=ENVIRONMENT,
+        version="0.1.0",
+        timestamp=datetime.utcnow(),
+        database=state.database,
+        db_latency_ms=state.latency_ms,
+        pool_utilization=state.pool_utilization,
+        pool_waiters=state.pool_waiters,
+        checked_at=state.checked_at,
+        probe_age_seconds=state.age_seconds,
+        circuit=circuit
+    )
+
+
+@app.get(
+    "/health/live",
+    summary="Liveness probe",
+    description="The process is up and serving (never touches the database)",
+    response_model=ProbeResponse,
+    status_code=status.HTTP_200_OK
+)
+async def liveness():
+    """
+    Liveness probe.
+    
+    Returns:
+        ProbeResponse: Always "alive" while the event loop is responsive
+    """
+    return ProbeResponse(status="alive", timestamp=datetime.utcnow())
+
+
+@app.get(
+    "/health/ready",
+    summary="Readiness probe",
+    description="The database pool is connected and warm; safe to route traffic",
+    response_model=ProbeResponse,
+    responses={503: {"model": ProbeResponse}},
+    status_code=status.HTTP_200_OK
+)
+async def readiness():
+    """
+    Readiness probe.
+    
+    Returns:
+        ProbeResponse: "ready" (200), or "not_ready" (503) while connecting,
+        after a failed background probe or while the circuit is open
+    """
+    detail = None
+    last_probe = health_prober.last
+    if db_pool is None:
+        detail = f"Connecting to database (attempt {db_connect_attempts})"
+        if db_connect_error:
+            detail += f": {db_connect_error}"
+    elif last_probe is not None and last_probe.database == "disconnected":
+        detail = f"Database probe failed: {last_probe.error}"
+    elif db_breaker.state == CircuitBreaker.OPEN:
+        detail = "Database circuit open"
+    
+    if detail:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=ProbeResponse(
+                status="not_ready", timestamp=datetime.utcnow(), detail=detail
+            ).model_dump(mode="json"),
+            headers={"Retry-After": "1"}
+        )
+    return ProbeResponse(status="ready", timestamp=datetime.utcnow())
+
+
+@app.get(
+    "/health/pool",
+    summary="Connection pool health",
+    description="Acquire latency, waiters, utilization and adaptive sizing",
+    response_model=PoolHealthResponse,
+    status_code=status.HTTP_200_OK
+)
+async def pool_health(pool: asyncpg.Pool = Depends(get_db_pool)):
+    """
+    Connection pool telemetry.
+    
+    Returns:
+        PoolHealthResponse: Pool pressure snapshot
+    
+    Raises:
+        HTTPException: If the pool is not a ManagedPool (503)
+    """
+    if not isinstance(pool, ManagedPool):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Pool telemetry unavailable"
+        )
+    return PoolHealthResponse(**pool.stats())
+
+
+@app.get(
+    "/metrics",
+    summary="Runtime metrics",
+    description="Internal performance counters (request coalescing, etc.)",
+    response_model=Dict[str, Any],
     status_code=status.HTTP_200_OK
 )
+async def metrics():
+    """
+    Expose in-process performance counters.
+    
+    Returns:
+        dict: Counters grouped by subsystem
+    """
+    return {
+        "singleflight": read_flight.stats(),
+        "user_loader": user_loader.stats(),
+        "pool": db_pool.stats() if db_pool is not None else None,
+        "auth_cache": token_verifier.stats(),
+        "admission": admission_controller.stats(),
+        "deadlines": deadline_policy.stats(),
+        "access_log": access_log.stats(),
+        "resilience": {
+            **read_resilience.stats(),
+            "pool_breakers": {key: breaker.stats() for key, breaker in pool_breakers.items()},
+        },
+        "replicas": replica_router.stats() if replica_router is not None else None,
+        "total_counts": total_counts.stats(),
+        "fieldsets": {"users": user_fields.stats(), "projects": project_fields.stats()},
+        "batch": batch_dispatcher.stats(),
+        "compression": compression_policy.stats(),
+        "error_log": error_log.stats(),
+    }
+
+
+@app.get(
+    "/users",
+    summary="List users",
+    description="Get all users (paginated)",
+    response_model=List[UserResponse],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
+)
 async def list_users(
+    response: Response,
     limit: int = 10,
     offset: int = 0,
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    ids: Optional[str] = None,
+    fields: Optional[str] = None,
+    repository: Repository = Depends(get_read_repository)
 ):
     """
-    List all users with pagination.
+    List all users with pagination, or fetch several users by ID.
     
     Args:
         limit: Maximum number of users to return (default: 10)
         offset: Number of users to skip (default: 0)
-        pool: Database connection pool (injected)
+        ids: Comma-separated user UUIDs; when given, pagination is ignored
+            and the found users are returned in the requested order
+        fields: Comma-separated UserResponse fields to return (id is
+            always included); only those columns are selected
+        repository: Read repository (injected; a caught-up replica when
+            configured, or the local engine chosen by DATABASE_URL)
     
     Returns:
-        List[UserResponse]: List of users
+        List[UserResponse]: List of users; paginated responses carry
+        X-Total-Count and X-Total-Count-Estimated
+    
+    Raises:
+        HTTPException: If an ID or field name is invalid, or too many IDs
+            are requested (400)
     
     Example:
         GET /users?limit=5&offset=0
+        GET /users?ids=<uuid1>,<uuid2>
+        GET /users?fields=id,username
     """
+    selected = parse_fields(user_fields, fields)
+    if ids is not None:
+        return await list_users_by_ids(ids, repository, selected)
+    
     try:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT id, username, email, full_name, is_active, created_at
-                FROM users
-                WHERE deleted_at IS NULL
-                ORDER BY created_at DESC
-                LIMIT $1 OFFSET $2
-                """,
-                limit, offset
+        if JSON_FAST_PATH and selected is None and isinstance(repository, PostgresRepository):
+            payload = await read_flight.do(
+                ("list_users_json", limit, offset, repository.name),
+                lambda: repository.users_page_json(limit, offset)
             )
-            
-            users = [
-                UserResponse(
-                    id=str(row["id"]),
-                    username=row["username"],
-                    email=row["email"],
-                    full_name=row["full_name"],
-                    is_active=row["is_active"],
-                    created_at=row["created_at"]
-                )
-                for row in rows
-            ]
-            
-            return users
-            
+            page = json_page_response(payload)
+            set_total_count(page, await total_count("users", repository))
+            return page
+        
+        rows = await read_flight.do(
+            ("list_users", limit, offset, selected, repository.name),
+            lambda: repository.users_page(limit, offset, selected)
+        )
+        # After the page, so a failing database isn't asked twice; it is
+        # cached, so this rarely costs a round trip
+        total = await total_count("users", repository)
+        
+        with span("models"):
+            if selected is not None:
+                response = sparse_response(user_fields.render(rows, selected))
+                set_total_count(response, total)
+                return response
+            set_total_count(response, total)
+            return [user_response(row) for row in rows]
+        
     except Exception as e:
-        logger.error(f"Error fetching users: {e}")
+        error_log.error(f"Error fetching users: {e}")
+        raise database_error(e, "Failed to fetch users")
+
+
+async def list_users_by_ids(
+    ids: str,
+    repository: Repository,
+    selected: Optional[Tuple[str, ...]] = None
+):
+    """Resolve GET /users?ids=... with a single ANY($1) query"""
+    requested = [part.strip() for part in ids.split(",") if part.strip()]
+    keys = list(dict.fromkeys(normalize_user_id(part) for part in requested))
+    
+    if None in keys:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma-separated UUIDs"
+        )
+    if len(keys) > MAX_IDS_PER_REQUEST:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch users"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_IDS_PER_REQUEST} ids per request"
+        )
+    if not keys:
+        return []
+    
+    try:
+        rows_by_id = await read_flight.do(
+            ("users_by_ids", tuple(keys), selected, repository.name),
+            lambda: repository.users_by_ids(keys, selected)
         )
+        found = {str(row["id"]): row for row in rows_by_id}
+        ordered = [found[key] for key in keys if key in found]
+        with span("models"):
+            if selected is not None:
+                return sparse_response(user_fields.render(ordered, selected))
+            return [user_response(row) for row in ordered]
+        
+    except Exception as e:
+        error_log.error(f"Error fetching users by ids: {e}")
+        raise database_error(e, "Failed to fetch users")
+
+
+@app.get(
+    "/users/export",
+    summary="Export users",
+    description="Stream every user as NDJSON or CSV",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
+)
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    pool: asyncpg.Pool = Depends(get_read_pool)
+):
+    """
+    Stream all users without paging.
+    
+    Rows come from a server-side cursor in EXPORT_BATCH_SIZE batches, and the
+    next batch is only fetched once the previous one has been sent, so memory
+    stays constant whatever the table size. Must be declared before
+    /users/{user_id}, which would otherwise match "export".
+    
+    Args:
+        format: "ndjson" (one JSON object per line) or "csv" (with header)
+        pool: Read pool (injected; a caught-up replica when configured)
+    
+    Returns:
+        StreamingResponse: The export
+    
+    Example:
+        GET /users/export?format=csv
+    """
+    try:
+        return await export_response(pool, USERS_EXPORT_SQL, USER_EXPORT_COLUMNS, format, "users")
+    except Exception as e:
+        error_log.error(f"Error exporting users: {e}")
+        raise database_error(e, "Failed to export users")
+
+
+@app.get(
+    "/users/search",
+    summary="Search users",
+    description="Ranked full-text and fuzzy search over username, name and email",
+    response_model=List[UserResponse],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
+)
+async def search_users(
+    response: Response,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    pool: asyncpg.Pool = Depends(get_read_pool)
+):
+    """
+    Search users, best matches first.
+    
+    Words match through the full-text index; partial or misspelt usernames
+    match through the trigram index. When a page is full, X-Next-Cursor
+    holds the token for the next one.
+    
+    Args:
+        q: Search text (websearch syntax: "quoted phrase", -exclude)
+        limit: Page size (1 to SEARCH_MAX_LIMIT)
+        cursor: X-Next-Cursor from the previous page
+        pool: Read pool (injected; a caught-up replica when configured)
+    
+    Returns:
+        List[UserResponse]: Matching users
+    
+    Raises:
+        HTTPException: If q, limit or cursor is invalid (400)
+    
+    Example:
+        GET /users/search?q=ada%20lovelace&limit=10
+    """
+    try:
+        rows = await search_rows("search_users", USERS_SEARCH_SQL, q, limit, cursor, pool, response)
+        with span("models"):
+            return [user_response(row) for row in rows]
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_log.error(f"Error searching users: {e}")
+        raise database_error(e, "Failed to search users")
 
 
 @app.get(
@@ -336,59 +1878,357 @@ async def list_users(
     summary="Get user by ID",
     description="Retrieve a specific user by their UUID",
     response_model=UserResponse,
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
 )
 async def get_user(
     user_id: str,
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    fields: Optional[str] = None,
+    include: Optional[Literal["projects"]] = None,
+    repository: Repository = Depends(get_read_repository)
 ):
     """
     Get a specific user by ID.
     
     Args:
         user_id: User UUID
-        pool: Database connection pool (injected)
+        fields: Comma-separated UserResponse fields to return. The row
+            still comes from the shared batch loader, so this trims the
+            payload, not the columns read
+        include: "projects" embeds the newest INCLUDE_PROJECTS_LIMIT projects
+            and counts by status (UserWithProjectsResponse), in one query
+        repository: Read repository (injected; a caught-up replica when
+            configured, or the local engine chosen by DATABASE_URL)
     
     Returns:
         UserResponse: User information
     
+    Raises:
+        HTTPException: If user not found (404), a field is invalid, or
+            fields and include are combined (400); include with a local
+            storage engine (501)
+    """
+    selected = parse_fields(user_fields, fields)
+    if include and selected is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fields and include can't be combined"
+        )
+    key = normalize_user_id(user_id)
+    
+    if include == "projects":
+        if not isinstance(repository, PostgresRepository):
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail=f"include=projects is not available with the {repository.name} storage backend"
+            )
+        return await get_user_with_projects(user_id, key, repository.pool)
+    
+    try:
+        # Malformed IDs can't exist; don't let them poison a shared batch
+        row = None
+        if key is not None:
+            row = await read_flight.do(
+                ("get_user", key, repository.name),
+                lambda: user_loader.load(key, repository)
+            )
+        
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User {user_id} not found"
+            )
+        
+        with span("models"):
+            if selected is not None:
+                return sparse_response(user_fields.render_one(row, selected))
+            return user_response(row)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_log.error(f"Error fetching user {user_id}: {e}")
+        raise database_error(e, "Failed to fetch user")
+
+
+async def get_user_with_projects(user_id: str, key: Optional[str], pool: asyncpg.Pool) -> Response:
+    """Resolve GET /users/{id}?include=projects with USER_WITH_PROJECTS_SQL"""
+    try:
+        row = None
+        if key is not None:
+            row = await read_flight.do(
+                ("get_user_with_projects", key, route_key(pool)),
+                lambda: read_row(pool, USER_WITH_PROJECTS_SQL, key, INCLUDE_PROJECTS_LIMIT, 0, None)
+            )
+        
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User {user_id} not found"
+            )
+        
+        with span("models"):
+            projects, counts = embedded_projects(row)
+            user = UserWithProjectsResponse(
+                **user_response(row).model_dump(), projects=projects, project_counts=counts
+            )
+            # Returned directly: response_model=UserResponse would drop the extras
+            return Response(content=user.model_dump_json(), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_log.error(f"Error fetching user {user_id} with projects: {e}")
+        raise database_error(e, "Failed to fetch user")
+
+
+@app.get(
+    "/users/{user_id}/projects",
+    summary="List a user's projects",
+    description="A user's projects with counts by status, in one query",
+    response_model=UserProjectsResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
+)
+async def list_user_projects(
+    user_id: str,
+    limit: int = 10,
+    offset: int = 0,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    pool: asyncpg.Pool = Depends(get_read_pool)
+):
+    """
+    List the projects a user owns.
+    
+    Args:
+        user_id: User UUID
+        limit: Maximum number of projects to return
+        offset: Number of projects to skip
+        status_filter: Only projects with this status (?status=active);
+            status_counts always covers every status
+        pool: Read pool (injected; a caught-up replica when configured)
+    
+    Returns:
+        UserProjectsResponse: Page of projects, counts by status and total
+    
     Raises:
         HTTPException: If user not found (404)
+    
+    Example:
+        GET /users/<uuid>/projects?status=active&limit=5
     """
+    key = normalize_user_id(user_id)
+    
     try:
-        async with pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT id, username, email, full_name, is_active, created_at
-                FROM users
-                WHERE id = $1 AND deleted_at IS NULL
-                """,
-                user_id
+        row = None
+        if key is not None:
+            row = await read_flight.do(
+                ("user_projects", key, limit, offset, status_filter, route_key(pool)),
+                lambda: read_row(pool, USER_PROJECTS_SQL, key, limit, offset, status_filter)
             )
-            
-            if not row:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"User {user_id} not found"
-                )
-            
-            return UserResponse(
-                id=str(row["id"]),
-                username=row["username"],
-                email=row["email"],
-                full_name=row["full_name"],
-                is_active=row["is_active"],
-                created_at=row["created_at"]
+        
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User {user_id} not found"
             )
-            
+        
+        with span("models"):
+            projects, counts = embedded_projects(row)
+            return UserProjectsResponse(
+                user_id=str(row["id"]),
+                projects=projects,
+                status_counts=counts,
+                total=sum(counts.values())
+            )
+        
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching user {user_id}: {e}")
+        error_log.error(f"Error fetching projects for user {user_id}: {e}")
+        raise database_error(e, "Failed to fetch user projects")
+
+
+@app.post(
+    "/users",
+    summary="Create user",
+    description="Register a single user",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_auth)]
+)
+async def create_user(
+    user: UserCreate,
+    response: Response,
+    pool: asyncpg.Pool = Depends(get_db_pool)
+):
+    """
+    Create a user.
+    
+    The password is hashed with bcrypt in a worker process.
+    
+    Args:
+        user: New user data
+        response: Outgoing response (carries the consistency token)
+        pool: Database connection pool (injected)
+    
+    Returns:
+        UserResponse: The created user
+    
+    Raises:
+        HTTPException: If the username or email is taken (409)
+    """
+    try:
+        password_hash = await password_hasher.hash(user.password)
+        async with db_breaker.guard():
+            row = await fetch_row(
+                pool, INSERT_USER_SQL,
+                user.username, user.email, password_hash, user.full_name
+            )
+        total_counts.invalidate("users")
+        await set_consistency_token(response, pool)
+        return user_response(row)
+        
+    except asyncpg.UniqueViolationError:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch user"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Username or email already exists"
+        )
+    except Exception as e:
+        error_log.error(f"Error creating user {user.username}: {e}")
+        raise database_error(e, "Failed to create user")
+
+
+@app.post(
+    "/users:bulk",
+    summary="Bulk create users",
+    description="Import many users at once; conflicting rows are reported, not fatal",
+    response_model=BulkUserResult,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
+)
+async def bulk_create_users(
+    payload: BulkUserCreate,
+    response: Response,
+    pool: asyncpg.Pool = Depends(get_db_pool)
+):
+    """
+    Create users in bulk.
+    
+    Steps:
+        1. Reject rows duplicating an earlier row of the same request
+        2. Hash passwords across the process pool
+        3. COPY the rows into a temp table (copy_records_to_table)
+        4. INSERT ... ON CONFLICT DO NOTHING into users
+        5. Report every row that was not inserted
+    
+    Args:
+        payload: Users to create
+        response: Outgoing response (carries the consistency token)
+        pool: Database connection pool (injected)
+    
+    Returns:
+        BulkUserResult: Inserted count and per-row conflicts
+    """
+    conflicts: List[BulkUserConflict] = []
+    accepted = []
+    seen_usernames, seen_emails = set(), set()
+    
+    for index, user in enumerate(payload.users):
+        reason = None
+        if user.username in seen_usernames:
+            reason = "duplicate username in request"
+        elif user.email in seen_emails:
+            reason = "duplicate email in request"
+        
+        if reason:
+            conflicts.append(BulkUserConflict(
+                index=index, username=user.username, email=user.email, reason=reason
+            ))
+            continue
+        
+        seen_usernames.add(user.username)
+        seen_emails.add(user.email)
+        accepted.append((index, user))
+    
+    try:
+        with span("hash"):
+            hashes = await password_hasher.hash_many([user.password for _, user in accepted])
+        records = [
+            (index, user.username, user.email, password_hash, user.full_name)
+            for (index, user), password_hash in zip(accepted, hashes)
+        ]
+        
+        async with db_breaker.guard(), acquire(pool) as conn:
+            with span("query"):
+                async with conn.transaction():
+                    await conn.execute(USERS_IMPORT_TABLE_SQL, timeout=remaining())
+                    await conn.copy_records_to_table(
+                        "users_import",
+                        records=records,
+                        columns=["idx", "username", "email", "password_hash", "full_name"],
+                        timeout=remaining()
+                    )
+                    inserted = await conn.fetch(USERS_IMPORT_INSERT_SQL, timeout=remaining())
+                    rejected = await conn.fetch(
+                        USERS_IMPORT_CONFLICTS_SQL, [row["username"] for row in inserted],
+                        timeout=remaining()
+                    )
+        
+    except Exception as e:
+        error_log.error(f"Error importing {len(accepted)} users: {e}")
+        raise database_error(e, "Failed to import users")
+    
+    conflicts.extend(
+        BulkUserConflict(
+            index=row["idx"],
+            username=row["username"],
+            email=row["email"],
+            reason="username already exists" if row["username_taken"] else "email already exists"
         )
+        for row in rejected
+    )
+    conflicts.sort(key=lambda conflict: conflict.index)
+    if inserted:
+        total_counts.invalidate("users")
+    await set_consistency_token(response, pool)
+    
+    return BulkUserResult(created=len(inserted), conflicts=conflicts)
+
+
+@app.post(
+    "/batch",
+    summary="Batch GET requests",
+    description="Run several GET requests in one round trip",
+    response_model=BatchResult,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
+)
+async def batch(batch_request: BatchRequest, request: Request):
+    """
+    Execute GET sub-requests concurrently inside the app.
+    
+    Each item gets its own status; one failing item doesn't fail the batch.
+    At most BATCH_MAX_CONCURRENCY items run at once, all under this
+    request's deadline. Sub-requests reuse this request's Authorization and
+    X-Consistency-Token headers.
+    
+    Args:
+        batch_request: Paths to GET
+        request: This request (its scope is the template for sub-requests)
+    
+    Returns:
+        BatchResult: One response per path, in order
+    
+    Example:
+        POST /batch
+        {"requests": ["/users/<uuid1>", "/users/<uuid2>", "/projects?limit=5"]}
+    """
+    results = await batch_dispatcher.dispatch(request.scope, batch_request.requests)
+    return BatchResult(responses=[
+        BatchResponseItem(path=path, status=result.status, headers=result.headers, body=result.body)
+        for path, result in zip(batch_request.requests, results)
+    ])
 
 
 @app.get(
@@ -396,12 +2236,15 @@ async def get_user(
     summary="List projects",
     description="Get all active projects",
     response_model=List[ProjectResponse],
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
 )
 async def list_projects(
+    response: Response,
     limit: int = 10,
     offset: int = 0,
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    fields: Optional[str] = None,
+    repository: Repository = Depends(get_read_repository)
 ):
     """
     List all active projects.
@@ -409,43 +2252,115 @@ async def list_projects(
     Args:
         limit: Maximum number of projects to return
         offset: Number of projects to skip
-        pool: Database connection pool (injected)
+        fields: Comma-separated ProjectResponse fields to return
+        repository: Read repository (injected; a caught-up replica when
+            configured, or the local engine chosen by DATABASE_URL)
     
     Returns:
-        List[ProjectResponse]: List of projects
+        List[ProjectResponse]: List of projects (with X-Total-Count)
+    
+    Raises:
+        HTTPException: If a field name is invalid (400)
     """
+    selected = parse_fields(project_fields, fields)
+    
     try:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT id, name, description, status, created_at
-                FROM projects
-                WHERE deleted_at IS NULL AND status = 'active'
-                ORDER BY created_at DESC
-                LIMIT $1 OFFSET $2
-                """,
-                limit, offset
+        if JSON_FAST_PATH and selected is None and isinstance(repository, PostgresRepository):
+            payload = await read_flight.do(
+                ("list_projects_json", limit, offset, repository.name),
+                lambda: repository.projects_page_json(limit, offset)
             )
-            
-            projects = [
-                ProjectResponse(
-                    id=str(row["id"]),
-                    name=row["name"],
-                    description=row["description"],
-                    status=row["status"],
-                    created_at=row["created_at"]
-                )
-                for row in rows
-            ]
-            
-            return projects
-            
+            page = json_page_response(payload)
+            set_total_count(page, await total_count("projects", repository))
+            return page
+        
+        rows = await read_flight.do(
+            ("list_projects", limit, offset, selected, repository.name),
+            lambda: repository.projects_page(limit, offset, selected)
+        )
+        total = await total_count("projects", repository)
+        
+        with span("models"):
+            if selected is not None:
+                response = sparse_response(project_fields.render(rows, selected))
+                set_total_count(response, total)
+                return response
+            set_total_count(response, total)
+            return [project_response(row) for row in rows]
+        
     except Exception as e:
-        logger.error(f"Error fetching projects: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch projects"
+        error_log.error(f"Error fetching projects: {e}")
+        raise database_error(e, "Failed to fetch projects")
+
+
+@app.get(
+    "/projects/search",
+    summary="Search projects",
+    description="Ranked full-text and fuzzy search over active projects",
+    response_model=List[ProjectResponse],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
+)
+async def search_projects(
+    response: Response,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    pool: asyncpg.Pool = Depends(get_read_pool)
+):
+    """
+    Search active projects by name and description (see search_users).
+    
+    Args:
+        q: Search text
+        limit: Page size (1 to SEARCH_MAX_LIMIT)
+        cursor: X-Next-Cursor from the previous page
+        pool: Read pool (injected; a caught-up replica when configured)
+    
+    Returns:
+        List[ProjectResponse]: Matching projects
+    """
+    try:
+        rows = await search_rows("search_projects", PROJECTS_SEARCH_SQL, q, limit, cursor, pool, response)
+        with span("models"):
+            return [project_response(row) for row in rows]
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_log.error(f"Error searching projects: {e}")
+        raise database_error(e, "Failed to search projects")
+
+
+@app.get(
+    "/projects/export",
+    summary="Export projects",
+    description="Stream every active project as NDJSON or CSV",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(require_auth)]
+)
+async def export_projects(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    pool: asyncpg.Pool = Depends(get_read_pool)
+):
+    """
+    Stream all active projects without paging (see export_users).
+    
+    Args:
+        format: "ndjson" or "csv"
+        pool: Read pool (injected; a caught-up replica when configured)
+    
+    Returns:
+        StreamingResponse: The export
+    """
+    try:
+        return await export_response(
+            pool, PROJECTS_EXPORT_SQL, PROJECT_EXPORT_COLUMNS, format, "projects"
         )
+    except Exception as e:
+        error_log.error(f"Error exporting projects: {e}")
+        raise database_error(e, "Failed to export projects")
 
 
 # ==============================================================================
@@ -461,14 +2376,15 @@ async def http_exception_handler(request, exc):
             "error": exc.detail,
             "status_code": exc.status_code,
             "timestamp": datetime.utcnow().isoformat()
-        }
+        },
+        headers=getattr(exc, "headers", None)  # Retry-After, WWW-Authenticate
     )
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Catch-all exception handler"""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    error_log.error(f"Unhandled exception: {exc}", exc_info=exc)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
@@ -479,10 +2395,28 @@ async def general_exception_handler(request, exc):
     )
 
 
+# Sub-request dispatch for POST /batch: the router behind the app's
+# exception handlers, without the middleware stack (the batch request has
+# already been admitted, given a deadline and traced; see src/batch.py)
+batch_dispatcher = SubRequestDispatcher(
+    ExceptionMiddleware(
+        app.router,
+        handlers={
+            key: handler for key, handler in app.exception_handlers.items()
+            if key not in (500, Exception)
+        }
+    ),
+    error_handler=general_exception_handler,
+    max_concurrency=BATCH_MAX_CONCURRENCY,
+    excluded=["/batch", "/users/export", "/projects/export"]
+)
+
+
 # ==============================================================================
 # APPLICATION ENTRY POINT
 # ==============================================================================
 
+# Development server only - production uses `python -m src.server`
 if __name__ == "__main__":
     import uvicorn
     
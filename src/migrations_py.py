@@ -0,0 +1,172 @@
+"""
+==============================================================================
+Schema Migrations
+==============================================================================
+Location: src/migrations.py
+Purpose: Apply versioned schema changes (indexes) exactly once
+==============================================================================
+
+Each Migration is recorded in `schema_migrations` after it succeeds. A
+session advisory lock makes concurrent runs (several replicas deploying at
+once) wait for each other instead of racing.
+
+Index builds use CREATE INDEX CONCURRENTLY, so the tables stay writable
+while a GIN index is built over millions of rows. CONCURRENTLY cannot run
+inside a transaction, which is why such migrations set
+`transactional=False`. An interrupted concurrent build leaves an INVALID
+index behind, so those migrations drop the index first and the rerun
+rebuilds it.
+
+Building these indexes takes minutes on large tables, so migrations run as a
+deploy step rather than at app startup:
+
+    DATABASE_URL=postgresql://... python -m src.migrations
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import asyncpg
+
+from src.search import PROJECTS_SEARCH_VECTOR, USERS_SEARCH_VECTOR
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying this app's migration lock
+MIGRATION_LOCK_ID = 720_431_001
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema change"""
+    version: int
+    name: str
+    statements: Tuple[str, ...]
+    transactional: bool = True   # False for CREATE INDEX CONCURRENTLY
+
+
+def concurrent_index(name: str, definition: str) -> Tuple[str, ...]:
+    """Statements (re)building an index without blocking writes"""
+    return (
+        f"DROP INDEX CONCURRENTLY IF EXISTS {name}",
+        f"CREATE INDEX CONCURRENTLY {name} {definition}",
+    )
+
+
+# Only bounded columns in INCLUDE: btree entries are limited to ~2.7 kB
+PROJECTS_OWNER_INDEX = (
+    "ON projects (owner_id, created_at DESC) INCLUDE (id, name, status) "
+    "WHERE deleted_at IS NULL"
+)
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "enable pg_trgm", (
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    )),
+    # Partial indexes: the predicates match the search queries' WHERE clauses
+    Migration(2, "users search indexes", (
+        *concurrent_index(
+            "users_search_idx",
+            f"ON users USING gin (({USERS_SEARCH_VECTOR})) WHERE deleted_at IS NULL"
+        ),
+        *concurrent_index(
+            "users_username_trgm_idx",
+            "ON users USING gin (username gin_trgm_ops) WHERE deleted_at IS NULL"
+        ),
+    ), transactional=False),
+    Migration(3, "projects search indexes", (
+        *concurrent_index(
+            "projects_search_idx",
+            f"ON projects USING gin (({PROJECTS_SEARCH_VECTOR})) "
+            "WHERE deleted_at IS NULL AND status = 'active'"
+        ),
+        *concurrent_index(
+            "projects_name_trgm_idx",
+            "ON projects USING gin (name gin_trgm_ops) "
+            "WHERE deleted_at IS NULL AND status = 'active'"
+        ),
+    ), transactional=False),
+    # GET /users/{id}/projects: per-status counts as an index-only scan, the
+    # page as an index scan (description comes from the heap)
+    Migration(4, "projects owner covering index", (
+        *concurrent_index("projects_owner_idx", PROJECTS_OWNER_INDEX),
+    ), transactional=False),
+    # Version 4 first shipped with description (unbounded text) in INCLUDE;
+    # a long description then failed INSERT/UPDATE on the btree row size
+    Migration(5, "narrow projects owner covering index", (
+        *concurrent_index("projects_owner_idx", PROJECTS_OWNER_INDEX),
+    ), transactional=False),
+]
+
+
+async def migrate(conn: asyncpg.Connection, migrations: Sequence[Migration] = MIGRATIONS) -> List[int]:
+    """
+    Apply every migration not yet recorded, in version order.
+
+    Args:
+        conn: A dedicated connection (not from a pool with a command timeout:
+            index builds run for minutes)
+        migrations: Migrations to consider
+
+    Returns:
+        List[int]: Versions applied by this run
+
+    Raises:
+        asyncpg.PostgresError: If a statement fails (earlier migrations stay
+            applied; the failed one is retried on the next run)
+    """
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+    try:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version integer PRIMARY KEY,
+                name text NOT NULL,
+                applied_at timestamptz NOT NULL DEFAULT now()
+            )
+        """)
+        applied = {row["version"] for row in await conn.fetch("SELECT version FROM schema_migrations")}
+
+        newly_applied = []
+        for migration in sorted(migrations, key=lambda m: m.version):
+            if migration.version in applied:
+                continue
+            logger.info(f"Applying migration {migration.version}: {migration.name}")
+
+            if migration.transactional:
+                async with conn.transaction():
+                    for statement in migration.statements:
+                        await conn.execute(statement)
+                    await _record(conn, migration)
+            else:
+                for statement in migration.statements:
+                    await conn.execute(statement)
+                await _record(conn, migration)
+            newly_applied.append(migration.version)
+
+        return newly_applied
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+
+
+async def _record(conn: asyncpg.Connection, migration: Migration) -> None:
+    await conn.execute(
+        "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)",
+        migration.version, migration.name
+    )
+
+
+async def main() -> None:
+    conn = await asyncpg.connect(os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/myapp"))
+    try:
+        applied = await migrate(conn)
+        logger.info(f"Applied migrations: {applied or 'none (up to date)'}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(main())
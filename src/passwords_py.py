@@ -0,0 +1,129 @@
+"""
+==============================================================================
+Password Hashing
+==============================================================================
+Location: src/passwords.py
+Purpose: bcrypt hashing offloaded to a process pool (never on the event loop)
+==============================================================================
+
+bcrypt is deliberately slow (~250 ms per hash at the default cost) and holds
+the GIL, so running it on the event loop - or even in a thread - would stall
+every other request. PasswordHasher ships the work to worker processes.
+Bulk hashing stops at the request deadline (src/deadlines.py): chunks not
+yet started are cancelled instead of burning every worker for a request
+that has already timed out.
+
+    hasher = PasswordHasher(workers=2)
+    digest = await hasher.hash("securepassword123")
+    digests = await hasher.hash_many(passwords)   # bulk imports
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from passlib.context import CryptContext
+
+from src.deadlines import remaining
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Module-level so worker processes can build it on import
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+def hash_password(password: str) -> str:
+    """Hash a password (blocking; runs inside worker processes)"""
+    return pwd_context.hash(password)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords in one worker round trip"""
+    return [pwd_context.hash(password) for password in passwords]
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Check a password against a stored hash (blocking)"""
+    return pwd_context.verify(password, password_hash)
+
+
+class PasswordHasher:
+    """
+    Async facade over a lazily created ProcessPoolExecutor.
+
+    Args:
+        workers: Worker processes (default: CPU count)
+        chunk_size: Passwords sent to a worker per task in hash_many(); a
+            started chunk can't be cancelled, so this bounds the work wasted
+            after a deadline (~4 s per worker at cost 12)
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 16):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The worker pool, started on first use"""
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def hash(self, password: str) -> str:
+        """Hash one password without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, hash_password, password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash many passwords across all workers, preserving order.
+
+        Args:
+            passwords: Plain-text passwords
+
+        Returns:
+            List[str]: Hashes in the same order
+
+        Raises:
+            asyncio.TimeoutError: If the request deadline passed first; the
+                chunks still queued are cancelled
+            DeadlineExceeded: If the deadline had passed before starting
+        """
+        loop = asyncio.get_running_loop()
+        timeout = remaining()
+        chunks = [
+            passwords[i:i + self.chunk_size]
+            for i in range(0, len(passwords), self.chunk_size)
+        ]
+        futures = [
+            loop.run_in_executor(self.executor, hash_passwords, chunk) for chunk in chunks
+        ]
+        try:
+            done, pending = await asyncio.wait(
+                futures, timeout=timeout, return_when=asyncio.FIRST_EXCEPTION
+            )
+        finally:
+            # Deadline, a failed chunk or cancellation: free the workers
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+
+        for future in done:
+            if future.exception() is not None:
+                raise future.exception()
+        if pending:
+            raise asyncio.TimeoutError(f"Hashing {len(passwords)} passwords exceeded the deadline")
+        return [digest for future in futures for digest in future.result()]
+
+    def shutdown(self) -> None:
+        """Stop worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
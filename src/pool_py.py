@@ -0,0 +1,349 @@
+"""
+==============================================================================
+Adaptive Connection Pool Manager
+==============================================================================
+Location: src/pool.py
+Purpose: Pool-pressure telemetry and adaptive sizing around asyncpg.Pool
+==============================================================================
+
+asyncpg cannot resize a pool after creation, so the pool is created at its
+hard cap and ManagedPool gates acquisitions with an adjustable limit
+("target size"). A background loop raises the target under sustained
+pressure and lowers it when connections sit idle; the now-unused
+connections are closed by asyncpg's max_inactive_connection_lifetime.
+
+    raw = await asyncpg.create_pool(dsn, min_size=2, max_size=hard_cap,
+                                    max_inactive_connection_lifetime=60)
+    pool = ManagedPool(raw, min_size=2, max_size=hard_cap, initial_size=10)
+    await pool.start()
+    async with pool.acquire() as conn:
+        ...
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONNECTION BUDGET
+# ==============================================================================
+
+def pool_budget(
+    max_connections: int,
+    reserved: int,
+    workers: int,
+    requested_max: int,
+) -> int:
+    """
+    Largest pool size one worker may use.
+
+    Postgres' max_connections is shared by every worker process (and by
+    superuser/maintenance sessions, hence `reserved`).
+
+    Args:
+        max_connections: Server max_connections setting
+        reserved: Connections kept free for admin tools, migrations, etc.
+        workers: Number of processes sharing the budget
+        requested_max: Configured per-worker maximum
+
+    Returns:
+        int: min(requested_max, share of the budget), never below 1
+
+    Example:
+        >>> pool_budget(100, 10, 4, 50)
+        22
+    """
+    share = (max_connections - reserved) // max(workers, 1)
+    return max(1, min(requested_max, share))
+
+
+# ==============================================================================
+# ADJUSTABLE LIMITER
+# ==============================================================================
+
+class AcquireLimiter:
+    """
+    Semaphore whose limit can change at runtime.
+
+    Waiter futures are created on the caller's running loop, so the limiter
+    is not bound to a single event loop.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers blocked on the limit"""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting while in_use >= limit"""
+        if self.in_use < self.limit and not self.waiting:
+            self.in_use += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # A slot handed to us just before cancellation goes to the next waiter
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Return a slot and wake waiters that now fit"""
+        self.in_use -= 1
+        self._wake()
+
+    def set_limit(self, limit: int) -> None:
+        """Change the limit; raising it wakes waiters immediately"""
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_use += 1
+                waiter.set_result(None)
+
+
+# ==============================================================================
+# MANAGED POOL
+# ==============================================================================
+
+class _ManagedAcquire:
+    """Async context manager returned by ManagedPool.acquire()"""
+
+    def __init__(self, manager: "ManagedPool", timeout: Optional[float]):
+        self.manager = manager
+        self.timeout = timeout
+        self._inner = None
+
+    async def __aenter__(self):
+        manager = self.manager
+        started = time.perf_counter()
+
+        try:
+            if self.timeout is None:
+                await manager.limiter.acquire()
+            else:
+                await asyncio.wait_for(manager.limiter.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            manager.acquire_timeouts += 1
+            raise
+
+        manager._observe()
+        try:
+            remaining = None
+            if self.timeout is not None:
+                remaining = max(self.timeout - (time.perf_counter() - started), 0.001)
+            self._inner = manager.pool.acquire(timeout=remaining)
+            conn = await self._inner.__aenter__()
+        except BaseException:
+            manager.limiter.release()
+            raise
+
+        manager._record_wait(time.perf_counter() - started)
+        return conn
+
+    async def __aexit__(self, *exc):
+        try:
+            return await self._inner.__aexit__(*exc)
+        finally:
+            self.manager.limiter.release()
+
+
+class ManagedPool:
+    """
+    asyncpg.Pool wrapper adding acquire telemetry and adaptive sizing.
+
+    Anything not defined here (close, fetch, get_size, ...) is delegated to
+    the wrapped pool, so handlers can use it exactly like asyncpg.Pool.
+
+    Args:
+        pool: The underlying asyncpg pool (created with max_size >= max_size)
+        min_size: Lower bound for the target size
+        max_size: Upper bound for the target size (the per-worker budget)
+        initial_size: Starting target size
+        grow_step / shrink_step: Connections added/removed per adjustment
+        high_water: Utilization at or above which the pool is under pressure
+        low_water: Utilization at or below which the pool is oversized
+        sustain: Consecutive intervals required before resizing
+        interval: Seconds between autoscale evaluations
+        sample_size: Number of acquire latencies kept for percentiles
+    """
+
+    def __init__(
+        self,
+        pool: Any,
+        min_size: int,
+        max_size: int,
+        initial_size: Optional[int] = None,
+        grow_step: int = 2,
+        shrink_step: int = 1,
+        high_water: float = 0.8,
+        low_water: float = 0.3,
+        sustain: int = 3,
+        interval: float = 1.0,
+        sample_size: int = 1024,
+    ):
+        self.pool = pool
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        start = initial_size if initial_size is not None else min_size
+        self.limiter = AcquireLimiter(min(max(start, self.min_size), self.max_size))
+        self.grow_step = grow_step
+        self.shrink_step = shrink_step
+        self.high_water = high_water
+        self.low_water = low_water
+        self.sustain = sustain
+        self.interval = interval
+
+        self.acquire_count = 0
+        self.acquire_timeouts = 0
+        self.resizes = 0
+        self._waits: Deque[float] = deque(maxlen=sample_size)
+        self._peak_in_use = 0
+        self._peak_waiters = 0
+        self._pressure_streak = 0
+        self._idle_streak = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool, name)
+
+    # ------------------------------------------------------------------
+    # Acquisition
+    # ------------------------------------------------------------------
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _ManagedAcquire:
+        """Acquire a connection, honouring the current target size"""
+        return _ManagedAcquire(self, timeout)
+
+    @property
+    def target_size(self) -> int:
+        """Current adaptive limit on concurrently held connections"""
+        return self.limiter.limit
+
+    def _observe(self) -> None:
+        self._peak_in_use = max(self._peak_in_use, self.limiter.in_use)
+        self._peak_waiters = max(self._peak_waiters, self.limiter.waiting)
+
+    def _record_wait(self, seconds: float) -> None:
+        self.acquire_count += 1
+        self._waits.append(seconds)
+
+    # ------------------------------------------------------------------
+    # Autoscaling
+    # ------------------------------------------------------------------
+
+    def evaluate(self) -> int:
+        """
+        Run one autoscale step using peaks seen since the previous step.
+
+        Returns:
+            int: The (possibly new) target size
+        """
+        self._observe()
+        target = self.limiter.limit
+        utilization = self._peak_in_use / target if target else 1.0
+        under_pressure = self._peak_waiters > 0 or utilization >= self.high_water
+        oversized = self._peak_waiters == 0 and utilization <= self.low_water
+
+        self._pressure_streak = self._pressure_streak + 1 if under_pressure else 0
+        self._idle_streak = self._idle_streak + 1 if oversized else 0
+        self._peak_in_use = self.limiter.in_use
+        self._peak_waiters = self.limiter.waiting
+
+        new_target = target
+        if self._pressure_streak >= self.sustain and target < self.max_size:
+            new_target = min(target + self.grow_step, self.max_size)
+        elif self._idle_streak >= self.sustain and target > self.min_size:
+            new_target = max(target - self.shrink_step, self.min_size)
+
+        if new_target != target:
+            logger.info(f"Resizing connection pool target {target} -> {new_target}")
+            self.limiter.set_limit(new_target)
+            self.resizes += 1
+            self._pressure_streak = 0
+            self._idle_streak = 0
+
+        return new_target
+
+    async def _autoscale(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.evaluate()
+            except Exception as e:
+                logger.error(f"Pool autoscale step failed: {e}")
+
+    async def start(self) -> None:
+        """Start the background autoscale loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._autoscale())
+
+    async def stop(self) -> None:
+        """Stop the autoscale loop (does not close the pool)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def close(self) -> None:
+        """Stop autoscaling and close the underlying pool"""
+        await self.stop()
+        await self.pool.close()
+
+    # ------------------------------------------------------------------
+    # Telemetry
+    # ------------------------------------------------------------------
+
+    def wait_percentiles(self) -> Dict[str, float]:
+        """Acquire wait time percentiles (milliseconds) over recent samples"""
+        samples: List[float] = sorted(self._waits)
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+        def pick(q: float) -> float:
+            index = min(int(q * len(samples)), len(samples) - 1)
+            return round(samples[index] * 1000, 3)
+
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": pick(1.0)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool pressure and sizing"""
+        target = self.limiter.limit
+        size = self.pool.get_size() if hasattr(self.pool, "get_size") else None
+        idle = self.pool.get_idle_size() if hasattr(self.pool, "get_idle_size") else None
+        return {
+            "target_size": target,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "open_connections": size if isinstance(size, int) else None,
+            "idle_connections": idle if isinstance(idle, int) else None,
+            "in_use": self.limiter.in_use,
+            "waiters": self.limiter.waiting,
+            "utilization": round(self.limiter.in_use / target, 3) if target else 0.0,
+            "acquire_count": self.acquire_count,
+            "acquire_timeouts": self.acquire_timeouts,
+            "acquire_wait_ms": self.wait_percentiles(),
+            "resizes": self.resizes,
+        }
@@ -0,0 +1,240 @@
+"""
+==============================================================================
+Read Replica Routing
+==============================================================================
+Location: src/replicas.py
+Purpose: Send reads to streaming replicas (least outstanding requests first)
+         without breaking read-your-writes
+==============================================================================
+
+Writes always go to the primary. After a write the app returns the
+primary's WAL position as a consistency token:
+
+    X-Consistency-Token: 16/B374D848
+
+A client that sends the token back on its next GET is routed only to a
+replica whose replay position has reached it, or to the primary if none has.
+Replay positions are polled in the background (`pg_last_wal_replay_lsn()`),
+so routing never costs a round trip. A replica that fails its poll is taken
+out of rotation until a later poll succeeds.
+
+    router = ReplicaRouter(poll_interval=0.2)
+    router.add("replica-0", replica_pool)
+    await router.start()
+    pool = router.route(primary_pool, token=request_token)
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REPLAY_LSN_SQL = "SELECT pg_last_wal_replay_lsn()::text"
+CURRENT_LSN_SQL = "SELECT pg_current_wal_lsn()::text"
+
+
+def parse_lsn(text: str) -> int:
+    """
+    Convert a Postgres LSN ("16/B374D848") to a comparable integer.
+
+    Raises:
+        ValueError: If `text` is not an LSN
+    """
+    high, low = text.strip().split("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+class _CountedAcquire:
+    def __init__(self, replica: "ReplicaPool", inner):
+        self.replica = replica
+        self.inner = inner
+
+    async def __aenter__(self):
+        self.replica.outstanding += 1
+        try:
+            return await self.inner.__aenter__()
+        except BaseException:
+            self.replica.outstanding -= 1
+            raise
+
+    async def __aexit__(self, *exc):
+        try:
+            return await self.inner.__aexit__(*exc)
+        finally:
+            self.replica.outstanding -= 1
+
+
+class ReplicaPool:
+    """
+    A replica's pool plus the routing state kept for it.
+
+    Behaves like the wrapped pool; acquire() also counts outstanding use.
+    """
+
+    def __init__(self, name: str, pool: Any):
+        self.name = name
+        self.pool = pool
+        self.outstanding = 0
+        self.replay_lsn: Optional[int] = None   # None until the first poll
+        self.healthy = False
+        self.reads = 0
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _CountedAcquire:
+        return _CountedAcquire(self, self.pool.acquire(timeout=timeout))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool, name)
+
+
+class ReplicaRouter:
+    """
+    Choose the pool for each read.
+
+    Args:
+        poll_interval: Seconds between replay-position polls
+        poll_timeout: Per-replica poll timeout
+    """
+
+    def __init__(self, poll_interval: float = 0.2, poll_timeout: float = 1.0):
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self.replicas: List[ReplicaPool] = []
+        self._task: Optional[asyncio.Task] = None
+
+        self.primary_reads = 0
+        self.stale_fallbacks = 0   # had a token no replica satisfied
+
+    def add(self, name: str, pool: Any) -> ReplicaPool:
+        """Put a connected replica into rotation (after its first poll)"""
+        replica = ReplicaPool(name, pool)
+        self.replicas.append(replica)
+        return replica
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def route(self, primary: Any, token: Optional[str] = None) -> Any:
+        """
+        Pool for a read.
+
+        Args:
+            primary: The primary pool (fallback)
+            token: Consistency token from the client, if any
+
+        Returns:
+            The least-busy replica that has replayed past `token`, else `primary`
+        """
+        required = 0
+        if token:
+            try:
+                required = parse_lsn(token)
+            except ValueError:
+                self.primary_reads += 1   # unreadable token: play it safe
+                return primary
+
+        candidates = [
+            replica for replica in self.replicas
+            if replica.healthy and replica.replay_lsn is not None and replica.replay_lsn >= required
+        ]
+        if not candidates:
+            if token and any(replica.healthy for replica in self.replicas):
+                self.stale_fallbacks += 1
+            self.primary_reads += 1
+            return primary
+
+        replica = min(candidates, key=lambda r: r.outstanding)
+        replica.reads += 1
+        return replica
+
+    def alternate(self, pool: Any) -> Any:
+        """
+        Pool for a hedged duplicate of a read that went to `pool`.
+
+        Another healthy replica that has replayed at least as far (so the
+        duplicate can't be staler), otherwise `pool` itself.
+        """
+        if not isinstance(pool, ReplicaPool):
+            return pool
+        candidates = [
+            replica for replica in self.replicas
+            if replica is not pool and replica.healthy
+            and (replica.replay_lsn or 0) >= (pool.replay_lsn or 0)
+        ]
+        if not candidates:
+            return pool
+        return min(candidates, key=lambda r: r.outstanding)
+
+    # ------------------------------------------------------------------
+    # Replay-position polling
+    # ------------------------------------------------------------------
+
+    async def poll(self, replica: ReplicaPool) -> None:
+        """Refresh one replica's replay position and health"""
+        try:
+            async def query():
+                async with replica.pool.acquire() as conn:
+                    return await conn.fetchval(REPLAY_LSN_SQL)
+
+            lsn = await asyncio.wait_for(query(), self.poll_timeout)
+        except Exception as e:
+            if replica.healthy:
+                logger.error(f"Replica {replica.name} removed from rotation: {e!r}")
+            replica.healthy = False
+            return
+
+        if lsn is None:
+            # Not in recovery: this "replica" is a primary
+            if replica.healthy or replica.replay_lsn is None:
+                logger.warning(f"Replica {replica.name} is not a standby; serving untokened reads only")
+            replica.replay_lsn = 0
+        else:
+            replica.replay_lsn = parse_lsn(lsn)
+        if not replica.healthy:
+            logger.info(f"Replica {replica.name} in rotation")
+        replica.healthy = True
+
+    async def poll_all(self) -> None:
+        """Poll every replica concurrently"""
+        await asyncio.gather(*(self.poll(replica) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await self.poll_all()
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self) -> None:
+        """Start polling in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop polling and close every replica pool"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.pool.close()
+        self.replicas = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics"""
+        return {
+            "primary_reads": self.primary_reads,
+            "stale_fallbacks": self.stale_fallbacks,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "outstanding": replica.outstanding,
+                    "reads": replica.reads,
+                    "replay_lsn": replica.replay_lsn,
+                }
+                for replica in self.replicas
+            ],
+        }
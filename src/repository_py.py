@@ -0,0 +1,381 @@
+"""
+==============================================================================
+Storage Backends
+==============================================================================
+Location: src/repository.py
+Purpose: The reads behind GET /users, GET /users/{id} and GET /projects,
+         behind one interface with PostgreSQL, in-memory and SQLite engines
+==============================================================================
+
+The listing and lookup endpoints talk to a Repository instead of a pool, so
+the HTTP layer (routing, validation, coalescing, serialization, middleware)
+can be load-tested and profiled without a PostgreSQL server. The engine is
+picked from the DATABASE_URL scheme:
+
+    postgresql://...            PostgresRepository (src/main.py; the
+                                production path, with replicas, retries
+                                and hedging)
+    memory://?users=10000       MemoryRepository, seeded with sample rows
+    sqlite:///bench.db?users=0  SQLiteRepository (stdlib sqlite3, queries
+                                run in a worker thread)
+
+Writes, search, exports and the other endpoints still require PostgreSQL;
+with a local engine they answer 501 Not Implemented.
+
+Rows are mappings with the response models' field names. An implementation
+may return more columns than the `fields` hint asks for; callers only read
+the ones they need.
+
+    repository = open_repository("memory://?users=1000&projects=200")
+    rows = await repository.users_page(10, 0)
+"""
+
+import asyncio
+import random
+import sqlite3
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+Row = Mapping[str, Any]
+
+POSTGRES_SCHEMES = ("postgres", "postgresql")
+
+USER_COLUMNS = ("id", "username", "email", "full_name", "is_active", "created_at")
+PROJECT_COLUMNS = ("id", "name", "description", "status", "created_at")
+
+
+class Repository(ABC):
+    """
+    Reads for the listing and lookup endpoints.
+
+    `name` identifies the data source in coalescing keys: reads against
+    different sources must not share results.
+    """
+
+    name: str = "repository"
+
+    @abstractmethod
+    async def users_page(self, limit: int, offset: int,
+                         fields: Optional[Tuple[str, ...]] = None) -> List[Row]:
+        """Live users, newest first"""
+
+    @abstractmethod
+    async def user_by_id(self, user_id: str) -> Optional[Row]:
+        """One live user, or None"""
+
+    @abstractmethod
+    async def users_by_ids(self, ids: Sequence[str],
+                           fields: Optional[Tuple[str, ...]] = None) -> List[Row]:
+        """Live users among `ids` (any order; missing ids are absent)"""
+
+    @abstractmethod
+    async def projects_page(self, limit: int, offset: int,
+                            fields: Optional[Tuple[str, ...]] = None) -> List[Row]:
+        """Live active projects, newest first"""
+
+    @abstractmethod
+    async def estimate_count(self, table: str) -> int:
+        """Cheap row estimate for a listing ("users" or "projects")"""
+
+    @abstractmethod
+    async def exact_count(self, table: str) -> int:
+        """Exact row count for a listing"""
+
+    async def connect(self) -> None:
+        """Open resources (called at startup)"""
+
+    async def close(self) -> None:
+        """Release resources (called at shutdown)"""
+
+
+# ==============================================================================
+# SAMPLE DATA
+# ==============================================================================
+
+def sample_rows(users: int, projects: int, seed: int = 0) -> Tuple[List[dict], List[dict]]:
+    """
+    Deterministic users and projects for local engines.
+
+    About 5% of users are soft-deleted and a third of projects are not
+    active, so the filters do real work.
+    """
+    rng = random.Random(seed)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    user_rows = [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "full_name": f"User {i}" if i % 3 else None,
+            "is_active": i % 10 != 0,
+            "created_at": now - timedelta(minutes=i),
+            "deleted_at": now if i % 20 == 19 else None,
+        }
+        for i in range(users)
+    ]
+    project_rows = [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "name": f"Project {i}",
+            "description": f"Sample project number {i}" if i % 2 else None,
+            "status": ("active", "active", "archived")[i % 3],
+            "created_at": now - timedelta(minutes=i),
+            "deleted_at": None,
+            "owner_id": user_rows[i % len(user_rows)]["id"] if user_rows else None,
+        }
+        for i in range(projects)
+    ]
+    return user_rows, project_rows
+
+
+# ==============================================================================
+# IN-MEMORY
+# ==============================================================================
+
+class MemoryRepository(Repository):
+    """
+    Lists held in process memory.
+
+    Pages are slices of pre-filtered, pre-sorted lists, so the cost of a
+    request is almost entirely the HTTP layer's.
+    """
+
+    name = "memory"
+
+    def __init__(self, users: Iterable[dict] = (), projects: Iterable[dict] = ()):
+        self._users: List[dict] = []
+        self._projects: List[dict] = []
+        self.seed(users, projects)
+
+    def seed(self, users: Iterable[dict] = (), projects: Iterable[dict] = ()) -> None:
+        """Add rows (dicts with the table's columns, plus optional deleted_at)"""
+        self._users.extend(users)
+        self._projects.extend(projects)
+        self._live_users = sorted(
+            (row for row in self._users if row.get("deleted_at") is None),
+            key=lambda row: row["created_at"], reverse=True
+        )
+        self._users_by_id = {str(row["id"]): row for row in self._live_users}
+        self._live_projects = sorted(
+            (row for row in self._projects
+             if row.get("deleted_at") is None and row["status"] == "active"),
+            key=lambda row: row["created_at"], reverse=True
+        )
+
+    async def users_page(self, limit, offset, fields=None):
+        return self._live_users[offset:offset + limit]
+
+    async def user_by_id(self, user_id):
+        return self._users_by_id.get(user_id)
+
+    async def users_by_ids(self, ids, fields=None):
+        return [self._users_by_id[key] for key in ids if key in self._users_by_id]
+
+    async def projects_page(self, limit, offset, fields=None):
+        return self._live_projects[offset:offset + limit]
+
+    async def estimate_count(self, table):
+        return await self.exact_count(table)
+
+    async def exact_count(self, table):
+        return len(self._live_users if table == "users" else self._live_projects)
+
+
+# ==============================================================================
+# SQLITE
+# ==============================================================================
+
+SQLITE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        username TEXT NOT NULL UNIQUE,
+        email TEXT NOT NULL UNIQUE,
+        full_name TEXT,
+        is_active INTEGER NOT NULL DEFAULT 1,
+        created_at TEXT NOT NULL,
+        deleted_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS projects (
+        id TEXT PRIMARY KEY,
+        owner_id TEXT,
+        name TEXT NOT NULL,
+        description TEXT,
+        status TEXT NOT NULL DEFAULT 'active',
+        created_at TEXT NOT NULL,
+        deleted_at TEXT
+    )
+    """,
+    # Same shape as the PostgreSQL listing indexes
+    "CREATE INDEX IF NOT EXISTS users_live_created_idx ON users (created_at DESC) "
+    "WHERE deleted_at IS NULL",
+    "CREATE INDEX IF NOT EXISTS projects_active_created_idx ON projects (created_at DESC) "
+    "WHERE deleted_at IS NULL AND status = 'active'",
+)
+
+
+class SQLiteRepository(Repository):
+    """
+    SQLite file (or ":memory:") accessed with the stdlib driver.
+
+    sqlite3 blocks, so every query runs in a worker thread; one connection
+    is shared and queries are serialized by a lock.
+
+    Args:
+        path: Database file, or ":memory:"
+        sample: (users, projects) rows inserted on connect if the database
+            has no users yet
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = ":memory:",
+                 sample: Tuple[Iterable[dict], Iterable[dict]] = ((), ())):
+        self.path = path
+        self.sample = sample
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        if self._conn is None:
+            self._conn = await asyncio.to_thread(self._open)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for statement in SQLITE_SCHEMA:
+            conn.execute(statement)
+        if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+            _insert(conn, *self.sample)
+        conn.commit()
+        return conn
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    async def _run(self, function, *args):
+        await self.connect()
+        async with self._lock:
+            return await asyncio.to_thread(function, *args)
+
+    async def seed(self, users: Iterable[dict] = (), projects: Iterable[dict] = ()) -> None:
+        """Insert rows (same shape as MemoryRepository.seed)"""
+        await self._run(self._seed, list(users), list(projects))
+
+    def _seed(self, users: List[dict], projects: List[dict]) -> None:
+        _insert(self._conn, users, projects)
+        self._conn.commit()
+
+    def _query(self, sql: str, params: Sequence[Any]) -> List[dict]:
+        return [_row(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    async def users_page(self, limit, offset, fields=None):
+        return await self._run(self._query, (
+            f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE deleted_at IS NULL "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        ), (limit, offset))
+
+    async def user_by_id(self, user_id):
+        rows = await self._run(self._query, (
+            f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE id = ? AND deleted_at IS NULL"
+        ), (user_id,))
+        return rows[0] if rows else None
+
+    async def users_by_ids(self, ids, fields=None):
+        placeholders = ", ".join("?" * len(ids))
+        return await self._run(self._query, (
+            f"SELECT {', '.join(USER_COLUMNS)} FROM users "
+            f"WHERE id IN ({placeholders}) AND deleted_at IS NULL"
+        ), list(ids))
+
+    async def projects_page(self, limit, offset, fields=None):
+        return await self._run(self._query, (
+            f"SELECT {', '.join(PROJECT_COLUMNS)} FROM projects "
+            "WHERE deleted_at IS NULL AND status = 'active' "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        ), (limit, offset))
+
+    async def estimate_count(self, table):
+        return await self.exact_count(table)
+
+    async def exact_count(self, table):
+        where = "deleted_at IS NULL" + (" AND status = 'active'" if table == "projects" else "")
+        rows = await self._run(self._query, f"SELECT count(*) AS n FROM {_table(table)} WHERE {where}", ())
+        return rows[0]["n"]
+
+
+def _insert(conn: sqlite3.Connection, users: Iterable[dict], projects: Iterable[dict]) -> None:
+    conn.executemany(
+        "INSERT INTO users (id, username, email, full_name, is_active, created_at, deleted_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(str(u["id"]), u["username"], u["email"], u["full_name"], int(u["is_active"]),
+          _timestamp(u["created_at"]), _timestamp(u.get("deleted_at"))) for u in users]
+    )
+    conn.executemany(
+        "INSERT INTO projects (id, owner_id, name, description, status, created_at, deleted_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(str(p["id"]), str(p["owner_id"]) if p.get("owner_id") else None, p["name"],
+          p["description"], p["status"], _timestamp(p["created_at"]),
+          _timestamp(p.get("deleted_at"))) for p in projects]
+    )
+
+
+def _table(table: str) -> str:
+    if table not in ("users", "projects"):
+        raise ValueError(f"Unknown table: {table}")
+    return table
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    # Fixed-width UTC ISO text sorts chronologically
+    return value.astimezone(timezone.utc).isoformat() if value is not None else None
+
+
+def _row(row: sqlite3.Row) -> dict:
+    values = dict(row)
+    if "id" in values:
+        values["id"] = uuid.UUID(values["id"])
+    if "created_at" in values:
+        values["created_at"] = datetime.fromisoformat(values["created_at"])
+    if "is_active" in values:
+        values["is_active"] = bool(values["is_active"])
+    return values
+
+
+# ==============================================================================
+# SELECTION
+# ==============================================================================
+
+def open_repository(url: str) -> Optional[Repository]:
+    """
+    Local engine for a DATABASE_URL, or None for PostgreSQL.
+
+    `users` and `projects` query parameters seed that many sample rows
+    (SQLite: only into an empty database).
+
+    Raises:
+        ValueError: For an unsupported scheme
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.split("+")[0]
+    if scheme in POSTGRES_SCHEMES:
+        return None
+
+    options = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    users, projects = int(options.get("users", 0)), int(options.get("projects", 0))
+    rows = sample_rows(users, projects) if users or projects else ((), ())
+
+    if scheme == "memory":
+        return MemoryRepository(*rows)
+    if scheme == "sqlite":
+        # sqlite:///relative.db, sqlite:////absolute.db, sqlite:// = in memory
+        path = parts.path[1:] if parts.path.startswith("/") else parts.path
+        return SQLiteRepository(path or ":memory:", sample=rows)
+    raise ValueError(f"Unsupported DATABASE_URL scheme: {parts.scheme!r}")
@@ -0,0 +1,454 @@
+"""
+==============================================================================
+Resilient Reads
+==============================================================================
+Location: src/resilience.py
+Purpose: Retry, hedge and circuit-break idempotent database reads
+==============================================================================
+
+A Postgres failover or a dropped connection surfaces as a burst of
+connection errors. They are transient, and a read that fails that way is
+safe to repeat. ResilientReader wraps read-only statements with three
+mechanisms:
+
+    - Retry: transient errors are retried with exponential backoff and
+      full jitter, never sleeping past the request deadline
+    - Hedging: if the first attempt is still running after that
+      statement's observed p95 latency, a duplicate goes to an alternate
+      pool (another replica) and the first answer wins. Without an
+      alternate there is no hedging: a duplicate on the same pool only
+      adds load to a database that is already slow
+    - Circuit breaker: after `failure_threshold` consecutive transient
+      failures the breaker opens, and reads fail fast with CircuitOpenError
+      (503) until `reset_timeout` has passed and a trial read succeeds.
+      With `breaker_for`, each pool (primary, every replica) has its own
+      breaker, and `fallback_pool` moves a read off a failing or open
+      replica instead of failing it
+
+    reader = ResilientReader(RetryPolicy(attempts=3), CircuitBreaker(), Hedger())
+    rows = await reader.run(pool, lambda p: fetch_rows(p, SQL, limit, offset), key=SQL)
+
+Writes must never go through the reader: they are not idempotent. They
+share the breaker through `breaker.guard()`, which fails fast while the
+circuit is open but never retries:
+
+    async with breaker.guard():
+        await fetch_row(pool, INSERT_SQL, ...)
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, Optional, TypeVar
+)
+
+import asyncpg
+
+from src.deadlines import remaining
+
+T = TypeVar("T")
+
+# Errors that mean "the connection or server went away", not "the query is wrong".
+# Timeouts are included so a server that hangs (command_timeout, acquire
+# timeout) trips the breaker like one that refuses connections; a retry after
+# a timeout still never sleeps past the request deadline.
+TRANSIENT_ERRORS = (
+    asyncio.TimeoutError,
+    ConnectionError,
+    asyncpg.PostgresConnectionError,       # connection lost / could not be made
+    asyncpg.CannotConnectNowError,         # server starting up or in recovery
+    asyncpg.AdminShutdownError,            # failover / restart
+    asyncpg.CrashShutdownError,
+    asyncpg.TooManyConnectionsError,
+    asyncpg.InterfaceError,                # connection closed under us
+)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed read is worth retrying"""
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of touching the database while the breaker is open"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Database circuit open")
+        self.retry_after = retry_after
+
+
+# ==============================================================================
+# POLICIES
+# ==============================================================================
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempts: Total tries per read (1 = no retry)
+        base_delay: Backoff before the second attempt (seconds)
+        max_delay: Upper bound on any single backoff
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.05, max_delay: float = 1.0):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Sleep before retry number `attempt` (1-based)"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after consecutive failures; open -> half-open after a
+    cool-down; half-open -> closed on the first success (open again on failure).
+
+    Args:
+        failure_threshold: Consecutive transient failures that open the circuit
+        reset_timeout: Seconds to stay open before allowing a trial request
+        clock: Time source (seconds)
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Close the circuit and forget failures"""
+        self._state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.rejected = 0
+        self.opened_count = 0
+
+    @property
+    def state(self) -> str:
+        """Current state (an expired open circuit reports half_open)"""
+        if self._state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until a trial request will be allowed"""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def allow(self) -> None:
+        """
+        Gate a request.
+
+        Raises:
+            CircuitOpenError: While open, or while a half-open trial is running
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(max(self.retry_after(), 1.0))
+
+    def record_success(self) -> None:
+        """A request reached the database and came back"""
+        self._state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """A request failed with a transient (connection-level) error"""
+        self.failures += 1
+        self._trial_in_flight = False
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.opened_count += 1
+            self._state = self.OPEN
+            self.opened_at = self.clock()
+
+    def release(self) -> None:
+        """A gated request ended without telling us anything (e.g. cancelled)"""
+        self._trial_in_flight = False
+
+    def record_error(self, error: BaseException) -> None:
+        """A gated request raised `error`; record what it says about the database"""
+        if is_transient(error):
+            self.record_failure()
+        elif isinstance(error, asyncpg.PostgresError):
+            # A query error still proves the server is reachable
+            self.record_success()
+        else:
+            self.release()
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """
+        Gate one non-retried operation (a write, opening a stream).
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+        """
+        self.allow()
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception as e:
+            self.record_error(e)
+            raise
+        self.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics and /health"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opened": self.opened_count,
+            "rejected": self.rejected,
+            "retry_after_seconds": round(self.retry_after(), 3),
+        }
+
+
+class Hedger:
+    """
+    Decides when to send a duplicate read: once the first attempt has run
+    longer than the recent p95 latency of the same statement (never before
+    `min_samples` reads of it). Statements differ by orders of magnitude
+    (a primary-key lookup vs. an exact count), so one shared threshold
+    would hedge the slow ones on nearly every call.
+
+    Args:
+        percentile: Latency percentile that triggers the hedge
+        sample_size: Recent latencies kept per statement
+        min_samples: Reads of a statement observed before hedging it
+        min_delay: Never hedge earlier than this (seconds)
+        max_keys: Statements tracked; reads of others are never hedged
+    """
+
+    def __init__(self, percentile: float = 0.95, sample_size: int = 512,
+                 min_samples: int = 50, min_delay: float = 0.01, max_keys: int = 256):
+        self.percentile = percentile
+        self.sample_size = sample_size
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_keys = max_keys
+        self._windows: Dict[Hashable, _LatencyWindow] = {}
+
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def observe(self, seconds: float, key: Hashable = None) -> None:
+        """Record the latency of a completed read of statement `key`"""
+        window = self._windows.get(key)
+        if window is None:
+            if len(self._windows) >= self.max_keys:
+                return
+            window = self._windows[key] = _LatencyWindow(self.sample_size)
+        window.add(seconds, self)
+
+    def delay(self, key: Hashable = None) -> Optional[float]:
+        """Seconds to wait before hedging `key`, or None if not enough data yet"""
+        window = self._windows.get(key)
+        return window.threshold if window is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        thresholds = [w.threshold for w in self._windows.values() if w.threshold is not None]
+        return {
+            "statements": len(self._windows),
+            "max_threshold_ms": round(max(thresholds) * 1000, 3) if thresholds else None,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+class _LatencyWindow:
+    """Recent latencies of one statement and its hedge threshold"""
+
+    def __init__(self, size: int):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.threshold: Optional[float] = None
+        self._since_update = 0
+
+    def add(self, seconds: float, hedger: Hedger) -> None:
+        self.samples.append(seconds)
+        self._since_update += 1
+        if self._since_update >= 16 or self.threshold is None:
+            self._since_update = 0
+            if len(self.samples) >= hedger.min_samples:
+                ordered = sorted(self.samples)
+                index = min(len(ordered) - 1, int(hedger.percentile * len(ordered)))
+                self.threshold = max(hedger.min_delay, ordered[index])
+
+
+# ==============================================================================
+# READER
+# ==============================================================================
+
+class ResilientReader:
+    """
+    Run idempotent reads with retry, hedging and a circuit breaker.
+
+    Args:
+        retry: Backoff policy for transient errors
+        breaker: Shared circuit breaker
+        hedger: Hedging policy (None disables hedging)
+        hedge_pool: Returns an alternate pool for the duplicate read given
+            the primary one (e.g. another replica); None or the primary
+            itself means the read is not hedged
+        breaker_for: Returns the breaker guarding a pool (default: `breaker`
+            for every pool)
+        fallback_pool: Returns the pool to use after a transient failure on
+            a pool, or while its breaker is open (e.g. another replica or
+            the primary); None or the pool itself means stay on it
+    """
+
+    def __init__(
+        self,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedger: Optional[Hedger] = None,
+        hedge_pool: Optional[Callable[[Any], Any]] = None,
+        breaker_for: Optional[Callable[[Any], CircuitBreaker]] = None,
+        fallback_pool: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.hedger = hedger
+        self.hedge_pool = hedge_pool or (lambda pool: None)
+        self.breaker_for = breaker_for or (lambda pool: self.breaker)
+        self.fallback_pool = fallback_pool or (lambda pool: None)
+        self.retries = 0
+        self.fallbacks = 0
+
+    def _fallback(self, pool: Any) -> Any:
+        """Pool to move a read to, or None to stay on `pool`"""
+        fallback = self.fallback_pool(pool)
+        if fallback is None or fallback is pool:
+            return None
+        self.fallbacks += 1
+        return fallback
+
+    async def run(self, pool: Any, read: Callable[[Any], Awaitable[T]], key: Hashable = None) -> T:
+        """
+        Execute `read(pool)` resiliently.
+
+        Args:
+            pool: Primary pool for this read
+            read: Coroutine function running the statement against a pool
+            key: Identity of the statement (its SQL text) for hedging
+
+        Returns:
+            Whatever `read` returns
+
+        Raises:
+            CircuitOpenError: If the breaker is open and there is no fallback
+            Exception: The last error once retries are exhausted, or any
+                non-transient error immediately
+        """
+        attempt = 1
+        while True:
+            breaker = self.breaker_for(pool)
+            try:
+                breaker.allow()
+            except CircuitOpenError:
+                fallback = self._fallback(pool)
+                if fallback is None:
+                    raise
+                pool = fallback
+                continue
+            try:
+                result = await self._hedged(pool, read, key)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record_error(e)
+                if not is_transient(e):
+                    raise
+                if attempt >= self.retry.attempts:
+                    raise
+                fallback = self._fallback(pool)
+                if fallback is None:
+                    delay = self.retry.backoff(attempt)
+                    left = remaining()
+                    if left is not None and delay >= left:
+                        raise
+                self.retries += 1
+                attempt += 1
+                if fallback is not None:
+                    # Another server: no need to wait for this one to recover
+                    pool = fallback
+                    continue
+                await asyncio.sleep(delay)
+                continue
+
+            breaker.record_success()
+            return result
+
+    async def _hedged(self, pool: Any, read: Callable[[Any], Awaitable[T]], key: Hashable) -> T:
+        if self.hedger is None:
+            return await read(pool)
+
+        alternate = self.hedge_pool(pool)
+        hedge_after = None
+        if alternate is not None and alternate is not pool:
+            hedge_after = self.hedger.delay(key)
+        started = time.perf_counter()
+
+        if hedge_after is None:
+            result = await read(pool)
+            self.hedger.observe(time.perf_counter() - started, key)
+            return result
+
+        first = asyncio.ensure_future(read(pool))
+        second: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({first}, timeout=hedge_after)
+            if done:
+                result = first.result()
+                self.hedger.observe(time.perf_counter() - started, key)
+                return result
+
+            self.hedger.hedged += 1
+            second = asyncio.ensure_future(read(alternate))
+            pending = {first, second}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.hedger.hedge_wins += 1
+                        self.hedger.observe(time.perf_counter() - started, key)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (first, second):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /metrics"""
+        return {
+            "retries": self.retries,
+            "fallbacks": self.fallbacks,
+            "breaker": self.breaker.stats(),
+            "hedging": self.hedger.stats() if self.hedger is not None else None,
+        }
@@ -0,0 +1,79 @@
+"""
+==============================================================================
+Full-Text Search
+==============================================================================
+Location: src/search.py
+Purpose: Search expressions shared by the queries and their indexes, plus
+         keyset cursors for ranked result pages
+==============================================================================
+
+A GIN index on an expression is only used when the query repeats the
+expression exactly. For that reason the tsvector expressions live here, and
+both src/migrations.py (CREATE INDEX) and the search statements in
+src/main.py are built from them.
+
+Matching has two parts:
+    - full text: `<vector> @@ websearch_to_tsquery(...)` (words, stemming
+      for projects, quoted phrases, -exclusions)
+    - trigram: `username % q` / `name % q` (typos, prefixes, partial names)
+
+Ranked results can't be paged with OFFSET cheaply, and rows can move
+between pages. Each page ends with an opaque cursor holding the last row's
+(rank, id); the next page asks for rows strictly after it:
+
+    token = encode_cursor(last["rank"], last["id"])
+    rank, row_id = decode_cursor(token)
+"""
+
+import base64
+import json
+import uuid
+from typing import Optional, Tuple
+
+# Users: names and emails must not be stemmed
+USERS_SEARCH_CONFIG = "simple"
+USERS_SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(username, '') || ' ' || "
+    "coalesce(full_name, '') || ' ' || coalesce(email, ''))"
+)
+
+# Projects: descriptions are prose
+PROJECTS_SEARCH_CONFIG = "english"
+PROJECTS_SEARCH_VECTOR = (
+    "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))"
+)
+
+# Shorter queries match nearly every row
+MIN_QUERY_LENGTH = 2
+MAX_QUERY_LENGTH = 200
+
+
+def normalize_query(q: str) -> Optional[str]:
+    """
+    Collapse whitespace; None if the query is too short or too long.
+    """
+    text = " ".join(q.split())
+    if not MIN_QUERY_LENGTH <= len(text) <= MAX_QUERY_LENGTH:
+        return None
+    return text
+
+
+def encode_cursor(rank: float, row_id) -> str:
+    """Opaque token for the row a page ended on"""
+    payload = json.dumps([rank, str(row_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[float, str]:
+    """
+    Read a token produced by encode_cursor.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        rank, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(rank), str(uuid.UUID(row_id))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
@@ -0,0 +1,221 @@
+"""
+==============================================================================
+Production Server Launcher
+==============================================================================
+Location: src/server.py
+Purpose: Multi-worker uvicorn entry point with worker recycling
+Usage: python -m src.server
+==============================================================================
+
+`python -m src.main` is the development server (single process, reload).
+This launcher is for containers:
+
+    - Worker count follows the cgroup CPU quota (compose: cpus: '1.0'),
+      not the host's core count
+    - uvloop / httptools are used when installed
+    - WEB_CONCURRENCY is exported so each worker's asyncpg pool takes only
+      its share of the Postgres connection budget (see src/pool.py)
+    - Each worker exits gracefully after MAX_REQUESTS (+ random jitter) and
+      the supervisor starts a fresh one, capping memory growth
+"""
+
+import importlib.util
+import logging
+import math
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", "8000"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# Requests served by a worker before it is recycled (0 = never)
+MAX_REQUESTS = int(os.getenv("MAX_REQUESTS", "10000"))
+# Random extra requests per worker so they don't all restart together
+MAX_REQUESTS_JITTER = int(os.getenv("MAX_REQUESTS_JITTER", "1000"))
+
+logger = logging.getLogger("src.server")
+
+
+# ==============================================================================
+# SIZING
+# ==============================================================================
+
+def cgroup_cpu_limit(root: str = "/sys/fs/cgroup") -> Optional[float]:
+    """
+    CPU quota of the current container, in cores.
+
+    Reads cgroup v2 (cpu.max) first, then cgroup v1 (cpu.cfs_quota_us).
+
+    Returns:
+        float: Allowed cores (e.g. 1.0 for cpus: '1.0'), or None if unlimited
+    """
+    base = Path(root)
+    try:
+        quota, period = (base / "cpu.max").read_text().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        quota = int((base / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((base / "cpu" / "cpu.cfs_period_us").read_text())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def worker_count(cpu_limit: Optional[float] = None, cpu_count: Optional[int] = None) -> int:
+    """
+    Number of worker processes.
+
+    API_WORKERS / WEB_CONCURRENCY win when set; otherwise one async worker
+    per allowed core.
+    """
+    override = os.getenv("API_WORKERS") or os.getenv("WEB_CONCURRENCY")
+    if override:
+        return max(1, int(override))
+
+    cores = cpu_limit if cpu_limit is not None else cgroup_cpu_limit()
+    if cores is None:
+        cores = cpu_count or os.cpu_count() or 1
+    return max(1, math.ceil(cores))
+
+
+def event_loop() -> str:
+    """uvloop if installed, else the stdlib loop"""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    """httptools if installed, else h11"""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def recycle_limit(max_requests: int, jitter: int) -> Optional[int]:
+    """Per-worker request limit with jitter (None = never recycle)"""
+    if max_requests <= 0:
+        return None
+    return max_requests + random.randint(0, max(jitter, 0))
+
+
+# ==============================================================================
+# SUPERVISOR
+# ==============================================================================
+
+def serve_worker(config_kwargs: Dict[str, Any], sockets: List[socket.socket], limit: Optional[int]) -> None:
+    """Worker process body: serve on the shared socket until recycled"""
+    config = uvicorn.Config(**config_kwargs, limit_max_requests=limit)
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+class Supervisor:
+    """
+    Keep `workers` uvicorn processes running on one shared socket.
+
+    A worker that exits on its own (request limit reached, crash) is
+    replaced; SIGTERM/SIGINT shut every worker down gracefully. SIGHUP is
+    forwarded to every worker (they reload the JWT signing keys).
+    """
+
+    def __init__(self, config_kwargs: Dict[str, Any], workers: int,
+                 max_requests: int, jitter: int):
+        self.config_kwargs = config_kwargs
+        self.workers = workers
+        self.max_requests = max_requests
+        self.jitter = jitter
+        self.processes: List[multiprocessing.Process] = []
+        self.should_exit = False
+        self._context = multiprocessing.get_context("spawn")
+
+    def spawn(self, sockets: List[socket.socket]) -> multiprocessing.Process:
+        """Start one worker"""
+        process = self._context.Process(
+            target=serve_worker,
+            args=(self.config_kwargs, sockets, recycle_limit(self.max_requests, self.jitter)),
+        )
+        process.start()
+        return process
+
+    def handle_exit(self, signum, frame) -> None:
+        self.should_exit = True
+
+    def handle_reload(self, signum, frame) -> None:
+        for process in self.processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGHUP)
+
+    def run(self) -> None:
+        sock = uvicorn.Config(**self.config_kwargs).bind_socket()
+        signal.signal(signal.SIGINT, self.handle_exit)
+        signal.signal(signal.SIGTERM, self.handle_exit)
+        signal.signal(signal.SIGHUP, self.handle_reload)
+
+        self.processes = [self.spawn([sock]) for _ in range(self.workers)]
+        logger.info(f"Started {self.workers} workers (pid {os.getpid()})")
+
+        while not self.should_exit:
+            time.sleep(0.5)
+            for index, process in enumerate(self.processes):
+                if not process.is_alive() and not self.should_exit:
+                    logger.info(f"Worker {process.pid} exited ({process.exitcode}); replacing")
+                    process.join()
+                    self.processes[index] = self.spawn([sock])
+
+        logger.info("Shutting down workers...")
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()  # SIGTERM -> uvicorn graceful shutdown
+        for process in self.processes:
+            process.join()
+        sock.close()
+
+
+# ==============================================================================
+# ENTRY POINT
+# ==============================================================================
+
+def main() -> None:
+    logging.basicConfig(
+        level=getattr(logging, LOG_LEVEL),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    workers = worker_count()
+    # Read by src.main in every worker to split the connection budget
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    config_kwargs = {
+        "app": "src.main:app",
+        "host": API_HOST,
+        "port": API_PORT,
+        "loop": event_loop(),
+        "http": http_protocol(),
+        "log_level": LOG_LEVEL.lower(),
+        "proxy_headers": True,
+    }
+    logger.info(
+        f"Launching {workers} worker(s) with loop={config_kwargs['loop']} "
+        f"http={config_kwargs['http']} max_requests={MAX_REQUESTS}"
+    )
+
+    if workers == 1 and MAX_REQUESTS <= 0:
+        uvicorn.Server(uvicorn.Config(**config_kwargs)).run()
+    else:
+        Supervisor(config_kwargs, workers, MAX_REQUESTS, MAX_REQUESTS_JITTER).run()
+
+
+if __name__ == "__main__":
+    main()
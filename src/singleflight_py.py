@@ -0,0 +1,166 @@
+"""
+==============================================================================
+Single-Flight Request Coalescing
+==============================================================================
+Location: src/singleflight.py
+Purpose: Collapse concurrent identical reads into one in-flight DB call
+==============================================================================
+
+When many requests ask for the same thing at the same moment (a viral user
+page, a hot listing), only the first one ("leader") runs the query. Everyone
+else arriving while that call is in flight awaits the same result.
+
+The shared call belongs to no single request. It runs under the latest of
+its waiters' request deadlines (src/deadlines.py), so a leader with a short
+X-Request-Timeout can't turn every coalesced waiter into a 504. Each waiter
+stops waiting at its own deadline, and when the last waiter leaves
+(deadline, client disconnect) the shared call is cancelled, releasing its
+pool connection.
+
+    flight = SingleFlight(default_timeout=5.0)
+    row = await flight.do(("get_user", user_id), lambda: fetch_user(user_id))
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from src.deadlines import SharedDeadline, current_deadline, remaining, share_deadline
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters describing how much work was coalesced"""
+    calls: int = 0          # Total do() invocations
+    executions: int = 0     # Calls that actually ran the function
+    coalesced: int = 0      # Calls that joined an in-flight execution
+    errors: int = 0         # Executions that raised
+    timeouts: int = 0       # Executions that exceeded their timeout
+    abandoned: int = 0      # Executions cancelled because every waiter left
+
+
+@dataclass
+class _Flight:
+    """One shared execution and how many callers are waiting on it"""
+    task: asyncio.Task
+    deadline: SharedDeadline
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent async calls by key.
+
+    Guarantees:
+        - At most one execution per key is in flight at any time
+        - The result (or exception) is delivered to every waiter
+        - Each execution is bounded by a per-key timeout
+        - A waiter being cancelled (e.g. client disconnect) or reaching its
+          own request deadline does not cancel the shared execution for
+          the others; once no waiter is left, the execution is cancelled
+        - The execution runs under the latest of its callers' request
+          deadlines
+
+    Args:
+        default_timeout: Seconds before an execution is abandoned with
+            asyncio.TimeoutError (None = no limit)
+    """
+
+    def __init__(self, default_timeout: Optional[float] = None):
+        self.default_timeout = default_timeout
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._stats = SingleFlightStats()
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Run `fn` once per key, sharing the outcome with concurrent callers.
+
+        Args:
+            key: Identity of the request (must be hashable)
+            fn: Zero-argument coroutine factory doing the actual work
+            timeout: Override of default_timeout for this key
+
+        Returns:
+            Whatever `fn` returned
+
+        Raises:
+            asyncio.TimeoutError: If the execution exceeded its timeout, or
+                this caller's request deadline passed while waiting
+            DeadlineExceeded: If this caller's deadline had already passed
+            Exception: Any exception raised by `fn`, re-raised in every waiter
+        """
+        self._stats.calls += 1
+        flight = self._inflight.get(key)
+
+        if flight is None:
+            self._stats.executions += 1
+            limit = self.default_timeout if timeout is None else timeout
+            deadline = SharedDeadline(current_deadline())
+            flight = _Flight(asyncio.ensure_future(self._execute(fn, limit, deadline)), deadline)
+            self._inflight[key] = flight
+            flight.task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        else:
+            self._stats.coalesced += 1
+            flight.deadline.extend(current_deadline())
+
+        flight.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight.task), remaining())
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self._abandon(key, flight)
+
+    async def _execute(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float],
+        deadline: SharedDeadline,
+    ) -> Any:
+        """Run the shared call under its timeout and its waiters' shared deadline"""
+        share_deadline(deadline)   # this task's own context copy
+        try:
+            if timeout is None:
+                return await fn()
+            return await asyncio.wait_for(fn(), timeout)
+        except asyncio.TimeoutError:
+            self._stats.timeouts += 1
+            raise
+        except Exception:
+            self._stats.errors += 1
+            raise
+
+    def _abandon(self, key: Hashable, flight: _Flight) -> None:
+        """Cancel an execution nobody is waiting for any more"""
+        self._stats.abandoned += 1
+        # Forget it now so a caller arriving before the task unwinds starts fresh
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        flight.task.cancel()
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget the finished execution so the next call starts fresh"""
+        flight = self._inflight.get(key)
+        if flight is not None and flight.task is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def inflight(self) -> int:
+        """Number of keys currently being executed"""
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of counters plus the current in-flight count"""
+        return {**asdict(self._stats), "inflight": self.inflight}
+
+    def reset_stats(self) -> None:
+        """Zero all counters"""
+        self._stats = SingleFlightStats()
@@ -0,0 +1,232 @@
+"""
+==============================================================================
+Request Tracing & Server-Timing
+==============================================================================
+Location: src/tracing.py
+Purpose: Break each request's time down into spans (pool acquire, query,
+         model construction, encoding) and report them to the client,
+         the access log and an optional JSONL trace file
+==============================================================================
+
+A Trace lives in a context variable for the duration of one request. Code
+anywhere below the middleware adds spans without passing anything around:
+
+    with span("query"):
+        rows = await conn.fetch(...)
+
+Repeated spans (several queries in one request) are summed. The totals go
+out in the `Server-Timing` response header, which browsers' dev tools and
+most load-testing tools display directly:
+
+    Server-Timing: acquire;dur=0.41, query;dur=3.02, models;dur=0.88, total;dur=4.9
+
+Tasks started during the request (coalesced reads, batch flushes) inherit the
+context and record into the trace of the request that started them.
+"""
+
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("request_trace", default=None)
+
+
+class Trace:
+    """Spans recorded for one request"""
+
+    __slots__ = ("trace_id", "method", "path", "started_at", "start", "spans", "status_code")
+
+    def __init__(self, method: str = "", path: str = ""):
+        self.trace_id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.started_at = datetime.utcnow()
+        self.start = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []   # (name, offset, duration) seconds
+        self.status_code: Optional[int] = None
+
+    def add(self, name: str, started: float, duration: float) -> None:
+        """Record a span that began at perf_counter() value `started`"""
+        self.spans.append((name, started - self.start, duration))
+
+    def elapsed(self) -> float:
+        """Seconds since the request entered the tracing middleware"""
+        return time.perf_counter() - self.start
+
+    def totals(self) -> Dict[str, float]:
+        """Summed duration (seconds) per span name, in first-seen order"""
+        totals: Dict[str, float] = {}
+        for name, _, duration in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in milliseconds)"""
+        metrics = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.totals().items()]
+        metrics.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(metrics)
+
+    def fields(self) -> Dict[str, Any]:
+        """Flat structured fields for log records"""
+        fields = {f"{name}_ms": round(seconds * 1000, 3) for name, seconds in self.totals().items()}
+        fields["total_ms"] = round(self.elapsed() * 1000, 3)
+        fields["trace_id"] = self.trace_id
+        return fields
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Full trace for the exporter"""
+        return {
+            "trace_id": self.trace_id,
+            "timestamp": self.started_at.isoformat(),
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": round(self.elapsed() * 1000, 3),
+            "spans": [
+                {"name": name, "offset_ms": round(offset * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+                for name, offset, duration in self.spans
+            ],
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    """Trace of the request being handled, or None outside a request"""
+    return _current.get()
+
+
+def record(name: str, started: float) -> None:
+    """Close a span that began at perf_counter() value `started` (no-op outside a request)"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, started, time.perf_counter() - started)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as span `name` of the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, started)
+
+
+class TracedJSONResponse(JSONResponse):
+    """JSONResponse whose body rendering is recorded as the "encode" span"""
+
+    def render(self, content: Any) -> bytes:
+        with span("encode"):
+            return super().render(content)
+
+
+# ==============================================================================
+# EXPORT
+# ==============================================================================
+
+class JsonlTraceExporter:
+    """
+    Append sampled traces to a JSONL file from a background thread.
+
+    The request path only enqueues a dict; file I/O never runs on the
+    event loop.
+
+    Args:
+        path: Output file (appended to)
+        sample_rate: Fraction of requests exported (0.0 - 1.0)
+    """
+
+    def __init__(self, path: str, sample_rate: float = 0.01):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.exported = 0
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    def sampled(self) -> bool:
+        """Whether the current request should be exported"""
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def export(self, trace: Trace) -> None:
+        """Queue a finished trace for writing"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._write_loop, name="trace-exporter", daemon=True)
+            self._thread.start()
+        self._queue.put(trace.to_dict())
+        self.exported += 1
+
+    def _write_loop(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as out:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                try:
+                    out.write(json.dumps(item) + "\n")
+                    if self._queue.empty():
+                        out.flush()
+                except (OSError, TypeError, ValueError) as e:
+                    logger.error(f"Trace export failed: {e}")
+
+    def close(self) -> None:
+        """Flush queued traces and stop the writer thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+# ==============================================================================
+# MIDDLEWARE
+# ==============================================================================
+
+class TracingMiddleware:
+    """
+    ASGI middleware starting a Trace per HTTP request.
+
+    Adds the Server-Timing header to the response and hands sampled traces
+    to the exporter once the response is complete.
+
+    Args:
+        app: Wrapped ASGI application
+        exporter: Optional JsonlTraceExporter
+    """
+
+    def __init__(self, app, exporter: Optional[JsonlTraceExporter] = None):
+        self.app = app
+        self.exporter = exporter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(scope.get("method", ""), scope["path"])
+        token = _current.set(trace)
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                trace.status_code = message["status"]
+                message.setdefault("headers", [])
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if self.exporter is not None and self.exporter.sampled():
+                self.exporter.export(trace)
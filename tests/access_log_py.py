@@ -0,0 +1,154 @@
+"""
+==============================================================================
+Unit Tests for Access Logging
+==============================================================================
+Location: tests/test_access_log.py
+Purpose: Verify sampling rules, the logfmt line format and queued output
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import io
+import logging
+import pytest
+
+from src import access_log as access_log_module
+from src.access_log import AccessLog, AccessLogMiddleware, configure_queue_logging, logfmt
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+class ListHandler(logging.Handler):
+    """Collects emitted records"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_access_log(**kwargs):
+    """AccessLog writing to a private, non-propagating logger"""
+    logger = logging.getLogger(f"test.access.{id(kwargs)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = ListHandler()
+    logger.handlers = [handler]
+    return AccessLog(logger=logger, **kwargs), handler
+
+
+def run_request(access_log, app, path="/users"):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": path, "client": ("10.0.0.7", 5000)}
+    asyncio.run(AccessLogMiddleware(app, access_log)(scope, receive, send))
+
+
+def responding(status_code):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status_code, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+# ==============================================================================
+# SECTION 1: FORMAT
+# ==============================================================================
+
+class TestLogfmt:
+    """Tests for the line format"""
+
+    def test_plain_values(self):
+        """Test simple key=value output in insertion order"""
+        assert logfmt({"method": "GET", "status": 200}) == "method=GET status=200"
+
+    def test_values_needing_quotes(self):
+        """Test spaces, quotes and empties are JSON-quoted; None is '-'"""
+        line = logfmt({"a": "x y", "b": 'say "hi"', "c": "", "d": None})
+        assert line == 'a="x y" b="say \\"hi\\"" c="" d=-'
+
+
+# ==============================================================================
+# SECTION 2: SAMPLING
+# ==============================================================================
+
+class TestSampling:
+    """Tests for which requests get logged"""
+
+    def test_successful_requests_are_sampled(self):
+        """Test sample_rate=0 drops ordinary requests"""
+        access_log, handler = make_access_log(sample_rate=0.0)
+        run_request(access_log, responding(200))
+
+        assert handler.records == []
+        assert access_log.stats()["sampled_out"] == 1
+
+    def test_server_errors_always_logged(self):
+        """Test 5xx responses bypass sampling"""
+        access_log, handler = make_access_log(sample_rate=0.0)
+        run_request(access_log, responding(503))
+
+        assert handler.records[0].levelno == logging.ERROR
+        assert "status=503" in handler.records[0].getMessage()
+
+    def test_slow_requests_always_logged(self):
+        """Test requests over the threshold bypass sampling"""
+        access_log, handler = make_access_log(sample_rate=0.0, slow_threshold=0.0)
+        run_request(access_log, responding(200))
+
+        assert handler.records[0].levelno == logging.WARNING
+
+    def test_line_fields(self):
+        """Test the stable leading fields and the structured copy"""
+        access_log, handler = make_access_log(sample_rate=1.0)
+        run_request(access_log, responding(200))
+
+        record = handler.records[0]
+        assert record.getMessage().startswith("method=GET path=/users status=200 duration_ms=")
+        assert record.access["client"] == "10.0.0.7"
+        assert record.access["sample_rate"] == 1.0
+
+    def test_unhandled_exception_logged_as_500(self):
+        """Test a crashing handler is still logged"""
+        async def app(scope, receive, send):
+            raise RuntimeError("boom")
+
+        access_log, handler = make_access_log(sample_rate=0.0)
+        with pytest.raises(RuntimeError):
+            run_request(access_log, app)
+
+        assert handler.records[0].access["status"] == 500
+
+
+# ==============================================================================
+# SECTION 3: QUEUED OUTPUT
+# ==============================================================================
+
+class TestQueueLogging:
+    """Tests for the QueueHandler/QueueListener pipeline"""
+
+    def test_records_are_written_by_listener(self, monkeypatch):
+        """Test the root logger only enqueues; the listener writes"""
+        root = logging.getLogger()
+        monkeypatch.setattr(access_log_module, "_listener", None)
+        monkeypatch.setattr(root, "handlers", list(root.handlers))
+        monkeypatch.setattr(root, "level", root.level)
+
+        stream = io.StringIO()
+        listener = configure_queue_logging("INFO", "%(levelname)s %(message)s", stream)
+        try:
+            assert type(root.handlers[0]).__name__ == "QueueHandler"
+            logging.getLogger("test.queue").info("hello")
+        finally:
+            listener.stop()
+
+        assert stream.getvalue() == "INFO hello\n"
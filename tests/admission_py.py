@@ -0,0 +1,211 @@
+"""
+==============================================================================
+Unit Tests for Admission Control & Load Shedding
+==============================================================================
+Location: tests/test_admission.py
+Purpose: Verify concurrency limits, priority queueing and fast 503s
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import pytest
+
+from src.admission import AdmissionController, AdmissionControlMiddleware, RequestShed
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+PRIORITIES = [("/health", 0), ("/users/", 1), ("/users", 2), ("/projects", 2)]
+
+
+def make_controller(**kwargs):
+    """Controller with one slot and the app's route priorities"""
+    options = {"max_concurrency": 1, "max_queue": 10, "wait_budget": 1.0,
+               "priorities": PRIORITIES}
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+# ==============================================================================
+# SECTION 1: PRIORITIES
+# ==============================================================================
+
+class TestPriorities:
+    """Tests for route priority lookup"""
+    
+    @pytest.mark.parametrize("path,expected", [
+        ("/health", 0),
+        ("/health/ready", 0),
+        ("/users", 2),
+        ("/users/123", 1),
+        ("/projects", 2),
+        ("/healthz", 1),   # not under /health
+        ("/", 1),
+    ])
+    def test_priority_for(self, path, expected):
+        """Test longest-prefix priority matching"""
+        assert make_controller().priority_for(path) == expected
+
+
+# ==============================================================================
+# SECTION 2: ADMISSION & SHEDDING
+# ==============================================================================
+
+class TestAdmission:
+    """Tests for queueing and shedding"""
+    
+    def test_higher_priority_is_admitted_first(self):
+        """Test a queued health check overtakes queued listings"""
+        controller = make_controller()
+        order = []
+        
+        async def request(priority, name):
+            await controller.acquire(priority)
+            order.append(name)
+            await asyncio.sleep(0.01)
+            controller.release(0.01)
+        
+        async def scenario():
+            await controller.acquire(2)           # occupy the only slot
+            tasks = [asyncio.ensure_future(request(2, "listing")),
+                     asyncio.ensure_future(request(0, "health"))]
+            await asyncio.sleep(0)
+            controller.release(0.01)
+            await asyncio.gather(*tasks)
+        
+        asyncio.run(scenario())
+        assert order == ["health", "listing"]
+    
+    def test_queue_full_sheds(self):
+        """Test requests beyond the queue bound are rejected immediately"""
+        controller = make_controller(max_queue=1)
+        
+        async def scenario():
+            await controller.acquire(2)
+            queued = asyncio.ensure_future(controller.acquire(2))
+            await asyncio.sleep(0)
+            with pytest.raises(RequestShed) as shed:
+                await controller.acquire(2)
+            queued.cancel()
+            return shed.value.reason
+        
+        assert asyncio.run(scenario()) == "queue_full"
+        assert controller.stats()["shed_by_reason"] == {"queue_full": 1}
+    
+    def test_high_priority_displaces_low_priority(self):
+        """Test a health check evicts a queued listing when the queue is full"""
+        controller = make_controller(max_queue=1)
+        
+        async def scenario():
+            await controller.acquire(2)
+            listing = asyncio.ensure_future(controller.acquire(2))
+            await asyncio.sleep(0)
+            health = asyncio.ensure_future(controller.acquire(0))
+            await asyncio.sleep(0)
+            controller.release(0.01)
+            await health
+            with pytest.raises(RequestShed) as shed:
+                await listing
+            return shed.value.reason
+        
+        assert asyncio.run(scenario()) == "displaced"
+    
+    def test_expected_wait_over_budget_sheds(self):
+        """Test slow service times shed new arrivals up front"""
+        controller = make_controller(wait_budget=0.1)
+        
+        async def scenario():
+            await controller.acquire(2)
+            controller.release(0.5)               # service time ~500 ms
+            await controller.acquire(2)
+            with pytest.raises(RequestShed) as shed:
+                await controller.acquire(2)
+            return shed.value
+        
+        shed = asyncio.run(scenario())
+        assert shed.reason == "wait_budget"
+        assert shed.retry_after >= 0.5
+    
+    def test_wait_timeout_sheds(self):
+        """Test a queued request gives up after the wait budget"""
+        controller = make_controller(wait_budget=0.02)
+        
+        async def scenario():
+            await controller.acquire(2)
+            with pytest.raises(RequestShed) as shed:
+                await controller.acquire(2)
+            return shed.value.reason
+        
+        assert asyncio.run(scenario()) == "timeout"
+        assert controller.stats()["queued"] == 0
+    
+    def test_callable_limit(self):
+        """Test the limit can follow an external value (pool size)"""
+        size = {"value": 3}
+        controller = make_controller(max_concurrency=lambda: size["value"])
+        assert controller.limit == 3
+        size["value"] = 5
+        assert controller.limit == 5
+
+
+# ==============================================================================
+# SECTION 3: MIDDLEWARE
+# ==============================================================================
+
+class TestMiddleware:
+    """Tests for the ASGI wrapper"""
+    
+    def test_shed_request_gets_503_with_retry_after(self):
+        """Test a shed request is answered without reaching the app"""
+        controller = make_controller(wait_budget=0)
+        controller.in_flight = 1  # saturated
+        reached = []
+        
+        async def app(scope, receive, send):
+            reached.append(scope["path"])
+        
+        messages = []
+        
+        async def send(message):
+            messages.append(message)
+        
+        middleware = AdmissionControlMiddleware(app, controller)
+        asyncio.run(middleware({"type": "http", "path": "/users", "headers": []}, None, send))
+        
+        assert reached == []
+        start = messages[0]
+        assert start["status"] == 503
+        assert (b"retry-after", b"1") in start["headers"]
+    
+    def test_exempt_paths_bypass_a_saturated_controller(self):
+        """Test exempt paths reach the app without taking a slot"""
+        controller = make_controller(wait_budget=0, exempt=["/health"])
+        controller.in_flight = 1  # saturated
+        reached = []
+        
+        async def app(scope, receive, send):
+            reached.append(scope["path"])
+        
+        middleware = AdmissionControlMiddleware(app, controller)
+        asyncio.run(middleware({"type": "http", "path": "/health/live", "headers": []}, None, None))
+        
+        assert reached == ["/health/live"]
+        assert controller.in_flight == 1
+        assert controller.stats()["exempted"] == 1
+    
+    def test_long_running_paths_skip_service_time(self):
+        """Test an export's duration doesn't inflate the wait estimate"""
+        controller = make_controller(long_running=["/users/export"])
+        
+        async def app(scope, receive, send):
+            await asyncio.sleep(0.05)
+        
+        middleware = AdmissionControlMiddleware(app, controller)
+        asyncio.run(middleware({"type": "http", "path": "/users/export", "headers": []}, None, None))
+        assert controller.stats()["avg_service_ms"] == 0
+        
+        asyncio.run(middleware({"type": "http", "path": "/users", "headers": []}, None, None))
+        assert controller.stats()["avg_service_ms"] > 0
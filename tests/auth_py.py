@@ -0,0 +1,132 @@
+"""
+==============================================================================
+Unit Tests for JWT Verification and the Claims Cache
+==============================================================================
+Location: tests/test_auth.py
+Purpose: Verify token validation, cache expiry, bounds and key rotation
+Framework: pytest
+==============================================================================
+"""
+
+import time
+import pytest
+from unittest.mock import patch
+from jose import jwt
+
+from src.auth import InvalidTokenError, TokenCache, TokenVerifier
+
+SECRET = "test-secret"
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+def make_token(secret=SECRET, ttl=3600, **claims):
+    """Sign an HS256 token expiring `ttl` seconds from now"""
+    payload = {"sub": "user-1", "exp": int(time.time()) + ttl, **claims}
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+class FakeClock:
+    """Controllable time source"""
+    
+    def __init__(self):
+        self.now = time.time()
+    
+    def __call__(self):
+        return self.now
+
+
+# ==============================================================================
+# SECTION 1: VERIFICATION
+# ==============================================================================
+
+class TestTokenVerifier:
+    """Tests for signature verification and caching"""
+    
+    def test_valid_token_returns_claims(self):
+        """Test a correctly signed token verifies"""
+        verifier = TokenVerifier(SECRET)
+        assert verifier.verify(make_token(role="admin"))["role"] == "admin"
+    
+    @pytest.mark.parametrize("token", [
+        make_token(secret="other-secret"),
+        make_token(ttl=-10),
+        "not-a-jwt",
+    ])
+    def test_invalid_tokens_raise(self, token):
+        """Test bad signature, expiry and garbage are rejected"""
+        with pytest.raises(InvalidTokenError):
+            TokenVerifier(SECRET).verify(token)
+    
+    def test_repeat_verification_hits_cache(self):
+        """Test the signature is checked only once per token"""
+        verifier = TokenVerifier(SECRET)
+        token = make_token()
+        
+        with patch("src.auth.jwt.decode", wraps=jwt.decode) as decode:
+            for _ in range(5):
+                verifier.verify(token)
+        
+        assert decode.call_count == 1
+        assert verifier.stats()["hits"] == 4
+    
+    def test_cache_entry_expires_with_token(self):
+        """Test a cached token is re-verified once past its exp"""
+        clock = FakeClock()
+        verifier = TokenVerifier(SECRET, clock=clock)
+        token = make_token(ttl=60)
+        
+        with patch("src.auth.jwt.decode", wraps=jwt.decode) as decode:
+            verifier.verify(token)
+            clock.now += 30
+            verifier.verify(token)
+            clock.now += 60
+            verifier.verify(token)
+        
+        assert decode.call_count == 2
+        assert verifier.stats()["expired"] == 1
+    
+    def test_rotation_clears_cache(self):
+        """Test rotating keys invalidates tokens signed with the old key"""
+        verifier = TokenVerifier(SECRET)
+        old_token = make_token()
+        verifier.verify(old_token)
+        
+        verifier.rotate_keys("new-secret")
+        
+        assert verifier.stats()["size"] == 0
+        with pytest.raises(InvalidTokenError):
+            verifier.verify(old_token)
+        assert verifier.verify(make_token(secret="new-secret"))["sub"] == "user-1"
+    
+    def test_rotation_overlap_accepts_both_keys(self):
+        """Test several keys can be accepted during a rotation window"""
+        verifier = TokenVerifier([SECRET, "next-secret"])
+        verifier.verify(make_token())
+        verifier.verify(make_token(secret="next-secret"))
+
+
+# ==============================================================================
+# SECTION 2: CACHE BOUNDS
+# ==============================================================================
+
+class TestTokenCache:
+    """Tests for the bounded LRU"""
+    
+    def test_evicts_least_recently_used(self):
+        """Test the cache never exceeds max_size"""
+        cache = TokenCache(max_size=2)
+        far = time.time() + 3600
+        a, b, c = (TokenCache.digest(t) for t in ("a", "b", "c"))
+        
+        cache.put(a, {"sub": "a"}, far)
+        cache.put(b, {"sub": "b"}, far)
+        cache.get(a)
+        cache.put(c, {"sub": "c"}, far)
+        
+        assert len(cache) == 2
+        assert cache.get(b) is None
+        assert cache.get(a) == {"sub": "a"}
+        assert cache.stats.evictions == 1
@@ -0,0 +1,102 @@
+"""
+==============================================================================
+Unit Tests for Batched Sub-Requests
+==============================================================================
+Location: tests/test_batch.py
+Purpose: Verify concurrent dispatch, the concurrency cap and per-item errors
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import json
+
+from starlette.responses import JSONResponse
+
+from src.batch import SubRequestDispatcher
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+PARENT = {
+    "type": "http", "method": "POST", "path": "/batch", "query_string": b"",
+    "headers": [(b"authorization", b"Bearer t"), (b"cookie", b"secret"),
+                (b"content-type", b"application/json")],
+}
+
+
+class EchoApp:
+    """ASGI app answering with what it saw, tracking peak concurrency"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, scope, receive, send):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if scope["path"] == "/boom":
+                raise RuntimeError("boom")
+            response = JSONResponse(
+                {"path": scope["path"], "query": scope["query_string"].decode(),
+                 "headers": sorted(name.decode() for name, _ in scope["headers"])},
+                headers={"X-Total-Count": "7"}
+            )
+            await response(scope, receive, send)
+        finally:
+            self.running -= 1
+
+
+def dispatch(dispatcher, paths):
+    return asyncio.run(dispatcher.dispatch(PARENT, paths))
+
+
+# ==============================================================================
+# SECTION 1: DISPATCH
+# ==============================================================================
+
+class TestDispatch:
+    """Tests for SubRequestDispatcher"""
+
+    def test_results_in_order_with_forwarded_auth_only(self):
+        """Test sub-requests see their own path/query and only forwarded headers"""
+        first, second = dispatch(SubRequestDispatcher(EchoApp()), ["/users/1", "/projects?limit=5"])
+
+        assert first.status == 200
+        assert first.body["path"] == "/users/1"
+        assert second.body["query"] == "limit=5"
+        assert second.body["headers"] == ["authorization"]
+        assert second.headers["x-total-count"] == "7"
+
+    def test_concurrency_is_capped(self):
+        """Test no more than max_concurrency sub-requests run at once"""
+        app = EchoApp(delay=0.01)
+
+        dispatch(SubRequestDispatcher(app, max_concurrency=3), [f"/users/{i}" for i in range(10)])
+
+        assert app.peak == 3
+
+    def test_failure_is_isolated_to_its_item(self):
+        """Test an unhandled error becomes that item's 500 via the error handler"""
+        async def handler(request, exc):
+            return JSONResponse({"error": str(exc)}, status_code=500)
+
+        ok, failed = dispatch(SubRequestDispatcher(EchoApp(), error_handler=handler), ["/a", "/boom"])
+
+        assert ok.status == 200
+        assert (failed.status, failed.body) == (500, {"error": "boom"})
+
+    def test_excluded_and_foreign_paths_are_rejected(self):
+        """Test recursion, streams and absolute URLs never reach the app"""
+        app = EchoApp()
+        dispatcher = SubRequestDispatcher(app, excluded=["/batch", "/users/export"])
+
+        results = dispatch(dispatcher, ["/batch", "/users/export?format=csv", "http://evil/x", "users"])
+
+        assert [result.status for result in results] == [400] * 4
+        assert app.peak == 0
@@ -0,0 +1,133 @@
+"""
+==============================================================================
+Unit Tests for DataLoader-Style Micro-Batching
+==============================================================================
+Location: tests/test_batching.py
+Purpose: Verify loads in the same tick/window are merged and fanned out
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import pytest
+
+from src.batching import BatchLoader
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+def recording_batch_fn(error=None):
+    """Return (batch_fn, batches) where batches records each key list"""
+    batches = []
+    
+    async def batch_fn(keys, context):
+        batches.append(list(keys))
+        if error is not None:
+            raise error
+        return {key: f"value-{key}" for key in keys if key != "missing"}
+    
+    return batch_fn, batches
+
+
+# ==============================================================================
+# SECTION 1: BATCHING
+# ==============================================================================
+
+class TestBatching:
+    """Tests for merging loads into batches"""
+    
+    def test_same_tick_loads_share_one_batch(self):
+        """Test loads issued together are resolved by one call"""
+        batch_fn, batches = recording_batch_fn()
+        loader = BatchLoader(batch_fn, window=0)
+        
+        async def scenario():
+            return await asyncio.gather(*(loader.load(k) for k in ["a", "b", "c"]))
+        
+        assert asyncio.run(scenario()) == ["value-a", "value-b", "value-c"]
+        assert batches == [["a", "b", "c"]]
+        assert loader.stats()["avg_batch_size"] == 3
+    
+    def test_window_collects_late_arrivals(self):
+        """Test a load arriving inside the window joins the batch"""
+        batch_fn, batches = recording_batch_fn()
+        loader = BatchLoader(batch_fn, window=0.05)
+        
+        async def late(key):
+            await asyncio.sleep(0.005)
+            return await loader.load(key)
+        
+        async def scenario():
+            return await asyncio.gather(loader.load("a"), late("b"))
+        
+        asyncio.run(scenario())
+        assert batches == [["a", "b"]]
+    
+    def test_duplicate_keys_are_sent_once(self):
+        """Test repeated keys in a batch are deduplicated"""
+        batch_fn, batches = recording_batch_fn()
+        loader = BatchLoader(batch_fn, window=0)
+        
+        async def scenario():
+            return await asyncio.gather(loader.load("a"), loader.load("a"))
+        
+        assert asyncio.run(scenario()) == ["value-a", "value-a"]
+        assert batches == [["a"]]
+    
+    def test_max_batch_size_flushes_early(self):
+        """Test a full batch is dispatched without waiting for the window"""
+        batch_fn, batches = recording_batch_fn()
+        loader = BatchLoader(batch_fn, window=10, max_batch_size=2)
+        
+        async def scenario():
+            return await asyncio.wait_for(
+                asyncio.gather(loader.load("a"), loader.load("b")), timeout=1
+            )
+        
+        asyncio.run(scenario())
+        assert batches == [["a", "b"]]
+    
+    def test_contexts_are_batched_separately(self):
+        """Test loads for different contexts never share a batch"""
+        batch_fn, batches = recording_batch_fn()
+        loader = BatchLoader(batch_fn, window=0)
+        
+        async def scenario():
+            await asyncio.gather(loader.load("a", "pool-1"), loader.load("b", "pool-2"))
+        
+        asyncio.run(scenario())
+        assert sorted(batches) == [["a"], ["b"]]
+
+
+# ==============================================================================
+# SECTION 2: RESULTS & ERRORS
+# ==============================================================================
+
+class TestResults:
+    """Tests for fanning results and errors back out"""
+    
+    def test_missing_key_loads_none(self):
+        """Test keys absent from the batch result resolve to None"""
+        batch_fn, _ = recording_batch_fn()
+        loader = BatchLoader(batch_fn, window=0)
+        
+        async def scenario():
+            return await asyncio.gather(loader.load("a"), loader.load("missing"))
+        
+        assert asyncio.run(scenario()) == ["value-a", None]
+    
+    def test_error_reaches_every_caller(self):
+        """Test a failing batch raises in all waiting callers"""
+        batch_fn, _ = recording_batch_fn(error=RuntimeError("db down"))
+        loader = BatchLoader(batch_fn, window=0)
+        
+        async def scenario():
+            return await asyncio.gather(
+                loader.load("a"), loader.load("b"), return_exceptions=True
+            )
+        
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert loader.stats()["errors"] == 1
@@ -0,0 +1,190 @@
+"""
+==============================================================================
+Unit Tests for Response Compression
+==============================================================================
+Location: tests/test_compression.py
+Purpose: Verify encoding negotiation, the size threshold, streaming gzip and
+         the compressed-page cache
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import gzip
+import json
+import zlib
+
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from src.compression import (
+    CompressedCache,
+    CompressionMiddleware,
+    CompressionPolicy,
+    negotiate,
+)
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+BIG = {"users": [{"id": i, "username": f"user{i}", "is_active": True} for i in range(200)]}
+
+
+def call(app, accept_encoding="gzip"):
+    """Run one GET through `app`; return (status, headers, body chunks)"""
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    scope = {"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": headers}
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()   # no disconnect
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    headers = {name.decode(): value.decode() for name, value in start["headers"]}
+    return start["status"], headers, [m.get("body", b"") for m in messages[1:]]
+
+
+def wrap(response, **policy_options):
+    policy = CompressionPolicy(**policy_options)
+    return CompressionMiddleware(response, policy), policy
+
+
+# ==============================================================================
+# SECTION 1: NEGOTIATION
+# ==============================================================================
+
+class TestNegotiate:
+    """Tests for negotiate()"""
+
+    def test_server_preference_breaks_ties(self):
+        """Test equal q-values pick the first available encoding"""
+        assert negotiate("gzip, br, zstd", ["zstd", "br", "gzip"]) == "zstd"
+
+    def test_q_values_win(self):
+        """Test a higher client q-value beats server preference"""
+        assert negotiate("zstd;q=0.5, gzip", ["zstd", "gzip"]) == "gzip"
+
+    def test_refused_and_unknown(self):
+        """Test q=0, unsupported codings and wildcards"""
+        assert negotiate("gzip;q=0", ["gzip"]) is None
+        assert negotiate("deflate", ["gzip"]) is None
+        assert negotiate("*", ["br", "gzip"]) == "br"
+        assert negotiate("identity", ["gzip"]) is None
+
+
+# ==============================================================================
+# SECTION 2: MIDDLEWARE
+# ==============================================================================
+
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware"""
+
+    def test_large_json_is_gzipped(self):
+        """Test a body over the threshold is compressed with correct headers"""
+        app, policy = wrap(JSONResponse(BIG))
+
+        status, headers, chunks = call(app)
+
+        assert status == 200
+        assert headers["content-encoding"] == "gzip"
+        assert headers["vary"] == "Accept-Encoding"
+        assert int(headers["content-length"]) == len(chunks[0])
+        assert json.loads(gzip.decompress(chunks[0])) == BIG
+        assert policy.stats()["ratio"] > 2
+
+    def test_small_body_is_sent_as_is(self):
+        """Test bodies under minimum_size skip compression"""
+        app, policy = wrap(JSONResponse({"ok": True}))
+
+        _, headers, chunks = call(app)
+
+        assert "content-encoding" not in headers
+        assert headers["vary"] == "Accept-Encoding"
+        assert chunks == [b'{"ok":true}']
+        assert policy.skipped_small == 1
+
+    def test_identity_and_binary_pass_through(self):
+        """Test no Accept-Encoding, or a non-text type, means no compression"""
+        app, _ = wrap(JSONResponse(BIG))
+        _, headers, _ = call(app, accept_encoding="")
+        assert "content-encoding" not in headers
+
+        app, _ = wrap(PlainTextResponse("x" * 5000, media_type="image/png"))
+        _, headers, chunks = call(app)
+        assert "content-encoding" not in headers
+        assert chunks == [b"x" * 5000]
+
+    def test_large_body_is_compressed_in_a_thread(self, monkeypatch):
+        """Test bodies over offload_size are handed to a worker thread"""
+        app, _ = wrap(JSONResponse(BIG), offload_size=1000)
+        offloaded = []
+        to_thread = asyncio.to_thread
+
+        async def tracking_to_thread(function, *args):
+            offloaded.append(len(args[0]))
+            return await to_thread(function, *args)
+
+        monkeypatch.setattr(asyncio, "to_thread", tracking_to_thread)
+        _, _, chunks = call(app)
+
+        assert len(offloaded) == 1 and offloaded[0] >= 1000
+        assert json.loads(gzip.decompress(chunks[0])) == BIG
+
+    def test_stream_is_gzipped_per_chunk(self):
+        """Test streamed bodies are gzipped incrementally without Content-Length"""
+        lines = [json.dumps({"id": i}).encode() + b"\n" for i in range(50)]
+
+        async def rows():
+            for line in lines:
+                yield line
+
+        app, _ = wrap(StreamingResponse(rows(), media_type="application/x-ndjson"))
+
+        _, headers, chunks = call(app, accept_encoding="br, gzip")
+
+        assert headers["content-encoding"] == "gzip"
+        assert "content-length" not in headers
+        assert zlib.decompress(b"".join(chunks), 31) == b"".join(lines)
+
+
+# ==============================================================================
+# SECTION 3: COMPRESSED PAGE CACHE
+# ==============================================================================
+
+class TestCompressedCache:
+    """Tests for CompressedCache and its use by the policy"""
+
+    def test_repeated_page_is_not_recompressed(self):
+        """Test the second identical body is served from the cache"""
+        policy = CompressionPolicy(cache=CompressedCache())
+        compressions = []
+        original = policy.codecs["gzip"]
+        policy.codecs["gzip"] = lambda data: compressions.append(1) or original(data)
+        body = json.dumps(BIG).encode()
+
+        first = asyncio.run(policy.compress(body, "gzip"))
+        second = asyncio.run(policy.compress(body, "gzip"))
+
+        assert first == second
+        assert len(compressions) == 1
+        assert policy.cache.stats()["hits"] == 1
+
+    def test_byte_budget_evicts_oldest(self):
+        """Test entries are evicted least-recently-used past max_bytes"""
+        cache = CompressedCache(max_bytes=10)
+        cache.put(("gzip", b"a"), b"12345")
+        cache.put(("gzip", b"b"), b"12345")
+        cache.get(("gzip", b"a"))
+        cache.put(("gzip", b"c"), b"12345")
+
+        assert cache.get(("gzip", b"b")) is None
+        assert cache.get(("gzip", b"a")) == b"12345"
+        assert cache.stats()["bytes"] == 10
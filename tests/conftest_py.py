@@ -0,0 +1,16 @@
+"""
+==============================================================================
+Shared Pytest Configuration
+==============================================================================
+Location: tests/conftest.py
+Purpose: Register the custom markers used across the test files
+==============================================================================
+"""
+
+
+def pytest_configure(config):
+    """Register markers so pytest doesn't warn about them (or fail --strict-markers)"""
+    config.addinivalue_line(
+        "markers", "integration: needs running services such as Postgres (pytest -m integration)"
+    )
+    config.addinivalue_line("markers", "slow: long-running tests (pytest -m 'not slow' skips them)")
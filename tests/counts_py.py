@@ -0,0 +1,140 @@
+"""
+==============================================================================
+Unit Tests for Total Counts
+==============================================================================
+Location: tests/test_counts.py
+Purpose: Verify exact-vs-estimate selection, caching and EXPLAIN parsing
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import pytest
+
+from src.counts import CountService, TotalCount, plan_rows
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Table:
+    """Counting callables that record how often they ran"""
+
+    def __init__(self, estimate, exact):
+        self.calls = []
+        self._estimate = estimate
+        self._exact = exact
+
+    async def estimate(self):
+        self.calls.append("estimate")
+        return self._estimate
+
+    async def exact(self):
+        self.calls.append("exact")
+        return self._exact
+
+
+def count(service, table, key="users"):
+    return asyncio.run(service.count(key, table.estimate, table.exact))
+
+
+# ==============================================================================
+# SECTION 1: EXACT VS ESTIMATE
+# ==============================================================================
+
+class TestCountSelection:
+    """Tests for choosing between count(*) and the planner estimate"""
+
+    def test_small_table_is_counted_exactly(self):
+        """Test an estimate under the threshold triggers count(*)"""
+        table = Table(estimate=90, exact=87)
+
+        assert count(CountService(exact_threshold=100), table) == TotalCount(87, estimated=False)
+        assert table.calls == ["estimate", "exact"]
+
+    def test_large_table_uses_estimate(self):
+        """Test no count(*) runs at or above the threshold"""
+        table = Table(estimate=2_000_000, exact=None)
+
+        assert count(CountService(exact_threshold=100), table) == TotalCount(2_000_000, estimated=True)
+        assert table.calls == ["estimate"]
+
+
+# ==============================================================================
+# SECTION 2: CACHING
+# ==============================================================================
+
+class TestCaching:
+    """Tests for the TTL cache"""
+
+    def test_fresh_count_is_served_from_cache(self):
+        """Test repeated lookups within the TTL don't touch the database"""
+        clock = FakeClock()
+        service = CountService(exact_threshold=100, ttl=5, clock=clock)
+        table = Table(estimate=10, exact=10)
+
+        count(service, table)
+        clock.now = 4.9
+        count(service, table)
+
+        assert table.calls == ["estimate", "exact"]
+        assert service.stats()["cache_hits"] == 1
+
+    def test_expired_or_invalidated_count_is_recomputed(self):
+        """Test the TTL and invalidate() both force a refresh"""
+        clock = FakeClock()
+        service = CountService(exact_threshold=0, ttl=5, clock=clock)
+        table = Table(estimate=10, exact=None)
+
+        count(service, table)
+        clock.now = 5
+        count(service, table)
+        service.invalidate("users")
+        count(service, table)
+
+        assert table.calls == ["estimate"] * 3
+
+    def test_failures_are_cached_briefly(self):
+        """Test an error propagates once, then the count is skipped until the TTL"""
+        clock = FakeClock()
+        service = CountService(ttl=5, clock=clock)
+        attempts = []
+
+        async def broken():
+            attempts.append(1)
+            raise ConnectionResetError()
+
+        with pytest.raises(ConnectionResetError):
+            asyncio.run(service.count("users", broken, broken))
+        assert asyncio.run(service.count("users", broken, broken)) is None
+        assert len(attempts) == 1
+
+        clock.now = 5
+        assert count(service, Table(estimate=1, exact=1)).value == 1
+        assert service.stats()["failures"] == 1
+
+
+# ==============================================================================
+# SECTION 3: EXPLAIN PARSING
+# ==============================================================================
+
+class TestPlanRows:
+    """Tests for reading the planner's estimate"""
+
+    def test_reads_top_plan_rows(self):
+        """Test the JSON text returned by EXPLAIN (FORMAT JSON) is parsed"""
+        assert plan_rows('[{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 4213}}]') == 4213
+
+    def test_rejects_other_output(self):
+        """Test anything else raises ValueError"""
+        with pytest.raises(ValueError):
+            plan_rows("[]")
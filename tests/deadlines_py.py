@@ -0,0 +1,192 @@
+"""
+==============================================================================
+Unit Tests for Request Deadlines & Disconnect Cancellation
+==============================================================================
+Location: tests/test_deadlines.py
+Purpose: Verify deadline selection, remaining() and handler cancellation
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import time
+import pytest
+
+from src.deadlines import (
+    DeadlineExceeded,
+    DeadlineMiddleware,
+    DeadlinePolicy,
+    remaining,
+    reset_deadline,
+    set_deadline,
+)
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+def make_scope(path="/users", headers=()):
+    """Minimal HTTP scope"""
+    return {"type": "http", "path": path, "headers": list(headers)}
+
+
+def make_receive(disconnect_after=None):
+    """
+    receive() that delivers the request body, then blocks until
+    `disconnect_after` seconds (forever if None) and reports a disconnect.
+    """
+    sent = []
+
+    async def receive():
+        if not sent:
+            sent.append(True)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        if disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+# ==============================================================================
+# SECTION 1: DEADLINE SELECTION
+# ==============================================================================
+
+class TestPolicy:
+    """Tests for per-route defaults and the client header"""
+
+    def make_policy(self):
+        return DeadlinePolicy(default_timeout=10, route_timeouts=[("/users:bulk", 300)])
+
+    def test_route_default(self):
+        """Test the longest matching route prefix wins"""
+        policy = self.make_policy()
+        assert policy.timeout_for("/users") == 10
+        assert policy.timeout_for("/users:bulk") == 300
+
+    def test_header_shortens_deadline(self):
+        """Test a client timeout below the route default is used"""
+        policy = self.make_policy()
+        assert policy.timeout_for("/users", [(b"x-request-timeout", b"2")]) == 2
+        assert policy.client_deadlines == 1
+
+    @pytest.mark.parametrize("value", [b"60", b"abc", b"-1", b"0"])
+    def test_header_cannot_extend_or_break_deadline(self, value):
+        """Test long, malformed and non-positive header values fall back to the default"""
+        policy = self.make_policy()
+        assert policy.timeout_for("/users", [(b"x-request-timeout", value)]) == 10
+
+
+# ==============================================================================
+# SECTION 2: REMAINING TIME
+# ==============================================================================
+
+class TestRemaining:
+    """Tests for the context-local deadline"""
+
+    def test_no_deadline_outside_requests(self):
+        """Test remaining() is None without a deadline"""
+        assert remaining() is None
+
+    def test_remaining_counts_down(self):
+        """Test remaining() reports the time left"""
+        token = set_deadline(5)
+        try:
+            assert 4.9 < remaining() <= 5
+        finally:
+            reset_deadline(token)
+        assert remaining() is None
+
+    def test_expired_deadline_raises(self):
+        """Test remaining() raises once the deadline has passed"""
+        token = set_deadline(0.001)
+        try:
+            time.sleep(0.002)
+            with pytest.raises(DeadlineExceeded):
+                remaining()
+        finally:
+            reset_deadline(token)
+
+
+# ==============================================================================
+# SECTION 3: MIDDLEWARE
+# ==============================================================================
+
+class TestMiddleware:
+    """Tests for the ASGI wrapper"""
+
+    def test_handler_sees_request_deadline(self):
+        """Test the handler runs under the header-derived deadline"""
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(remaining())
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        async def send(message):
+            pass
+
+        middleware = DeadlineMiddleware(app, DeadlinePolicy(default_timeout=10))
+        scope = make_scope(headers=[(b"x-request-timeout", b"1.5")])
+        asyncio.run(middleware(scope, make_receive(), send))
+
+        assert 1.4 < seen[0] <= 1.5
+
+    def test_disconnect_cancels_handler(self):
+        """Test a client disconnect cancels in-flight work"""
+        state = {}
+
+        async def app(scope, receive, send):
+            try:
+                await asyncio.sleep(10)  # slow query
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+
+        async def send(message):
+            pass
+
+        policy = DeadlinePolicy(default_timeout=10)
+        middleware = DeadlineMiddleware(app, policy)
+
+        started = time.monotonic()
+        asyncio.run(middleware(make_scope(), make_receive(disconnect_after=0.01), send))
+
+        assert state["cancelled"]
+        assert time.monotonic() - started < 1
+        assert policy.stats()["disconnects_cancelled"] == 1
+
+    def test_disconnect_after_response_keeps_background_work(self):
+        """Test the post-response disconnect does not cancel the handler"""
+        state = {}
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+            await asyncio.sleep(0.05)  # background task
+            state["finished"] = True
+
+        async def send(message):
+            pass
+
+        policy = DeadlinePolicy(default_timeout=10)
+        middleware = DeadlineMiddleware(app, policy)
+        asyncio.run(middleware(make_scope(), make_receive(disconnect_after=0), send))
+
+        assert state["finished"]
+        assert policy.disconnects_cancelled == 0
+
+    def test_handler_errors_propagate(self):
+        """Test exceptions from the app are re-raised"""
+        async def app(scope, receive, send):
+            raise RuntimeError("boom")
+
+        async def send(message):
+            pass
+
+        middleware = DeadlineMiddleware(app, DeadlinePolicy())
+        with pytest.raises(RuntimeError):
+            asyncio.run(middleware(make_scope(), make_receive(), send))
@@ -0,0 +1,101 @@
+"""
+==============================================================================
+Unit Tests for Error Log Aggregation
+==============================================================================
+Location: tests/test_error_log.py
+Purpose: Verify repeated errors are logged once and summarized per window
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import logging
+
+from src.error_log import ErrorLog
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+class ListHandler(logging.Handler):
+    """Collects records"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_error_log(**kwargs):
+    """ErrorLog writing to a private, non-propagating logger"""
+    logger = logging.getLogger(f"test.error_log.{id(kwargs)}")
+    logger.propagate = False
+    handler = ListHandler()
+    logger.handlers = [handler]
+    return ErrorLog(logger, **kwargs), handler
+
+
+# ==============================================================================
+# SECTION 1: AGGREGATION
+# ==============================================================================
+
+class TestErrorLog:
+    """Tests for ErrorLog"""
+
+    def test_repeats_are_counted_not_logged(self):
+        """Test only the first identical error is written, with its traceback"""
+        error_log, handler = make_error_log()
+        error = ConnectionRefusedError("connection refused")
+
+        written = [error_log.error("Unhandled exception: refused", exc_info=error) for _ in range(50)]
+
+        assert written == [True] + [False] * 49
+        assert len(handler.records) == 1
+        assert handler.records[0].exc_info[1] is error
+        assert error_log.stats()["suppressed"] == 49
+
+    def test_distinct_errors_are_logged_separately(self):
+        """Test a different message or exception type is a new error"""
+        error_log, handler = make_error_log()
+
+        error_log.error("Error fetching users: boom")
+        error_log.error("Error fetching projects: boom")
+        error_log.error("Error fetching users: boom", exc_info=ValueError("boom"))
+
+        assert len(handler.records) == 3
+
+    def test_flush_summarizes_and_starts_a_new_window(self):
+        """Test the summary carries the count and the next error logs again"""
+        clock = FakeClock()
+        error_log, handler = make_error_log(clock=clock)
+        for _ in range(4):
+            error_log.error("Error fetching users: refused")
+        error_log.error("Error fetching user 1: refused")
+        clock.now = 60
+
+        assert error_log.flush() == 1
+        assert handler.records[-1].getMessage() == (
+            "Error fetching users: refused (repeated 3 times in the last 60s)"
+        )
+
+        assert error_log.error("Error fetching users: refused") is True
+
+    def test_distinct_errors_are_bounded(self):
+        """Test errors beyond max_keys share one overflow counter"""
+        error_log, handler = make_error_log(max_keys=2)
+
+        for i in range(10):
+            error_log.error(f"Error fetching user {i}: refused")
+
+        assert len(handler.records) == 3        # two tracked + the first overflow
+        assert error_log.stats()["tracked"] == 3
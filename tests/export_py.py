@@ -0,0 +1,116 @@
+"""
+==============================================================================
+Unit Tests for Streaming Export
+==============================================================================
+Location: tests/test_export.py
+Purpose: Verify batch encoding, cursor paging and connection cleanup
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime
+
+from src.export import encode_csv, encode_ndjson, prefetched, stream_query
+from src.fakes import FakePool
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+COLUMNS = ["id", "name", "created_at"]
+CREATED = datetime(2024, 5, 1, 12, 30)
+
+
+def make_rows(count):
+    return [{"id": i, "name": f"row-{i}", "created_at": CREATED} for i in range(count)]
+
+
+def cursor_pool(rows, **kwargs):
+    """FakePool whose cursor yields `rows`"""
+    return FakePool(responder=lambda method, query, args: rows if method == "cursor" else None,
+                    **kwargs)
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+# ==============================================================================
+# SECTION 1: ENCODING
+# ==============================================================================
+
+class TestEncoding:
+    """Tests for the per-batch encoders"""
+
+    def test_ndjson_one_object_per_line(self):
+        """Test datetimes become ISO strings and column order is kept"""
+        lines = encode_ndjson(make_rows(2), COLUMNS).decode().splitlines()
+
+        assert len(lines) == 2
+        assert json.loads(lines[1]) == {"id": 1, "name": "row-1", "created_at": "2024-05-01T12:30:00"}
+
+    def test_csv_quotes_and_nulls(self):
+        """Test embedded commas are quoted and NULL is an empty field"""
+        rows = [{"id": 1, "name": "a, b", "created_at": None}]
+
+        assert encode_csv(rows, COLUMNS) == b'1,"a, b",\r\n'
+
+
+# ==============================================================================
+# SECTION 2: CURSOR STREAMING
+# ==============================================================================
+
+class TestStreamQuery:
+    """Tests for stream_query"""
+
+    def test_one_chunk_per_batch(self):
+        """Test rows are fetched in batch_size round trips"""
+        pool = cursor_pool(make_rows(5))
+
+        chunks = asyncio.run(collect(stream_query(pool, "SELECT", COLUMNS, "ndjson", 2)))
+
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+        assert pool.fetched_batches == 4   # the last fetch comes back empty
+        assert pool.in_use == 0
+
+    def test_csv_starts_with_header(self):
+        """Test the CSV header is sent even for an empty table"""
+        chunks = asyncio.run(collect(stream_query(cursor_pool([]), "SELECT", COLUMNS, "csv")))
+
+        assert chunks == [b"id,name,created_at\r\n"]
+
+    def test_closing_early_releases_connection(self):
+        """Test a disconnected client doesn't leave the cursor's connection checked out"""
+        pool = cursor_pool(make_rows(10))
+
+        async def read_one():
+            chunks = await prefetched(stream_query(pool, "SELECT", COLUMNS, "ndjson", 2))
+            await chunks.__anext__()
+            assert pool.in_use == 1
+            await chunks.aclose()
+
+        asyncio.run(read_one())
+        assert pool.in_use == 0
+        assert pool.fetched_batches == 1
+
+    @pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+    @pytest.mark.parametrize("failures", [[ConnectionResetError()], [None, ConnectionResetError()]],
+                             ids=["cursor", "first-batch"])
+    def test_prefetch_raises_before_streaming(self, fmt, failures):
+        """Test a failure opening the cursor or fetching the first batch surfaces from prefetched()"""
+        pool = cursor_pool(make_rows(3), failures=failures)
+
+        with pytest.raises(ConnectionResetError):
+            asyncio.run(prefetched(stream_query(pool, "SELECT", COLUMNS, fmt)))
+        assert pool.in_use == 0
+
+    def test_csv_header_shares_the_first_chunk(self):
+        """Test the header is not sent on its own ahead of the first batch"""
+        chunks = asyncio.run(collect(stream_query(cursor_pool(make_rows(3)), "SELECT", COLUMNS, "csv", 2)))
+
+        assert chunks[0].startswith(b"id,name,created_at\r\n0,row-0,")
+        assert [chunk.count(b"\n") for chunk in chunks] == [3, 1]
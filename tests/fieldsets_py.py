@@ -0,0 +1,90 @@
+"""
+==============================================================================
+Unit Tests for Sparse Fieldsets
+==============================================================================
+Location: tests/test_fieldsets.py
+Purpose: Verify whitelisting, statement caching and trimmed serialization
+Framework: pytest
+==============================================================================
+"""
+
+import json
+import uuid
+import pytest
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import BaseModel
+
+from src.fieldsets import SparseFields
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+class Item(BaseModel):
+    id: str
+    name: str
+    note: Optional[str] = None
+    created_at: datetime
+
+
+TEMPLATE = "SELECT {columns} FROM items"
+ROW = {"id": uuid.UUID(int=1), "name": "widget", "note": None,
+       "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+
+
+# ==============================================================================
+# SECTION 1: PARSING
+# ==============================================================================
+
+class TestParse:
+    """Tests for fields= normalization"""
+
+    def test_adds_key_and_uses_model_order(self):
+        """Test order and duplicates don't create distinct fieldsets"""
+        sparse = SparseFields(Item)
+
+        assert sparse.parse("name, created_at,name") == ("id", "name", "created_at")
+        assert sparse.parse("created_at,name") == sparse.parse("name,created_at")
+
+    def test_absent_or_complete_means_full_model(self):
+        """Test None and "every field" both select the full response"""
+        sparse = SparseFields(Item)
+
+        assert sparse.parse(None) is None
+        assert sparse.parse("id,name,note,created_at") is None
+
+    def test_unknown_field_is_rejected(self):
+        """Test names outside the model never reach SQL"""
+        with pytest.raises(ValueError, match="password_hash"):
+            SparseFields(Item).parse("name,password_hash")
+
+
+# ==============================================================================
+# SECTION 2: STATEMENTS & RENDERING
+# ==============================================================================
+
+class TestStatements:
+    """Tests for generated SQL and output"""
+
+    def test_statement_is_cached_per_fieldset(self):
+        """Test equal fieldsets reuse the same statement text"""
+        sparse = SparseFields(Item)
+        fields = sparse.parse("name")
+
+        first = sparse.statement(TEMPLATE, fields)
+        assert first == "SELECT id, name FROM items"
+        assert sparse.statement(TEMPLATE, sparse.parse("name")) is first
+        assert sparse.statement(TEMPLATE, None) == "SELECT id, name, note, created_at FROM items"
+
+    def test_render_emits_only_requested_fields(self):
+        """Test UUIDs become strings and other columns are dropped"""
+        sparse = SparseFields(Item)
+        fields = sparse.parse("created_at")
+
+        assert json.loads(sparse.render([ROW], fields)) == [
+            {"id": str(uuid.UUID(int=1)), "created_at": "2024-01-01T00:00:00Z"}
+        ]
+        assert json.loads(sparse.render_one(ROW, fields))["created_at"] == "2024-01-01T00:00:00Z"
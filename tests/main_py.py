@@ -8,12 +8,25 @@ Framework: pytest with FastAPI TestClient
 ==============================================================================
 """
 
+import asyncio
+import asyncpg
+import json
+import httpx
 import pytest
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, MagicMock, patch
+from jose import jwt
 
-from src.main import app, get_db_pool
+from src.admission import AdmissionController, RequestShed
+from src.fakes import FakePool
+from src.main import (
+    admission_controller, app, db_breaker, error_log, get_db_pool, get_read_repository,
+    health_prober, pool_breakers, total_counts, user_loader, COUNT_SQL, CURRENT_LSN_SQL,
+    ProjectResponse, UserResponse
+)
+from src.pool import ManagedPool
+from src.repository import MemoryRepository, sample_rows
 
 # ==============================================================================
 # TEST FIXTURES
@@ -38,6 +51,14 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def reset_total_counts():
+    """Cached X-Total-Count values must not leak between tests"""
+    total_counts.invalidate()
+    yield
+    total_counts.invalidate()
+
+
 @pytest.fixture
 def mock_db_pool():
     """
@@ -122,8 +143,22 @@ class TestRootEndpoint:
 # SECTION 2: HEALTH CHECK TESTS
 # ==============================================================================
 
+def run_probe(pool):
+    """Run one background-prober iteration against `pool`"""
+    asyncio.run(health_prober.probe(pool))
+
+
 class TestHealthEndpoint:
-    """Tests for the health check endpoint"""
+    """Tests for the health check endpoint (cached background probe)"""
+    
+    @pytest.fixture(autouse=True)
+    def reset_prober(self):
+        """Start every test without a cached probe (probes feed the breaker)"""
+        health_prober.reset()
+        db_breaker.reset()
+        yield
+        health_prober.reset()
+        db_breaker.reset()
     
     def test_health_returns_200(self, client, override_get_db_pool):
         """Test that health endpoint returns 200 OK"""
@@ -132,6 +167,7 @@ class TestHealthEndpoint:
         mock_conn.fetchval = AsyncMock(return_value=1)
         override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
         
+        run_probe(override_get_db_pool)
         response = client.get("/health")
         assert response.status_code == 200
     
@@ -142,6 +178,7 @@ class TestHealthEndpoint:
         mock_conn.fetchval = AsyncMock(return_value=1)
         override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
         
+        run_probe(override_get_db_pool)
         response = client.get("/health")
         data = response.json()
         
@@ -159,6 +196,7 @@ class TestHealthEndpoint:
         mock_conn.fetchval = AsyncMock(return_value=1)
         override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
         
+        run_probe(override_get_db_pool)
         response = client.get("/health")
         data = response.json()
         
@@ -172,10 +210,59 @@ class TestHealthEndpoint:
         mock_conn.fetchval = AsyncMock(side_effect=Exception("DB Error"))
         override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
         
+        run_probe(override_get_db_pool)
         response = client.get("/health")
         data = response.json()
         
         assert data["database"] == "disconnected"
+        assert data["status"] == "degraded"
+    
+    def test_health_does_not_touch_pool(self, client, override_get_db_pool):
+        """Test GET /health serves cached state without acquiring"""
+        mock_conn = MagicMock()
+        mock_conn.fetchval = AsyncMock(return_value=1)
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        run_probe(override_get_db_pool)
+        override_get_db_pool.acquire.reset_mock()
+        
+        for _ in range(5):
+            client.get("/health")
+        
+        override_get_db_pool.acquire.assert_not_called()
+    
+    def test_health_reports_latency(self, client, override_get_db_pool):
+        """Test probe latency and timing are exposed"""
+        mock_conn = MagicMock()
+        mock_conn.fetchval = AsyncMock(return_value=1)
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        run_probe(override_get_db_pool)
+        data = client.get("/health").json()
+        
+        assert data["db_latency_ms"] >= 0
+        assert data["checked_at"] is not None
+        assert data["probe_age_seconds"] >= 0
+    
+    def test_health_degraded_when_probe_is_stale(self, client, override_get_db_pool):
+        """Test old probe data marks the service degraded"""
+        mock_conn = MagicMock()
+        mock_conn.fetchval = AsyncMock(return_value=1)
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        run_probe(override_get_db_pool)
+        
+        with patch.object(health_prober, "stale_after", -1):
+            data = client.get("/health").json()
+        
+        assert data["status"] == "degraded"
+        assert data["database"] == "connected"
+    
+    def test_health_degraded_before_first_probe(self, client):
+        """Test /health answers (degraded) before any probe ran"""
+        response = client.get("/health")
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "degraded"
+        assert response.json()["database"] == "unknown"
 
 
 # ==============================================================================
@@ -420,6 +507,1201 @@ class TestIntegration:
         pass
 
 
+# ==============================================================================
+# SECTION 7: DATABASE-RENDERED JSON TESTS
+# ==============================================================================
+
+def render_like_postgres(rows):
+    """Mimic json_agg(row_to_json(...)) output for a list of rows"""
+    return json.dumps(
+        [{key: value.isoformat() if isinstance(value, datetime) else value
+          for key, value in row.items()} for row in rows]
+    )
+
+
+class TestJsonFastPath:
+    """Tests for the json_agg fast path on listing endpoints"""
+    
+    def test_users_fast_path_matches_model_path(self, client, override_get_db_pool):
+        """Test both /users paths produce the same output"""
+        mock_users = [
+            {
+                "id": f"123e4567-e89b-12d3-a456-42661417400{i}",
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "full_name": None if i % 2 else f"User {i}",
+                "is_active": bool(i % 3),
+                "created_at": datetime(2024, 1, 1, 12, i, tzinfo=timezone.utc)
+            }
+            for i in range(5)
+        ]
+        
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=mock_users)
+        mock_conn.fetchval = AsyncMock(return_value=render_like_postgres(mock_users))
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        model_path = client.get("/users?limit=100").json()
+        with patch("src.main.JSON_FAST_PATH", True):
+            response = client.get("/users?limit=100")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        fast_path = [
+            UserResponse.model_validate(item).model_dump(mode="json")
+            for item in response.json()
+        ]
+        assert fast_path == model_path
+    
+    def test_projects_fast_path_matches_model_path(self, client, override_get_db_pool):
+        """Test both /projects paths produce the same output"""
+        mock_projects = [
+            {
+                "id": "456e7890-e89b-12d3-a456-426614174000",
+                "name": "Test Project",
+                "description": None,
+                "status": "active",
+                "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc)
+            }
+        ]
+        
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=mock_projects)
+        mock_conn.fetchval = AsyncMock(return_value=render_like_postgres(mock_projects))
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        model_path = client.get("/projects").json()
+        with patch("src.main.JSON_FAST_PATH", True):
+            response = client.get("/projects")
+        
+        fast_path = [
+            ProjectResponse.model_validate(item).model_dump(mode="json")
+            for item in response.json()
+        ]
+        assert fast_path == model_path
+    
+    def test_fast_path_passes_pagination(self, client, override_get_db_pool):
+        """Test the fast path forwards limit/offset and returns an empty page"""
+        mock_conn = MagicMock()
+        mock_conn.fetchval = AsyncMock(return_value="[]")
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        with patch("src.main.JSON_FAST_PATH", True):
+            response = client.get("/users?limit=5&offset=10")
+        
+        assert response.json() == []
+        assert mock_conn.fetchval.call_args_list[0].args[1:] == (5, 10)
+
+
+# ==============================================================================
+# SECTION 8: METRICS TESTS
+# ==============================================================================
+
+class TestMetricsEndpoint:
+    """Tests for the /metrics endpoint"""
+    
+    def test_metrics_reports_singleflight(self, client, override_get_db_pool):
+        """Test that coalescing counters are exposed"""
+        mock_conn = MagicMock()
+        mock_conn.fetchrow = AsyncMock(return_value=None)
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        client.get("/users/some-id")
+        data = client.get("/metrics").json()
+        
+        assert "singleflight" in data
+        assert data["singleflight"]["calls"] >= 1
+        assert data["singleflight"]["inflight"] == 0
+    
+    def test_metrics_reports_admission(self, client):
+        """Test that admission-control counters are exposed"""
+        data = client.get("/metrics").json()
+        
+        assert data["admission"]["exempted"] >= 1
+        assert data["admission"]["in_flight"] == 0  # /metrics takes no slot
+        assert "shed_by_reason" in data["admission"]
+    
+    def test_health_is_not_shed_when_saturated(self, client):
+        """Test probes and metrics answer while every slot is taken"""
+        with patch.object(admission_controller, "in_flight", 10_000):
+            assert client.get("/users").status_code == 503
+            assert client.get("/health/live").status_code == 200
+            assert client.get("/metrics").status_code == 200
+    
+    @pytest.mark.parametrize("path", [
+        "/projects/search", "/users/export", "/projects/export", "/users:bulk", "/batch"
+    ])
+    def test_heavy_routes_are_shed_before_lookups(self, path):
+        """Test search, export and batch traffic is displaced by /users/{id}"""
+        controller = AdmissionController(
+            max_concurrency=1, max_queue=1, priorities=admission_controller.priorities
+        )
+        
+        async def scenario():
+            await controller.acquire(controller.priority_for("/users"))
+            heavy = asyncio.ensure_future(controller.acquire(controller.priority_for(path)))
+            await asyncio.sleep(0)
+            lookup = asyncio.ensure_future(controller.acquire(controller.priority_for("/users/1")))
+            await asyncio.sleep(0)
+            controller.release(0.01)
+            await lookup
+            with pytest.raises(RequestShed) as shed:
+                await heavy
+            return shed.value.reason
+        
+        assert asyncio.run(scenario()) == "displaced"
+    
+    def test_metrics_reports_access_log(self, client):
+        """Test access-log sampling counters are exposed"""
+        client.get("/")
+        data = client.get("/metrics").json()
+        
+        counted = data["access_log"]["logged"] + data["access_log"]["sampled_out"]
+        assert counted >= 1
+        assert "sample_rate" in data["access_log"]
+
+
+# ==============================================================================
+# SECTION 9: BATCHED USER LOOKUP TESTS
+# ==============================================================================
+
+def make_user(user_id):
+    """Build a users row for the given id"""
+    return {
+        "id": user_id,
+        "username": f"user-{user_id[:4]}",
+        "email": f"{user_id[:4]}@example.com",
+        "full_name": None,
+        "is_active": True,
+        "created_at": datetime.utcnow()
+    }
+
+
+USER_IDS = [
+    "11111111-1111-1111-1111-111111111111",
+    "22222222-2222-2222-2222-222222222222",
+    "33333333-3333-3333-3333-333333333333",
+]
+
+
+class TestBatchedUserLookups:
+    """Tests for GET /users?ids= and get_user micro-batching"""
+    
+    def test_ids_returns_users_in_requested_order(self, client, override_get_db_pool):
+        """Test GET /users?ids= keeps the caller's order and skips misses"""
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=[make_user(USER_IDS[0]), make_user(USER_IDS[2])])
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        response = client.get(f"/users?ids={USER_IDS[2]},{USER_IDS[1]},{USER_IDS[0]}")
+        
+        assert response.status_code == 200
+        assert [u["id"] for u in response.json()] == [USER_IDS[2], USER_IDS[0]]
+        assert mock_conn.fetch.call_count == 1
+        assert mock_conn.fetch.call_args.args[1] == [USER_IDS[2], USER_IDS[1], USER_IDS[0]]
+    
+    def test_ids_rejects_malformed_uuid(self, client, override_get_db_pool):
+        """Test GET /users?ids= returns 400 for a non-UUID"""
+        response = client.get(f"/users?ids={USER_IDS[0]},not-a-uuid")
+        assert response.status_code == 400
+    
+    def test_ids_rejects_too_many(self, client, override_get_db_pool):
+        """Test GET /users?ids= enforces the per-request cap"""
+        with patch("src.main.MAX_IDS_PER_REQUEST", 2):
+            response = client.get(f"/users?ids={','.join(USER_IDS)}")
+        assert response.status_code == 400
+    
+    def test_concurrent_get_user_calls_are_batched(self, override_get_db_pool):
+        """Test concurrent GET /users/{id} calls resolve with one query"""
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=[make_user(i) for i in USER_IDS])
+        mock_conn.fetchrow = AsyncMock(return_value=None)
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+                return await asyncio.gather(*(ac.get(f"/users/{i}") for i in USER_IDS))
+        
+        responses = asyncio.run(scenario())
+        
+        assert [r.json()["id"] for r in responses] == USER_IDS
+        assert mock_conn.fetch.call_count == 1
+        assert mock_conn.fetchrow.call_count == 0
+
+
+# ==============================================================================
+# SECTION 10: POOL HEALTH TESTS
+# ==============================================================================
+
+class TestPoolHealthEndpoint:
+    """Tests for the /health/pool endpoint"""
+    
+    def test_pool_health_reports_pressure(self, client, mock_db_pool):
+        """Test /health/pool exposes ManagedPool telemetry"""
+        managed = ManagedPool(mock_db_pool, min_size=2, max_size=8, initial_size=4)
+        app.dependency_overrides[get_db_pool] = lambda: managed
+        try:
+            response = client.get("/health/pool")
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["target_size"] == 4
+        assert data["max_size"] == 8
+        assert data["waiters"] == 0
+        assert "p99" in data["acquire_wait_ms"]
+    
+    def test_pool_health_unavailable_without_manager(self, client, override_get_db_pool):
+        """Test /health/pool returns 503 for an unmanaged pool"""
+        response = client.get("/health/pool")
+        assert response.status_code == 503
+
+
+# ==============================================================================
+# SECTION 11: USER CREATION TESTS
+# ==============================================================================
+
+@pytest.fixture
+def fake_hasher():
+    """Replace the process-pool hasher with an instant fake"""
+    hasher = MagicMock()
+    hasher.hash = AsyncMock(return_value="$2b$hash")
+    hasher.hash_many = AsyncMock(side_effect=lambda passwords: [f"hash-{p}" for p in passwords])
+    with patch("src.main.password_hasher", hasher):
+        yield hasher
+
+
+def new_user(name):
+    """Build a valid UserCreate payload"""
+    return {"username": name, "email": f"{name}@example.com", "password": "securepassword123"}
+
+
+class TestCreateUser:
+    """Tests for POST /users and POST /users:bulk"""
+    
+    def test_create_user_returns_201(self, client, override_get_db_pool, fake_hasher):
+        """Test POST /users hashes the password and returns the user"""
+        mock_conn = MagicMock()
+        mock_conn.fetchrow = AsyncMock(return_value=make_user(USER_IDS[0]))
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        response = client.post("/users", json=new_user("johndoe"))
+        
+        assert response.status_code == 201
+        assert response.json()["id"] == USER_IDS[0]
+        assert "password" not in response.json()
+        fake_hasher.hash.assert_awaited_once_with("securepassword123")
+        assert mock_conn.fetchrow.call_args.args[3] == "$2b$hash"
+    
+    def test_create_user_conflict_returns_409(self, client, override_get_db_pool, fake_hasher):
+        """Test POST /users maps a unique violation to 409"""
+        mock_conn = MagicMock()
+        mock_conn.fetchrow = AsyncMock(side_effect=asyncpg.UniqueViolationError("duplicate"))
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        response = client.post("/users", json=new_user("johndoe"))
+        assert response.status_code == 409
+    
+    def test_create_user_validates_payload(self, client, override_get_db_pool, fake_hasher):
+        """Test POST /users rejects a short password"""
+        response = client.post("/users", json={**new_user("johndoe"), "password": "short"})
+        assert response.status_code == 422
+    
+    def test_bulk_reports_per_row_conflicts(self, client, override_get_db_pool, fake_hasher):
+        """Test POST /users:bulk copies rows and reports every conflict"""
+        mock_conn = MagicMock()
+        mock_conn.execute = AsyncMock()
+        mock_conn.copy_records_to_table = AsyncMock()
+        mock_conn.fetch = AsyncMock(side_effect=[
+            [{"username": "alice"}],  # inserted
+            [{"idx": 1, "username": "bob", "email": "bob@example.com", "username_taken": True}],
+        ])
+        transaction = MagicMock()
+        transaction.__aenter__ = AsyncMock(return_value=None)
+        transaction.__aexit__ = AsyncMock(return_value=None)
+        mock_conn.transaction.return_value = transaction
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        users = [new_user("alice"), new_user("bob"), new_user("alice")]
+        response = client.post("/users:bulk", json={"users": users})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 1
+        assert [(c["index"], c["reason"]) for c in data["conflicts"]] == [
+            (1, "username already exists"),
+            (2, "duplicate username in request"),
+        ]
+        records = mock_conn.copy_records_to_table.call_args.kwargs["records"]
+        assert [r[0] for r in records] == [0, 1]
+        assert records[0][3] == "hash-securepassword123"
+    
+    def test_bulk_rejects_empty_list(self, client, override_get_db_pool, fake_hasher):
+        """Test POST /users:bulk requires at least one user"""
+        response = client.post("/users:bulk", json={"users": []})
+        assert response.status_code == 422
+
+
+# ==============================================================================
+# SECTION 12: AUTHENTICATION TESTS
+# ==============================================================================
+
+class TestAuthentication:
+    """Tests for the bearer-token dependency"""
+    
+    @pytest.fixture(autouse=True)
+    def auth_enabled(self):
+        """Turn authentication on for these tests"""
+        with patch("src.main.AUTH_ENABLED", True):
+            yield
+    
+    def make_header(self, secret=None):
+        """Authorization header with a token signed by the app's key"""
+        from src.main import JWT_SECRET_KEY
+        token = jwt.encode(
+            {"sub": "user-1", "exp": int(datetime.utcnow().timestamp()) + 3600},
+            secret or JWT_SECRET_KEY, algorithm="HS256"
+        )
+        return {"Authorization": f"Bearer {token}"}
+    
+    def test_missing_token_returns_401(self, client, override_get_db_pool):
+        """Test protected routes require a bearer token"""
+        response = client.get("/users")
+        assert response.status_code == 401
+        assert response.json()["error"] == "Not authenticated"
+    
+    def test_bad_signature_returns_401(self, client, override_get_db_pool):
+        """Test tokens signed with another key are rejected"""
+        response = client.get("/projects", headers=self.make_header("wrong-key"))
+        assert response.status_code == 401
+    
+    def test_valid_token_is_accepted(self, client, override_get_db_pool):
+        """Test a valid token reaches the handler"""
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=[])
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        response = client.get("/users", headers=self.make_header())
+        assert response.status_code == 200
+    
+    @pytest.mark.parametrize("path,body", [
+        ("/users", {"username": "ada", "email": "ada@example.com", "password": "securepassword123"}),
+        ("/users:bulk", {"users": [
+            {"username": "ada", "email": "ada@example.com", "password": "securepassword123"}
+        ]}),
+    ])
+    def test_user_creation_requires_token(self, client, override_get_db_pool, path, body):
+        """Test POST /users and /users:bulk are protected like the reads"""
+        response = client.post(path, json=body)
+        
+        assert response.status_code == 401
+        assert not override_get_db_pool.acquire.called
+    
+    def test_startup_refuses_the_default_secret(self):
+        """Test the app won't start with auth on and the placeholder key"""
+        with patch("src.main.JWT_SECRET_KEY", "change-me-in-production"):
+            with pytest.raises(RuntimeError, match="JWT_SECRET_KEY"):
+                with TestClient(app):
+                    pass
+    
+    def test_sighup_reload_rotates_keys(self, client, override_get_db_pool, tmp_path):
+        """Test reloading JWT_SECRET_FILE accepts the new key and keeps the old on error"""
+        from src.main import reload_signing_keys, token_verifier
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=[])
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        key_file = tmp_path / "jwt.keys"
+        key_file.write_text("rotated-secret\n")
+        
+        with patch.object(token_verifier, "keys", token_verifier.keys), \
+                patch("src.main.JWT_SECRET_FILE", str(key_file)):
+            reload_signing_keys()
+            assert client.get("/users", headers=self.make_header("rotated-secret")).status_code == 200
+            assert client.get("/users", headers=self.make_header()).status_code == 401
+            
+            key_file.write_text("change-me-in-production\n")
+            reload_signing_keys()
+            assert token_verifier.keys == ["rotated-secret"]
+    
+    def test_public_routes_stay_open(self, client):
+        """Test root and docs do not require a token"""
+        assert client.get("/").status_code == 200
+
+
+# ==============================================================================
+# SECTION 13: STARTUP & PROBE TESTS
+# ==============================================================================
+
+class TestStartupProbes:
+    """Tests for background DB startup and liveness/readiness probes"""
+    
+    @pytest.fixture(autouse=True)
+    def reset_prober(self):
+        """Start every test without a cached probe (probes feed the breaker)"""
+        health_prober.reset()
+        db_breaker.reset()
+        yield
+        health_prober.reset()
+        db_breaker.reset()
+    
+    def test_liveness_without_database(self, client):
+        """Test /health/live answers before the pool exists"""
+        response = client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json()["status"] == "alive"
+    
+    def test_readiness_while_connecting(self, client):
+        """Test /health/ready is 503 until the pool is connected"""
+        with patch("src.main.db_connect_error", "connection refused"):
+            response = client.get("/health/ready")
+        
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert response.json()["status"] == "not_ready"
+        assert "connection refused" in response.json()["detail"]
+    
+    def test_readiness_when_connected(self, client):
+        """Test /health/ready is 200 once the pool is set"""
+        with patch("src.main.db_pool", MagicMock()):
+            response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+    
+    def test_readiness_after_failed_probe(self, client, mock_db_pool):
+        """Test /health/ready turns 503 when the background probe fails"""
+        mock_conn = MagicMock()
+        mock_conn.fetchval = AsyncMock(side_effect=OSError("connection reset"))
+        mock_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        run_probe(mock_db_pool)
+        
+        with patch("src.main.db_pool", mock_db_pool):
+            response = client.get("/health/ready")
+        assert response.status_code == 503
+    
+    def test_data_routes_return_503_while_connecting(self, client):
+        """Test handlers fail fast with 503 instead of 500 before the DB is up"""
+        response = client.get("/projects")
+        assert response.status_code == 503
+        assert response.json()["error"] == "Database not ready"
+    
+    def test_startup_does_not_block_on_database(self):
+        """Test the app serves while connect attempts keep failing"""
+        with patch("src.main.connect_database", AsyncMock(side_effect=OSError("refused"))), \
+                patch("src.main.DB_CONNECT_RETRY_BASE", 0.01), \
+                patch("src.main.password_hasher", MagicMock()):
+            with TestClient(app) as live_client:
+                assert live_client.get("/health/live").status_code == 200
+                assert live_client.get("/health/ready").status_code == 503
+    
+    def test_background_connect_retries_until_ready(self):
+        """Test connect_with_retry backs off and eventually sets the pool"""
+        from src import main
+        pool = MagicMock()
+        connect = AsyncMock(side_effect=[OSError("refused"), OSError("refused"), pool])
+        
+        with patch("src.main.connect_database", connect), \
+                patch("src.main.DB_CONNECT_RETRY_BASE", 0.001), \
+                patch("src.main.db_pool", None), \
+                patch("src.main.db_connect_attempts", 0):
+            asyncio.run(main.connect_with_retry())
+            assert main.db_pool is pool
+            assert main.db_connect_attempts == 3
+
+
+# ==============================================================================
+# SECTION 14: REQUEST DEADLINE TESTS
+# ==============================================================================
+
+class TestRequestDeadlines:
+    """Tests for per-request query and acquire timeouts"""
+    
+    def test_client_deadline_bounds_acquire_and_query(self, client, override_get_db_pool):
+        """Test X-Request-Timeout reaches pool.acquire() and the query"""
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=[])
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        response = client.get("/projects", headers={"X-Request-Timeout": "2"})
+        
+        assert response.status_code == 200
+        acquire_timeout = override_get_db_pool.acquire.call_args_list[0].kwargs["timeout"]
+        query_timeout = mock_conn.fetch.call_args.kwargs["timeout"]
+        assert 0 < query_timeout <= acquire_timeout <= 2
+    
+    def test_route_default_applies_without_header(self, client, override_get_db_pool):
+        """Test requests without the header get the route's default deadline"""
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=[])
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        with patch("src.main.deadline_policy.default_timeout", 7):
+            client.get("/projects")
+        
+        assert 6 < mock_conn.fetch.call_args.kwargs["timeout"] <= 7
+    
+    def test_query_timeout_returns_504(self, client, override_get_db_pool):
+        """Test a query cut off by the deadline answers 504, not 500"""
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(side_effect=asyncio.TimeoutError())
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        response = client.get("/projects", headers={"X-Request-Timeout": "0.5"})
+        
+        assert response.status_code == 504
+        assert response.json()["error"] == "Request deadline exceeded"
+    
+    def test_metrics_reports_deadlines(self, client):
+        """Test deadline counters are exposed"""
+        client.get("/", headers={"X-Request-Timeout": "1"})
+        data = client.get("/metrics").json()
+        
+        assert data["deadlines"]["client_deadlines"] >= 1
+        assert "disconnects_cancelled" in data["deadlines"]
+
+
+# ==============================================================================
+# SECTION 15: SERVER-TIMING TESTS
+# ==============================================================================
+
+class TestServerTiming:
+    """Tests for the per-request span breakdown"""
+    
+    def test_listing_reports_span_breakdown(self, client, override_get_db_pool):
+        """Test GET /users reports acquire, query, models, encode and total"""
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=[make_user(USER_IDS[0])])
+        override_get_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        
+        response = client.get("/users?limit=7")
+        
+        timing = response.headers["server-timing"]
+        names = [metric.split(";")[0] for metric in timing.split(", ")]
+        assert names == ["acquire", "query", "models", "encode", "total"]
+    
+    def test_every_response_has_total(self, client):
+        """Test routes without spans still report total time"""
+        response = client.get("/health/live")
+        metrics = response.headers["server-timing"].split(", ")
+        assert metrics[-1].startswith("total;dur=")
+
+
+# ==============================================================================
+# SECTION 16: RESILIENT READ TESTS
+# ==============================================================================
+
+@pytest.fixture
+def fake_pool():
+    """Override the pool with a FakePool whose behaviour each test scripts"""
+    pool = FakePool()
+    db_breaker.reset()
+    app.dependency_overrides[get_db_pool] = lambda: pool
+    yield pool
+    app.dependency_overrides.clear()
+    db_breaker.reset()
+
+
+def page_calls(pool):
+    """FakePool calls other than the X-Total-Count lookups"""
+    counting = {sql for pair in COUNT_SQL.values() for sql in pair}
+    return [call for call in pool.calls if call[1] not in counting]
+
+
+class TestResilientReads:
+    """Tests for retries and the circuit breaker on read endpoints"""
+    
+    def test_connection_reset_is_retried(self, client, fake_pool):
+        """Test a failover-style reset doesn't reach the client"""
+        fake_pool.failures.extend([ConnectionResetError()])
+        fake_pool.responder = lambda method, query, args: [make_user(USER_IDS[0])]
+        
+        response = client.get("/users?limit=3")
+        
+        assert response.status_code == 200
+        assert len(page_calls(fake_pool)) == 2
+    
+    def test_open_circuit_fails_fast_with_503(self, client, fake_pool):
+        """Test reads are rejected without touching the DB while it is down"""
+        fake_pool.failure_rate = 1.0
+        
+        with patch.object(db_breaker, "failure_threshold", 3):
+            first = client.get("/projects?limit=1")     # 3 failed attempts
+            second = client.get("/projects?limit=2")
+        
+        assert first.status_code == 500
+        assert second.status_code == 503
+        assert second.json()["error"] == "Database unavailable"
+        assert int(second.headers["retry-after"]) >= 1
+        assert len(fake_pool.calls) == 3
+    
+    def test_writes_are_not_retried(self, client, fake_pool, fake_hasher):
+        """Test POST /users fails on the first transient error"""
+        fake_pool.failures.extend([ConnectionResetError()])
+        
+        response = client.post("/users", json=new_user("nora"))
+        
+        assert response.status_code == 500
+        assert len(fake_pool.calls) == 1
+
+
+# ==============================================================================
+# SECTION 17: READ REPLICA TESTS
+# ==============================================================================
+
+@pytest.fixture
+def replica_setup(fake_pool):
+    """A primary FakePool plus one caught-up replica at LSN 0/100"""
+    from src.replicas import ReplicaRouter
+    router = ReplicaRouter()
+    replica = router.add("replica-0", FakePool())
+    replica.healthy = True
+    replica.replay_lsn = 0x100
+    primary = ManagedPool(fake_pool, min_size=1, max_size=10)   # replica reads fall back here
+    with patch("src.main.replica_router", router), patch("src.main.db_pool", primary):
+        yield fake_pool, replica.pool
+    pool_breakers.pop(replica.name, None)
+
+
+class TestReadReplicas:
+    """Tests for read/write splitting"""
+    
+    def test_listing_reads_go_to_replica(self, client, replica_setup):
+        """Test GET /projects is served by the replica"""
+        primary, replica = replica_setup
+        
+        assert client.get("/projects?limit=4").status_code == 200
+        assert len(page_calls(replica)) == 1
+        assert primary.calls == []
+    
+    def test_token_ahead_of_replica_reads_primary(self, client, replica_setup):
+        """Test read-your-writes: a newer token than any replica uses the primary"""
+        primary, replica = replica_setup
+        
+        client.get("/projects?limit=5", headers={"X-Consistency-Token": "0/200"})
+        client.get("/projects?limit=5", headers={"X-Consistency-Token": "0/80"})
+        
+        assert len(page_calls(primary)) == 1
+        assert len(page_calls(replica)) == 1
+    
+    def test_writes_return_consistency_token(self, client, replica_setup, fake_hasher):
+        """Test POST /users hands back the primary's WAL position"""
+        primary, replica = replica_setup
+        row = make_user(USER_IDS[0])
+        primary.responder = lambda method, query, args: row if method == "fetchrow" else "0/1F0"
+        
+        response = client.post("/users", json=new_user("olga"))
+        
+        assert response.status_code == 201
+        assert response.headers["x-consistency-token"] == "0/1F0"
+        assert replica.calls == []
+    
+    def test_failing_replica_leaves_writes_and_readiness_up(self, client, replica_setup, fake_hasher):
+        """Test a dead replica opens only its own circuit; reads fall back to the primary"""
+        primary, replica = replica_setup
+        replica.failure_rate = 1.0
+        
+        def respond(method, query, args):
+            if query == CURRENT_LSN_SQL:
+                return "0/1F0"
+            return {"fetch": [], "fetchrow": make_user(USER_IDS[0])}.get(method, 0)
+        
+        primary.responder = respond
+        health_prober.reset()
+        
+        for _ in range(db_breaker.failure_threshold + 2):
+            assert client.get("/projects?limit=4").status_code == 200
+        
+        assert pool_breakers["replica-0"].state == "open"
+        assert db_breaker.state == "closed"
+        assert client.post("/users", json=new_user("quinn")).status_code == 201
+        assert client.get("/health/ready").status_code == 200
+    
+    def test_no_token_without_replicas(self, client, fake_pool, fake_hasher):
+        """Test single-server deployments skip the WAL query"""
+        fake_pool.responder = lambda method, query, args: make_user(USER_IDS[0])
+        
+        response = client.post("/users", json=new_user("pia"))
+        
+        assert "x-consistency-token" not in response.headers
+        assert len(fake_pool.calls) == 1
+
+
+# ==============================================================================
+# SECTION 18: EXPORT TESTS
+# ==============================================================================
+
+class TestExport:
+    """Tests for the streaming export endpoints"""
+    
+    def test_users_export_streams_ndjson(self, client, fake_pool):
+        """Test every row arrives, fetched from the cursor in batches"""
+        rows = [make_user(user_id) for user_id in USER_IDS[:3]]
+        fake_pool.responder = lambda method, query, args: rows
+        
+        with patch("src.main.EXPORT_BATCH_SIZE", 2):
+            response = client.get("/users/export")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert [json.loads(line)["id"] for line in lines] == USER_IDS[:3]
+        assert fake_pool.fetched_batches == 3
+    
+    def test_projects_export_csv(self, client, fake_pool):
+        """Test CSV exports start with a header row"""
+        fake_pool.responder = lambda method, query, args: [{
+            "id": "p1", "name": "Apollo", "description": None,
+            "status": "active", "created_at": datetime(2024, 1, 2)
+        }]
+        
+        response = client.get("/projects/export?format=csv")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "projects.csv" in response.headers["content-disposition"]
+        assert response.text.splitlines() == [
+            "id,name,description,status,created_at",
+            "p1,Apollo,,active,2024-01-02T00:00:00",
+        ]
+    
+    def test_database_error_before_first_row_is_500(self, client, fake_pool):
+        """Test a failure opening the cursor still gets an error status"""
+        fake_pool.failures.extend([asyncpg.UndefinedTableError("no users table")])
+        
+        response = client.get("/users/export")
+        
+        assert response.status_code == 500
+        assert response.json()["error"] == "Failed to export users"
+        assert fake_pool.in_use == 0
+    
+    def test_unknown_format_is_rejected(self, client, fake_pool):
+        """Test only ndjson and csv are accepted"""
+        assert client.get("/users/export?format=xml").status_code == 422
+        assert fake_pool.calls == []
+
+
+# ==============================================================================
+# SECTION 19: TOTAL COUNT TESTS
+# ==============================================================================
+
+def counting_responder(rows, estimate, exact):
+    """Answer page queries with `rows` and the count queries as given"""
+    def respond(method, query, args):
+        if query.startswith("EXPLAIN"):
+            return json.dumps([{"Plan": {"Plan Rows": estimate}}])
+        if query.startswith("SELECT count(*)"):
+            return exact
+        return rows
+    return respond
+
+
+class TestTotalCount:
+    """Tests for X-Total-Count on the listings"""
+    
+    def test_small_table_gets_exact_count(self, client, fake_pool):
+        """Test an exact count below the threshold"""
+        fake_pool.responder = counting_responder([make_user(USER_IDS[0])], estimate=40, exact=42)
+        
+        response = client.get("/users?limit=1")
+        
+        assert response.headers["x-total-count"] == "42"
+        assert response.headers["x-total-count-estimated"] == "false"
+    
+    def test_large_table_gets_estimate_then_cache(self, client, fake_pool):
+        """Test big tables skip count(*) and the total is cached"""
+        fake_pool.responder = counting_responder([], estimate=5_000_000, exact=None)
+        
+        first = client.get("/projects?limit=1")
+        second = client.get("/projects?limit=1&offset=1")
+        
+        assert first.headers["x-total-count"] == second.headers["x-total-count"] == "5000000"
+        assert first.headers["x-total-count-estimated"] == "true"
+        queries = [query for _, query, _ in fake_pool.calls]
+        assert sum(query.startswith("EXPLAIN") for query in queries) == 1
+        assert not any(query.startswith("SELECT count(*)") for query in queries)
+    
+    def test_count_failure_keeps_the_page(self, client, fake_pool):
+        """Test a failing count drops the header, not the response"""
+        fake_pool.responder = counting_responder([make_user(USER_IDS[0])], estimate=None, exact=None)
+        
+        response = client.get("/users?limit=1")
+        
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        assert "x-total-count" not in response.headers
+
+
+# ==============================================================================
+# SECTION 20: SEARCH TESTS
+# ==============================================================================
+
+class TestSearch:
+    """Tests for /users/search and /projects/search"""
+    
+    def test_full_page_returns_next_cursor(self, client, fake_pool):
+        """Test a full page links to the next one via X-Next-Cursor"""
+        rows = [dict(make_user(user_id), rank=0.5) for user_id in USER_IDS[:2]]
+        fake_pool.responder = lambda method, query, args: rows
+        
+        first = client.get("/users/search?q=ada&limit=2")
+        assert first.status_code == 200
+        assert [user["id"] for user in first.json()] == USER_IDS[:2]
+        
+        client.get(f"/users/search?q=ada&limit=2&cursor={first.headers['x-next-cursor']}")
+        _, query, args = fake_pool.calls[-1]
+        assert "websearch_to_tsquery" in query
+        assert args == ("ada", 0.5, USER_IDS[1], 2, 1000, 10000)
+    
+    def test_statement_timeout_is_set_for_the_search_only(self, client, fake_pool):
+        """Test Postgres is told to cancel a slow search itself"""
+        fake_pool.responder = lambda method, query, args: []
+        
+        client.get("/users/search?q=ada")
+        
+        (method, setting, _), (_, query, _) = fake_pool.calls
+        assert method == "execute"
+        assert setting == "SET LOCAL statement_timeout = 2000"
+        assert "websearch_to_tsquery" in query
+    
+    def test_short_page_has_no_cursor(self, client, fake_pool):
+        """Test the last page doesn't advertise another"""
+        fake_pool.responder = lambda method, query, args: []
+        
+        response = client.get("/projects/search?q=apollo")
+        
+        assert response.status_code == 200
+        assert "x-next-cursor" not in response.headers
+    
+    def test_route_is_not_taken_for_a_user_id(self, client, fake_pool):
+        """Test /users/search is matched before /users/{user_id}"""
+        client.get("/users/search?q=ada")
+        
+        assert fake_pool.calls[-1][0] == "fetch"
+        assert "websearch_to_tsquery" in fake_pool.calls[-1][1]
+    
+    @pytest.mark.parametrize("params", ["q=a", "q=ada&limit=0", "q=ada&cursor=bogus"])
+    def test_invalid_input_is_400(self, client, fake_pool, params):
+        """Test bad queries are rejected before touching the database"""
+        assert client.get(f"/users/search?{params}").status_code == 400
+        assert fake_pool.calls == []
+
+
+# ==============================================================================
+# SECTION 21: SPARSE FIELDSET TESTS
+# ==============================================================================
+
+class TestSparseFields:
+    """Tests for ?fields= on list and detail endpoints"""
+    
+    def test_list_selects_and_returns_only_requested_columns(self, client, fake_pool):
+        """Test the SELECT list and the payload both shrink"""
+        fake_pool.responder = lambda method, query, args: [
+            {"id": USER_IDS[0], "username": "ada"}
+        ] if method == "fetch" else None
+        
+        response = client.get("/users?fields=username")
+        
+        assert response.status_code == 200
+        assert response.json() == [{"id": USER_IDS[0], "username": "ada"}]
+        page_query = page_calls(fake_pool)[0][1]
+        assert "SELECT id, username\n" in page_query
+        assert "email" not in page_query
+    
+    def test_ids_lookup_keeps_requested_order(self, client, fake_pool):
+        """Test ?ids= with fields still returns users in the requested order"""
+        fake_pool.responder = lambda method, query, args: [
+            {"id": USER_IDS[0], "email": "a@example.com"},
+            {"id": USER_IDS[1], "email": "b@example.com"},
+        ]
+        
+        response = client.get(f"/users?ids={USER_IDS[1]},{USER_IDS[0]}&fields=email")
+        
+        assert [user["id"] for user in response.json()] == [USER_IDS[1], USER_IDS[0]]
+        assert set(response.json()[0]) == {"id", "email"}
+    
+    def test_detail_is_trimmed(self, client, fake_pool):
+        """Test GET /users/{id}?fields= drops unrequested fields"""
+        row = make_user(USER_IDS[2])
+        fake_pool.responder = lambda method, query, args: row if method == "fetchrow" else [row]
+        
+        response = client.get(f"/users/{USER_IDS[2]}?fields=is_active")
+        
+        assert response.json() == {"id": USER_IDS[2], "is_active": True}
+    
+    def test_unknown_field_is_400(self, client, fake_pool):
+        """Test only model fields are accepted"""
+        response = client.get("/projects?fields=name,owner_id")
+        
+        assert response.status_code == 400
+        assert "owner_id" in response.json()["error"]
+        assert fake_pool.calls == []
+
+
+# ==============================================================================
+# SECTION 22: BATCH TESTS
+# ==============================================================================
+
+class TestBatch:
+    """Tests for POST /batch"""
+    
+    def test_user_lookups_share_one_query(self, client, fake_pool):
+        """Test concurrent get_user items coalesce into a single ANY($1) query"""
+        rows = [make_user(user_id) for user_id in USER_IDS[:3]]
+        fake_pool.responder = lambda method, query, args: rows
+        
+        # A wider batch window so a slow machine can't split the batch
+        with patch.object(user_loader, "window", 0.05):
+            response = client.post("/batch", json={
+                "requests": [f"/users/{user_id}" for user_id in USER_IDS[:3]]
+            })
+        
+        assert response.status_code == 200
+        items = response.json()["responses"]
+        assert [item["status"] for item in items] == [200, 200, 200]
+        assert [item["body"]["id"] for item in items] == USER_IDS[:3]
+        assert len(fake_pool.calls) == 1
+    
+    def test_items_have_their_own_status(self, client, fake_pool):
+        """Test a 404 or 400 item doesn't fail the batch"""
+        response = client.post("/batch", json={
+            "requests": ["/users/not-a-uuid", "/projects?fields=bogus", "/projects?limit=2"]
+        })
+        
+        statuses = [item["status"] for item in response.json()["responses"]]
+        assert statuses == [404, 400, 200]
+        assert response.json()["responses"][1]["body"]["error"].startswith("Unknown fields")
+    
+    def test_batch_size_is_capped(self, client, fake_pool):
+        """Test oversized batches are rejected up front"""
+        response = client.post("/batch", json={"requests": ["/projects"] * 21})
+        
+        assert response.status_code == 422
+        assert fake_pool.calls == []
+
+
+# ==============================================================================
+# SECTION 23: USER PROJECTS TESTS
+# ==============================================================================
+
+PROJECT_JSON = json.dumps([{
+    "id": "456e7890-e89b-12d3-a456-426614174000", "name": "Apollo", "description": None,
+    "status": "active", "created_at": "2024-01-01T00:00:00+00:00"
+}])
+
+
+class TestUserProjects:
+    """Tests for /users/{id}/projects and ?include=projects"""
+    
+    def test_projects_and_counts_in_one_query(self, client, fake_pool):
+        """Test the page and per-status counts come from a single statement"""
+        fake_pool.responder = lambda method, query, args: {
+            "id": USER_IDS[0], "projects": PROJECT_JSON,
+            "project_counts": '{"active": 1, "archived": 4}'
+        }
+        
+        response = client.get(f"/users/{USER_IDS[0]}/projects?status=active&limit=5")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [project["name"] for project in data["projects"]] == ["Apollo"]
+        assert data["status_counts"] == {"active": 1, "archived": 4}
+        assert data["total"] == 5
+        assert len(fake_pool.calls) == 1
+        assert fake_pool.calls[0][2] == (USER_IDS[0], 5, 0, "active")
+    
+    def test_unknown_user_is_404(self, client, fake_pool):
+        """Test a missing user row means 404, not an empty list"""
+        response = client.get(f"/users/{USER_IDS[1]}/projects")
+        
+        assert response.status_code == 404
+    
+    def test_get_user_include_projects(self, client, fake_pool):
+        """Test ?include=projects embeds projects without a second request"""
+        row = dict(make_user(USER_IDS[2]), projects=PROJECT_JSON, project_counts='{"active": 1}')
+        fake_pool.responder = lambda method, query, args: row
+        
+        response = client.get(f"/users/{USER_IDS[2]}?include=projects")
+        
+        data = response.json()
+        assert data["username"] == row["username"]
+        assert data["projects"][0]["id"] == "456e7890-e89b-12d3-a456-426614174000"
+        assert data["project_counts"] == {"active": 1}
+        assert len(fake_pool.calls) == 1
+    
+    def test_include_and_fields_are_exclusive(self, client, fake_pool):
+        """Test the two shaping options can't be combined"""
+        response = client.get(f"/users/{USER_IDS[2]}?include=projects&fields=username")
+        
+        assert response.status_code == 400
+        assert fake_pool.calls == []
+
+
+# ==============================================================================
+# SECTION 24: RESPONSE COMPRESSION TESTS
+# ==============================================================================
+
+class TestCompression:
+    """Tests for negotiated response compression"""
+    
+    def test_large_listing_is_compressed(self, client, fake_pool):
+        """Test a listing over the size threshold is sent gzipped"""
+        fake_pool.responder = lambda method, query, args: [
+            make_user(USER_IDS[i % 3]) for i in range(30)
+        ]
+        
+        response = client.get("/users?limit=30", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert len(response.json()) == 30
+    
+    def test_small_response_is_not_compressed(self, client, fake_pool):
+        """Test a body under the threshold is sent as-is"""
+        fake_pool.responder = lambda method, query, args: [make_user(USER_IDS[0])]
+        
+        response = client.get("/users?limit=1", headers={"Accept-Encoding": "gzip"})
+        
+        assert "content-encoding" not in response.headers
+        assert client.get("/metrics").json()["compression"]["skipped_small"] >= 1
+
+
+# ==============================================================================
+# SECTION 25: CIRCUIT BREAKER & ERROR LOG TESTS
+# ==============================================================================
+
+def open_circuit():
+    """Trip db_breaker as consecutive connection failures would"""
+    for _ in range(db_breaker.failure_threshold):
+        db_breaker.record_failure()
+
+
+class TestCircuitBreakerHealth:
+    """Tests for the breaker around writes, /health and aggregated error logs"""
+    
+    @pytest.fixture(autouse=True)
+    def reset_prober(self):
+        health_prober.reset()
+        yield
+        health_prober.reset()
+    
+    def test_health_reports_open_circuit(self, client, fake_pool):
+        """Test /health is degraded and names the circuit state while open"""
+        run_probe(fake_pool)
+        assert client.get("/health").json()["circuit"] == "closed"
+        
+        open_circuit()
+        data = client.get("/health").json()
+        
+        assert data["circuit"] == "open"
+        assert data["status"] == "degraded"
+        with patch("src.main.db_pool", MagicMock()):
+            assert client.get("/health/ready").status_code == 503
+    
+    def test_writes_fail_fast_while_open(self, client, fake_pool):
+        """Test a write is rejected with 503 without touching the pool"""
+        open_circuit()
+        
+        response = client.post("/users", json={
+            "username": "grace", "email": "grace@example.com", "password": "secret123"
+        })
+        
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
+        assert fake_pool.calls == []
+    
+    def test_successful_probe_closes_circuit(self, fake_pool):
+        """Test the background probe closes the circuit once the DB is back"""
+        open_circuit()
+        
+        run_probe(fake_pool)
+        
+        assert db_breaker.state == "closed"
+    
+    def test_failed_probes_open_circuit(self, fake_pool):
+        """Test probes alone open the circuit during a quiet outage"""
+        fake_pool.failure_rate = 1.0
+        
+        for _ in range(db_breaker.failure_threshold):
+            run_probe(fake_pool)
+        
+        assert db_breaker.state == "open"
+    
+    def test_repeated_unhandled_errors_are_aggregated(self, fake_pool):
+        """Test identical 500s log one traceback and count the rest"""
+        fake_pool.responder = lambda method, query, args: 1 / 0
+        client = TestClient(app, raise_server_exceptions=False)
+        before = error_log.stats()
+        
+        for _ in range(5):
+            assert client.get("/projects?limit=3").status_code == 500
+        
+        after = error_log.stats()
+        assert after["logged"] - before["logged"] <= 1
+        assert after["suppressed"] - before["suppressed"] >= 4
+    
+    def test_failed_probes_are_aggregated(self, fake_pool):
+        """Test an outage logs one probe failure per window, not one per probe"""
+        fake_pool.failure_rate = 1.0
+        error_log.flush()
+        before = error_log.stats()
+        
+        for _ in range(5):
+            run_probe(fake_pool)
+        
+        after = error_log.stats()
+        assert after["logged"] - before["logged"] == 1
+        assert after["suppressed"] - before["suppressed"] == 4
+
+
+# ==============================================================================
+# SECTION 26: STORAGE BACKEND TESTS
+# ==============================================================================
+
+@pytest.fixture
+def memory_repository():
+    """Serve the repository-backed endpoints from sample rows in memory"""
+    users, projects = sample_rows(users=30, projects=12)
+    repository = MemoryRepository(users, projects)
+    app.dependency_overrides[get_read_repository] = lambda: repository
+    yield repository
+    app.dependency_overrides.clear()
+
+
+class TestStorageBackends:
+    """Tests for GET /users, /users/{id} and /projects on a local engine"""
+    
+    def test_listings_without_postgres(self, client, memory_repository):
+        """Test pages, totals and sparse fields come from the repository"""
+        users = client.get("/users?limit=5")
+        projects = client.get("/projects?limit=50&fields=name")
+        
+        assert users.status_code == 200
+        assert len(users.json()) == 5
+        assert users.headers["x-total-count"] == "29"
+        assert len(projects.json()) == 8
+        assert set(projects.json()[0]) == {"id", "name"}
+    
+    def test_get_user_and_ids(self, client, memory_repository):
+        """Test single and batched lookups go through the repository"""
+        first, second = asyncio.run(memory_repository.users_page(2, 0))
+        
+        user = client.get(f"/users/{first['id']}")
+        both = client.get(f"/users?ids={second['id']},{first['id']}")
+        
+        assert user.json()["username"] == first["username"]
+        assert [row["username"] for row in both.json()] == [second["username"], first["username"]]
+    
+    def test_postgres_only_options_are_501(self, client, memory_repository):
+        """Test include=projects needs the PostgreSQL engine"""
+        first = asyncio.run(memory_repository.users_page(1, 0))[0]
+        
+        response = client.get(f"/users/{first['id']}?include=projects")
+        
+        assert response.status_code == 501
+
+
 # ==============================================================================
 # NOTES FOR STUDENTS
 # ==============================================================================
@@ -0,0 +1,108 @@
+"""
+==============================================================================
+Unit Tests for Schema Migrations
+==============================================================================
+Location: tests/test_migrations.py
+Purpose: Verify migrations apply once, in order, under the advisory lock
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import pytest
+
+from src.fakes import FakeConnection, FakePool
+from src.migrations import MIGRATIONS, Migration, migrate
+from src.search import PROJECTS_SEARCH_VECTOR, USERS_SEARCH_VECTOR
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+def connection(applied=()):
+    """Fake connection whose schema_migrations holds `applied`"""
+    def respond(method, query, args):
+        if query.startswith("SELECT version"):
+            return [{"version": version} for version in applied]
+        return "OK"
+
+    pool = FakePool(responder=respond)
+    return pool, FakeConnection(pool)
+
+
+def executed(pool):
+    return [query for method, query, _ in pool.calls if method == "execute"]
+
+
+# ==============================================================================
+# SECTION 1: APPLYING
+# ==============================================================================
+
+class TestMigrate:
+    """Tests for migrate()"""
+
+    def test_applies_pending_in_version_order(self):
+        """Test unapplied migrations run in order and are recorded"""
+        pool, conn = connection(applied=[1])
+        migrations = [Migration(3, "c", ("SELECT 3",)), Migration(2, "b", ("SELECT 2",)),
+                      Migration(1, "a", ("SELECT 1",))]
+
+        assert asyncio.run(migrate(conn, migrations)) == [2, 3]
+
+        statements = executed(pool)
+        assert statements[0] == "SELECT pg_advisory_lock($1)"
+        assert statements[-1] == "SELECT pg_advisory_unlock($1)"
+        assert statements.index("SELECT 2") < statements.index("SELECT 3")
+        assert "SELECT 1" not in statements
+        recorded = [args for method, query, args in pool.calls if query.startswith("INSERT")]
+        assert recorded == [(2, "b"), (3, "c")]
+
+    def test_failure_releases_lock_and_skips_record(self):
+        """Test a failing statement stops the run without recording it"""
+        pool, conn = connection()
+        pool.failures.extend([None, None, RuntimeError("boom")])   # lock, table, statement
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(migrate(conn, [Migration(1, "a", ("SELECT 1",))]))
+
+        assert executed(pool)[-1] == "SELECT pg_advisory_unlock($1)"
+        assert not any(query.startswith("INSERT") for _, query, _ in pool.calls)
+
+
+# ==============================================================================
+# SECTION 2: SEARCH INDEXES
+# ==============================================================================
+
+class TestSearchIndexes:
+    """Tests for the shipped index migrations"""
+
+    def test_indexes_use_the_query_expressions(self):
+        """Test the GIN indexes are built on the exact search vectors"""
+        statements = " ".join(s for m in MIGRATIONS for s in m.statements)
+
+        assert f"(({USERS_SEARCH_VECTOR}))" in statements
+        assert f"(({PROJECTS_SEARCH_VECTOR}))" in statements
+
+    def test_concurrent_builds_run_outside_transactions(self):
+        """Test CREATE INDEX CONCURRENTLY is never wrapped in a transaction"""
+        for migration in MIGRATIONS:
+            if any("CONCURRENTLY" in s for s in migration.statements):
+                assert not migration.transactional
+
+    def test_owner_index_includes_only_bounded_columns(self):
+        """Test unbounded text stays out of the owner index (btree row size limit)"""
+        owner = [s for m in MIGRATIONS for s in m.statements
+                 if s.startswith("CREATE INDEX CONCURRENTLY projects_owner_idx")]
+
+        assert owner
+        for statement in owner:
+            assert "INCLUDE (id, name, status)" in statement
+            assert "description" not in statement
+
+    def test_owner_index_is_rebuilt_after_version_4(self):
+        """Test databases that applied the wide version 4 get the narrow index"""
+        latest = max(m.version for m in MIGRATIONS
+                     if any("projects_owner_idx" in s for s in m.statements))
+
+        assert latest > 4
@@ -0,0 +1,67 @@
+"""
+==============================================================================
+Unit Tests for Password Hashing
+==============================================================================
+Location: tests/test_passwords.py
+Purpose: Verify bcrypt hashing through the process pool
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import pytest
+
+from src.deadlines import reset_deadline, set_deadline
+from src.passwords import PasswordHasher, verify_password
+
+
+@pytest.fixture
+def hasher():
+    """Two-worker hasher, shut down after the test"""
+    hasher = PasswordHasher(workers=2, chunk_size=2)
+    yield hasher
+    hasher.shutdown()
+
+
+class TestPasswordHasher:
+    """Tests for the process-pool backed hasher"""
+    
+    def test_hash_verifies(self, hasher):
+        """Test a hash produced in a worker verifies in the parent"""
+        digest = asyncio.run(hasher.hash("securepassword123"))
+        
+        assert digest.startswith("$2b$")
+        assert verify_password("securepassword123", digest)
+        assert not verify_password("wrongpassword", digest)
+    
+    def test_hash_many_preserves_order(self, hasher):
+        """Test bulk hashing returns one hash per password, in order"""
+        passwords = ["password-a", "password-b", "password-c"]
+        digests = asyncio.run(hasher.hash_many(passwords))
+        
+        assert len(digests) == 3
+        assert all(verify_password(p, d) for p, d in zip(passwords, digests))
+    
+    def test_hash_many_stops_at_the_deadline(self):
+        """Test queued chunks are cancelled once the request deadline passes"""
+        hasher = PasswordHasher(workers=1, chunk_size=1)
+        passwords = [f"password-{i}" for i in range(20)]
+        
+        async def scenario():
+            token = set_deadline(0.3)
+            try:
+                return await hasher.hash_many(passwords)
+            finally:
+                reset_deadline(token)
+        
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                asyncio.run(scenario())
+        finally:
+            hasher.shutdown()
+    
+    def test_executor_is_lazy(self):
+        """Test no worker processes start until the first hash"""
+        hasher = PasswordHasher(workers=1)
+        assert hasher._executor is None
+        hasher.shutdown()
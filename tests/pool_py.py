@@ -0,0 +1,153 @@
+"""
+==============================================================================
+Unit Tests for the Adaptive Connection Pool Manager
+==============================================================================
+Location: tests/test_pool.py
+Purpose: Verify pool budgeting, acquire limiting, telemetry and autoscaling
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.pool import AcquireLimiter, ManagedPool, pool_budget
+
+
+# ==============================================================================
+# TEST FIXTURES
+# ==============================================================================
+
+@pytest.fixture
+def raw_pool():
+    """Mocked asyncpg pool whose acquire() yields a dummy connection"""
+    pool = MagicMock()
+    mock_acquire = MagicMock()
+    mock_acquire.__aenter__ = AsyncMock(return_value=MagicMock())
+    mock_acquire.__aexit__ = AsyncMock(return_value=None)
+    pool.acquire.return_value = mock_acquire
+    pool.get_size.return_value = 4
+    pool.get_idle_size.return_value = 1
+    return pool
+
+
+# ==============================================================================
+# SECTION 1: CONNECTION BUDGET
+# ==============================================================================
+
+class TestPoolBudget:
+    """Tests for splitting max_connections across workers"""
+    
+    @pytest.mark.parametrize("max_conn,reserved,workers,requested,expected", [
+        (100, 10, 1, 20, 20),    # requested max fits
+        (100, 10, 4, 50, 22),    # budget split across workers
+        (20, 10, 16, 10, 1),     # never below one connection
+    ])
+    def test_budget(self, max_conn, reserved, workers, requested, expected):
+        """Test the per-worker pool cap"""
+        assert pool_budget(max_conn, reserved, workers, requested) == expected
+
+
+# ==============================================================================
+# SECTION 2: LIMITER
+# ==============================================================================
+
+class TestAcquireLimiter:
+    """Tests for the adjustable semaphore"""
+    
+    def test_blocks_at_limit_and_wakes_on_raise(self):
+        """Test callers wait at the limit and proceed when it grows"""
+        limiter = AcquireLimiter(1)
+        
+        async def scenario():
+            await limiter.acquire()
+            waiter = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            assert limiter.waiting == 1
+            limiter.set_limit(2)
+            await asyncio.wait_for(waiter, 1)
+            return limiter.in_use
+        
+        assert asyncio.run(scenario()) == 2
+    
+    def test_cancelled_waiter_does_not_leak_slot(self):
+        """Test a timed-out waiter leaves the count intact"""
+        limiter = AcquireLimiter(1)
+        
+        async def scenario():
+            await limiter.acquire()
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(limiter.acquire(), 0.01)
+            limiter.release()
+            return limiter.in_use, limiter.waiting
+        
+        assert asyncio.run(scenario()) == (0, 0)
+
+
+# ==============================================================================
+# SECTION 3: MANAGED POOL
+# ==============================================================================
+
+class TestManagedPool:
+    """Tests for telemetry and autoscaling"""
+    
+    def test_acquire_records_telemetry(self, raw_pool):
+        """Test acquisitions are counted and timed"""
+        pool = ManagedPool(raw_pool, min_size=1, max_size=4, initial_size=2)
+        
+        async def scenario():
+            async with pool.acquire() as conn:
+                assert pool.limiter.in_use == 1
+            async with pool.acquire(timeout=1):
+                pass
+        
+        asyncio.run(scenario())
+        stats = pool.stats()
+        
+        assert stats["acquire_count"] == 2
+        assert stats["in_use"] == 0
+        assert stats["open_connections"] == 4
+        assert set(stats["acquire_wait_ms"]) == {"p50", "p95", "p99", "max"}
+    
+    def test_acquire_timeout_is_counted(self, raw_pool):
+        """Test waiting past the timeout raises and is counted"""
+        pool = ManagedPool(raw_pool, min_size=1, max_size=1)
+        
+        async def scenario():
+            async with pool.acquire():
+                with pytest.raises(asyncio.TimeoutError):
+                    async with pool.acquire(timeout=0.01):
+                        pass
+        
+        asyncio.run(scenario())
+        assert pool.stats()["acquire_timeouts"] == 1
+    
+    def test_grows_under_sustained_pressure(self, raw_pool):
+        """Test the target rises after `sustain` pressured intervals"""
+        pool = ManagedPool(raw_pool, min_size=1, max_size=5, initial_size=2,
+                           grow_step=2, sustain=2)
+        
+        def saturated_step():
+            pool.limiter.in_use = pool.target_size  # fully utilized
+            return pool.evaluate()
+        
+        assert saturated_step() == 2
+        assert saturated_step() == 4
+        saturated_step()
+        assert saturated_step() == 5  # capped at max_size
+    
+    def test_shrinks_when_idle(self, raw_pool):
+        """Test the target falls after `sustain` idle intervals"""
+        pool = ManagedPool(raw_pool, min_size=2, max_size=10, initial_size=3, sustain=2)
+        
+        pool.evaluate()
+        assert pool.evaluate() == 2
+        pool.evaluate()
+        assert pool.evaluate() == 2  # floored at min_size
+        assert pool.stats()["resizes"] == 1
+    
+    def test_delegates_to_wrapped_pool(self, raw_pool):
+        """Test unknown attributes fall through to asyncpg.Pool"""
+        pool = ManagedPool(raw_pool, min_size=1, max_size=2)
+        assert pool.get_size() == 4
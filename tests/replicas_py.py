@@ -0,0 +1,141 @@
+"""
+==============================================================================
+Unit Tests for Read Replica Routing
+==============================================================================
+Location: tests/test_replicas.py
+Purpose: Verify least-outstanding routing, read-your-writes and polling
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import pytest
+
+from src.fakes import FakePool
+from src.replicas import ReplicaRouter, parse_lsn
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+PRIMARY = object()
+
+
+def make_router(*lsns):
+    """Router with one healthy replica per replay LSN"""
+    router = ReplicaRouter()
+    for index, lsn in enumerate(lsns):
+        replica = router.add(f"replica-{index}", FakePool())
+        replica.healthy = True
+        replica.replay_lsn = parse_lsn(lsn)
+    return router
+
+
+# ==============================================================================
+# SECTION 1: LSN TOKENS
+# ==============================================================================
+
+class TestParseLsn:
+    """Tests for LSN parsing"""
+
+    def test_orders_like_postgres(self):
+        """Test the high word dominates the comparison"""
+        assert parse_lsn("0/16B3748") == 0x16B3748
+        assert parse_lsn("1/0") > parse_lsn("0/FFFFFFFF")
+
+    def test_rejects_garbage(self):
+        """Test malformed tokens raise ValueError"""
+        with pytest.raises(ValueError):
+            parse_lsn("yesterday")
+
+
+# ==============================================================================
+# SECTION 2: ROUTING
+# ==============================================================================
+
+class TestRouting:
+    """Tests for replica selection"""
+
+    def test_least_outstanding_replica_wins(self):
+        """Test reads go to the replica with the fewest requests in flight"""
+        router = make_router("0/10", "0/10")
+        router.replicas[0].outstanding = 3
+
+        assert router.route(PRIMARY) is router.replicas[1]
+
+    def test_token_skips_lagging_replicas(self):
+        """Test only replicas that replayed past the token are eligible"""
+        router = make_router("0/10", "0/20")
+
+        assert router.route(PRIMARY, token="0/18") is router.replicas[1]
+
+    def test_token_ahead_of_every_replica_uses_primary(self):
+        """Test read-your-writes falls back to the primary"""
+        router = make_router("0/10")
+
+        assert router.route(PRIMARY, token="0/11") is PRIMARY
+        assert router.stats()["stale_fallbacks"] == 1
+
+    def test_unhealthy_replicas_are_skipped(self):
+        """Test a replica out of rotation gets no reads"""
+        router = make_router("0/10")
+        router.replicas[0].healthy = False
+
+        assert router.route(PRIMARY) is PRIMARY
+
+    def test_malformed_token_uses_primary(self):
+        """Test an unreadable token is treated conservatively"""
+        assert make_router("0/10").route(PRIMARY, token="garbage") is PRIMARY
+
+    def test_hedge_alternate_is_never_staler(self):
+        """Test hedged duplicates only go to replicas at least as current"""
+        router = make_router("0/20", "0/10", "0/30")
+        first, behind, ahead = router.replicas
+
+        assert router.alternate(first) is ahead
+        assert router.alternate(PRIMARY) is PRIMARY
+
+    def test_acquire_counts_outstanding(self):
+        """Test replica.acquire() tracks in-flight use"""
+        router = make_router("0/10")
+        replica = router.replicas[0]
+        seen = []
+
+        async def use():
+            async with replica.acquire() as conn:
+                seen.append(replica.outstanding)
+                await conn.fetch("SELECT 1")
+
+        asyncio.run(use())
+        assert seen == [1]
+        assert replica.outstanding == 0
+
+
+# ==============================================================================
+# SECTION 3: POLLING
+# ==============================================================================
+
+class TestPolling:
+    """Tests for replay-position polling"""
+
+    def test_poll_updates_lsn_and_health(self):
+        """Test a successful poll puts the replica in rotation"""
+        router = ReplicaRouter()
+        replica = router.add("replica-0", FakePool(responder=lambda *_: "0/2A"))
+
+        asyncio.run(router.poll(replica))
+
+        assert replica.healthy
+        assert replica.replay_lsn == 0x2A
+
+    def test_failed_poll_removes_replica(self):
+        """Test a replica that can't answer leaves the rotation"""
+        router = make_router("0/10")
+        replica = router.replicas[0]
+        replica.pool.failures.append(ConnectionRefusedError())
+
+        asyncio.run(router.poll(replica))
+
+        assert not replica.healthy
+        assert router.route(PRIMARY) is PRIMARY
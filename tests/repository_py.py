@@ -0,0 +1,126 @@
+"""
+==============================================================================
+Unit Tests for Storage Backends
+==============================================================================
+Location: tests/test_repository.py
+Purpose: Verify the in-memory and SQLite engines agree on the repository
+         contract, and DATABASE_URL scheme selection
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+
+import pytest
+
+from src.repository import (
+    MemoryRepository,
+    SQLiteRepository,
+    open_repository,
+    sample_rows,
+)
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+USERS, PROJECTS = sample_rows(users=40, projects=30)
+
+
+def memory():
+    return MemoryRepository(USERS, PROJECTS)
+
+
+def sqlite():
+    return SQLiteRepository(":memory:", sample=(USERS, PROJECTS))
+
+
+def run(repository, method, *args):
+    """Call one repository coroutine method and close the engine"""
+    async def call():
+        try:
+            return await getattr(repository, method)(*args)
+        finally:
+            await repository.close()
+    return asyncio.run(call())
+
+
+ENGINES = pytest.mark.parametrize("make", [memory, sqlite], ids=["memory", "sqlite"])
+
+
+# ==============================================================================
+# SECTION 1: CONTRACT
+# ==============================================================================
+
+class TestRepositoryContract:
+    """Tests both local engines against the same expectations"""
+
+    @ENGINES
+    def test_users_page_skips_deleted_newest_first(self, make):
+        """Test soft-deleted users are hidden and pages are newest first"""
+        rows = run(make(), "users_page", 25, 0)
+
+        live = [user for user in USERS if user["deleted_at"] is None]
+        assert [row["id"] for row in rows] == [user["id"] for user in live[:25]]
+        assert rows[0]["created_at"] > rows[-1]["created_at"]
+        assert isinstance(rows[0]["is_active"], bool)
+
+    @ENGINES
+    def test_user_lookups(self, make):
+        """Test single and multi-id lookups; deleted and unknown ids are absent"""
+        deleted = next(user for user in USERS if user["deleted_at"] is not None)
+        ids = [str(USERS[0]["id"]), str(deleted["id"]), "00000000-0000-0000-0000-000000000000"]
+
+        assert run(make(), "user_by_id", ids[0])["username"] == USERS[0]["username"]
+        assert run(make(), "user_by_id", ids[1]) is None
+        assert [row["username"] for row in run(make(), "users_by_ids", ids)] == [USERS[0]["username"]]
+
+    @ENGINES
+    def test_projects_page_only_active(self, make):
+        """Test the projects listing applies the active filter"""
+        rows = run(make(), "projects_page", 100, 0)
+
+        assert len(rows) == 20
+        assert {row["status"] for row in rows} == {"active"}
+
+    @ENGINES
+    def test_counts_match_listings(self, make):
+        """Test counts use the same filters as the pages"""
+        assert run(make(), "exact_count", "users") == 38
+        assert run(make(), "estimate_count", "projects") == 20
+
+
+# ==============================================================================
+# SECTION 2: SELECTION
+# ==============================================================================
+
+class TestOpenRepository:
+    """Tests for open_repository()"""
+
+    def test_postgres_is_not_local(self):
+        """Test PostgreSQL URLs leave the asyncpg path in charge"""
+        assert open_repository("postgresql://u:p@db:5432/app") is None
+        assert open_repository("postgres://db/app") is None
+
+    def test_memory_with_sample_rows(self):
+        """Test memory:// seeds the requested sample sizes"""
+        repository = open_repository("memory://?users=20&projects=3")
+
+        assert isinstance(repository, MemoryRepository)
+        assert run(repository, "exact_count", "users") == 19
+        assert run(repository, "exact_count", "projects") == 2
+
+    def test_sqlite_path(self, tmp_path):
+        """Test sqlite:/// URLs name a file that keeps its rows"""
+        path = tmp_path / "bench.db"
+        first = open_repository(f"sqlite:///{path}?users=5")
+
+        assert isinstance(first, SQLiteRepository)
+        assert run(first, "exact_count", "users") == 5
+        assert run(open_repository(f"sqlite:///{path}?users=50"), "exact_count", "users") == 5
+
+    def test_unknown_scheme(self):
+        """Test unsupported schemes are rejected at startup"""
+        with pytest.raises(ValueError):
+            open_repository("mysql://db/app")
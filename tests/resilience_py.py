@@ -0,0 +1,328 @@
+"""
+==============================================================================
+Unit Tests for Resilient Reads
+==============================================================================
+Location: tests/test_resilience.py
+Purpose: Verify retry, hedging and circuit breaking against a fake pool
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import asyncpg
+import pytest
+
+from src.deadlines import reset_deadline, set_deadline
+from src.fakes import FakePool
+from src.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Hedger,
+    ResilientReader,
+    RetryPolicy,
+    is_transient,
+)
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+async def select(pool):
+    """The read under test: one fetchval on a fresh connection"""
+    async with pool.acquire() as conn:
+        return await conn.fetchval("SELECT 1")
+
+
+def make_reader(**kwargs):
+    options = {"retry": RetryPolicy(attempts=3, base_delay=0.001),
+               "breaker": CircuitBreaker(failure_threshold=3, reset_timeout=60)}
+    options.update(kwargs)
+    return ResilientReader(**options)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# ==============================================================================
+# SECTION 1: FAKE POOL
+# ==============================================================================
+
+class TestFakePool:
+    """Tests for the injectable fake"""
+
+    def test_scripted_failures_then_success(self):
+        """Test failures are raised in order, then statements succeed"""
+        pool = FakePool(responder=lambda *_: 1, failures=[ConnectionResetError()])
+
+        with pytest.raises(ConnectionResetError):
+            asyncio.run(select(pool))
+        assert asyncio.run(select(pool)) == 1
+        assert len(pool.calls) == 2
+
+    def test_latency_beyond_timeout_raises(self):
+        """Test a statement slower than its timeout raises TimeoutError"""
+        pool = FakePool(latency=1.0)
+
+        async def slow():
+            async with pool.acquire() as conn:
+                return await conn.fetch("SELECT 1", timeout=0.01)
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(slow())
+
+
+# ==============================================================================
+# SECTION 2: RETRY
+# ==============================================================================
+
+class TestRetry:
+    """Tests for retrying transient errors"""
+
+    def test_transient_errors_are_retried(self):
+        """Test connection resets are retried until the read succeeds"""
+        pool = FakePool(
+            responder=lambda *_: 1,
+            failures=[ConnectionResetError(), asyncpg.ConnectionDoesNotExistError()]
+        )
+        reader = make_reader()
+
+        assert asyncio.run(reader.run(pool, select)) == 1
+        assert reader.retries == 2
+        assert reader.breaker.state == CircuitBreaker.CLOSED
+
+    def test_query_errors_are_not_retried(self):
+        """Test non-transient errors surface immediately"""
+        pool = FakePool(failures=[asyncpg.UndefinedTableError("no such table")])
+        reader = make_reader()
+
+        with pytest.raises(asyncpg.UndefinedTableError):
+            asyncio.run(reader.run(pool, select))
+        assert len(pool.calls) == 1
+
+    def test_gives_up_after_attempts(self):
+        """Test the last transient error is raised once attempts run out"""
+        pool = FakePool(failure_rate=1.0)
+        reader = make_reader(breaker=CircuitBreaker(failure_threshold=100))
+
+        with pytest.raises(ConnectionResetError):
+            asyncio.run(reader.run(pool, select))
+        assert len(pool.calls) == 3
+
+    def test_no_retry_past_deadline(self):
+        """Test a backoff that would outlive the deadline is skipped"""
+        pool = FakePool(failures=[ConnectionResetError()])
+        reader = make_reader(retry=RetryPolicy(attempts=3, base_delay=10, max_delay=10))
+
+        async def scenario():
+            token = set_deadline(0.05)
+            try:
+                await reader.run(pool, select)
+            finally:
+                reset_deadline(token)
+
+        with pytest.raises(ConnectionResetError):
+            asyncio.run(scenario())
+        assert len(pool.calls) == 1
+
+    @pytest.mark.parametrize("error,expected", [
+        (ConnectionRefusedError(), True),
+        (asyncpg.AdminShutdownError(""), True),
+        (asyncio.TimeoutError(), True),     # a hung server
+        (asyncpg.UniqueViolationError(""), False),
+        (ValueError(), False),
+    ])
+    def test_is_transient(self, error, expected):
+        """Test classification of retryable errors"""
+        assert is_transient(error) is expected
+
+
+# ==============================================================================
+# SECTION 3: CIRCUIT BREAKER
+# ==============================================================================
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions"""
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        """Test consecutive failures open the circuit; reads then skip the DB"""
+        pool = FakePool(failure_rate=1.0)
+        reader = make_reader(retry=RetryPolicy(attempts=1))
+
+        for _ in range(3):
+            with pytest.raises(ConnectionResetError):
+                asyncio.run(reader.run(pool, select))
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(reader.run(pool, select))
+
+        assert len(pool.calls) == 3
+        assert reader.breaker.stats()["state"] == "open"
+        assert reader.breaker.rejected == 1
+
+    def test_half_open_trial_closes_on_success(self):
+        """Test one trial request is let through after the cool-down"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now = 5
+        assert breaker.state == "half_open"
+        breaker.allow()                     # the trial
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()                 # everyone else waits for it
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_half_open_trial_failure_reopens(self):
+        """Test a failed trial restarts the cool-down"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now = 5
+        breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert breaker.retry_after() == 5
+
+    def test_guard_fails_fast_and_records_outcomes(self):
+        """Test guard() gates a single write and classifies its error"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        async def write(error=None):
+            async with breaker.guard():
+                if error is not None:
+                    raise error
+                return "ok"
+
+        with pytest.raises(asyncpg.UniqueViolationError):
+            asyncio.run(write(asyncpg.UniqueViolationError()))
+        assert breaker.failures == 0          # the server answered
+
+        for _ in range(2):
+            with pytest.raises(ConnectionRefusedError):
+                asyncio.run(write(ConnectionRefusedError()))
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(write())
+
+        assert breaker.state == "open"
+        assert breaker.rejected == 1
+
+
+# ==============================================================================
+# SECTION 4: HEDGING
+# ==============================================================================
+
+class TestHedging:
+    """Tests for duplicate reads after the p95 latency"""
+
+    def test_slow_first_attempt_is_hedged(self):
+        """Test the duplicate read answers when the first one is stuck"""
+        primary = FakePool(responder=lambda *_: "primary", latency=1.0)
+        replica = FakePool(responder=lambda *_: "replica")
+        hedger = Hedger(min_samples=1, min_delay=0.01)
+        hedger.observe(0.01)
+        reader = make_reader(hedger=hedger, hedge_pool=lambda pool: replica)
+
+        assert asyncio.run(reader.run(primary, select)) == "replica"
+        assert hedger.stats()["hedged"] == 1
+        assert hedger.stats()["hedge_wins"] == 1
+
+    def test_fast_reads_are_not_hedged(self):
+        """Test reads finishing before the threshold run once"""
+        pool = FakePool(responder=lambda *_: 1)
+        hedger = Hedger(min_samples=1, min_delay=0.5)
+        hedger.observe(0.5)
+        reader = make_reader(hedger=hedger)
+
+        assert asyncio.run(reader.run(pool, select)) == 1
+        assert len(pool.calls) == 1
+        assert hedger.hedged == 0
+
+    def test_no_hedging_before_enough_samples(self):
+        """Test the hedger stays quiet until it has a latency estimate"""
+        hedger = Hedger(min_samples=10)
+        for _ in range(9):
+            hedger.observe(0.1)
+        assert hedger.delay() is None
+        hedger.observe(0.1)
+        assert hedger.delay() == pytest.approx(0.1)
+
+    def test_thresholds_are_per_statement(self):
+        """Test a slow statement's latency doesn't set the fast one's threshold"""
+        hedger = Hedger(min_samples=1)
+        hedger.observe(2.0, key="SELECT count(*) FROM users")
+        hedger.observe(0.02, key="SELECT * FROM users WHERE id = $1")
+
+        assert hedger.delay("SELECT count(*) FROM users") == pytest.approx(2.0)
+        assert hedger.delay("SELECT * FROM users WHERE id = $1") == pytest.approx(0.02)
+        assert hedger.delay("SELECT 1") is None
+
+    def test_no_hedge_without_an_alternate_pool(self):
+        """Test a slow read is not duplicated onto the same pool"""
+        pool = FakePool(responder=lambda *_: 1, latency=0.05)
+        hedger = Hedger(min_samples=1, min_delay=0.01)
+        hedger.observe(0.01)
+        reader = make_reader(hedger=hedger, hedge_pool=lambda pool: pool)
+
+        assert asyncio.run(reader.run(pool, select)) == 1
+        assert len(pool.calls) == 1
+        assert hedger.hedged == 0
+
+
+# ==============================================================================
+# SECTION 5: PER-POOL BREAKERS & FALLBACK
+# ==============================================================================
+
+class TestFallback:
+    """Tests for per-pool breakers and moving reads off a failing pool"""
+
+    def make_pair(self, replica):
+        """Reader whose replica fails over to a healthy primary"""
+        primary = FakePool(responder=lambda *_: "primary")
+        breakers = {id(primary): CircuitBreaker(failure_threshold=3, reset_timeout=60),
+                    id(replica): CircuitBreaker(failure_threshold=3, reset_timeout=60)}
+        reader = make_reader(
+            breaker=breakers[id(primary)],
+            breaker_for=lambda pool: breakers[id(pool)],
+            fallback_pool=lambda pool: primary if pool is replica else None
+        )
+        return reader, primary, breakers[id(replica)]
+
+    def test_transient_failure_moves_to_the_fallback(self):
+        """Test a failed replica read is retried on the fallback pool"""
+        replica = FakePool(failure_rate=1.0)
+        reader, primary, replica_breaker = self.make_pair(replica)
+
+        assert asyncio.run(reader.run(replica, select)) == "primary"
+        assert len(replica.calls) == 1
+        assert replica_breaker.failures == 1
+        assert reader.breaker.failures == 0
+        assert reader.fallbacks == 1
+
+    def test_open_replica_circuit_reads_the_fallback(self):
+        """Test a replica's open circuit skips it without failing the read"""
+        replica = FakePool(failure_rate=1.0)
+        reader, primary, replica_breaker = self.make_pair(replica)
+        for _ in range(3):
+            replica_breaker.record_failure()
+
+        assert asyncio.run(reader.run(replica, select)) == "primary"
+        assert replica.calls == []
+        assert reader.breaker.state == CircuitBreaker.CLOSED
+
+    def test_no_fallback_raises_circuit_open(self):
+        """Test the primary's open circuit still fails fast"""
+        replica = FakePool()
+        reader, primary, _ = self.make_pair(replica)
+        for _ in range(3):
+            reader.breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(reader.run(primary, select))
@@ -0,0 +1,153 @@
+"""
+==============================================================================
+Unit Tests for Full-Text Search Helpers
+==============================================================================
+Location: tests/test_search.py
+Purpose: Verify keyset cursors, query normalization and the candidate cap
+Framework: pytest (the Postgres test needs TEST_DATABASE_URL)
+==============================================================================
+"""
+
+import asyncio
+import os
+import re
+import uuid
+
+import pytest
+
+from src.main import PROJECTS_SEARCH_SQL, USERS_SEARCH_SQL
+from src.search import decode_cursor, encode_cursor, normalize_query
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def cte(sql, name):
+    """Body of the named CTE, whitespace collapsed"""
+    body = sql.split(f"{name} AS (", 1)[1].split("\n    )", 1)[0]
+    return re.sub(r"\s+", " ", body).strip()
+
+
+async def search_pages(url, text, cap, page_size, scanned):
+    """Page through USERS_SEARCH_SQL over a temporary users table"""
+    import asyncpg
+
+    conn = await asyncpg.connect(url)
+    try:
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        await conn.execute("""
+            CREATE TEMP TABLE users (
+                id uuid PRIMARY KEY, username text, email text, full_name text,
+                is_active boolean, created_at timestamptz, deleted_at timestamptz
+            )
+        """)
+        # Weak matches first, the best one last: an uncapped heap scan
+        # reaches the cap long before it sees it
+        for i in range(4 * cap):
+            await conn.execute(
+                "INSERT INTO users VALUES ($1, $2, $3, 'Someone Else', true, now(), NULL)",
+                uuid.uuid4(), f"{text}{i:04d}xyz", f"user{i}@example.com"
+            )
+        await conn.execute(
+            "INSERT INTO users VALUES ($1, $2, $3, $4, true, now(), NULL)",
+            uuid.uuid4(), text, f"{text}@example.com", f"{text} {text}"
+        )
+
+        pages, after_rank, after_id = [], None, None
+        while True:
+            rows = await conn.fetch(
+                USERS_SEARCH_SQL, text, after_rank, after_id, page_size, cap, scanned
+            )
+            if not rows:
+                return pages
+            pages.append(rows)
+            after_rank, after_id = rows[-1]["rank"], rows[-1]["id"]
+    finally:
+        await conn.close()
+
+
+# ==============================================================================
+# SECTION 1: CURSORS
+# ==============================================================================
+
+class TestCursor:
+    """Tests for the opaque keyset cursor"""
+
+    def test_round_trip(self):
+        """Test a cursor decodes to the rank and id it was built from"""
+        row_id = "11111111-1111-1111-1111-111111111111"
+        token = encode_cursor(0.0759, row_id)
+
+        assert decode_cursor(token) == (0.0759, row_id)
+        assert "=" not in token
+
+    @pytest.mark.parametrize("token", ["", "not-base64!", "WzEsMl0", "WzAuMSwibm9wZSJd"])
+    def test_malformed_tokens_raise_value_error(self, token):
+        """Test garbage, wrong shapes and non-UUID ids are rejected"""
+        with pytest.raises(ValueError):
+            decode_cursor(token)
+
+
+# ==============================================================================
+# SECTION 2: QUERY TEXT
+# ==============================================================================
+
+class TestNormalizeQuery:
+    """Tests for search text cleanup"""
+
+    def test_collapses_whitespace(self):
+        assert normalize_query("  ada \t lovelace ") == "ada lovelace"
+
+    @pytest.mark.parametrize("q", ["", " a ", "x" * 201])
+    def test_rejects_too_short_or_long(self, q):
+        assert normalize_query(q) is None
+
+
+# ==============================================================================
+# SECTION 3: CANDIDATE CAP
+# ==============================================================================
+
+class TestCandidateCap:
+    """Tests for the cap on matches ranked per search"""
+
+    @pytest.mark.parametrize("sql", [USERS_SEARCH_SQL, PROJECTS_SEARCH_SQL])
+    def test_index_matches_are_capped_before_ranking(self, sql):
+        """Test the scan stops at $6 matches and nothing is ranked until then"""
+        hits = cte(sql, "hits")
+
+        assert hits.endswith("LIMIT $6")
+        assert "ts_rank" not in hits and "similarity" not in hits
+        assert "FROM hits" in cte(sql, "matches")
+
+    @pytest.mark.parametrize("sql", [USERS_SEARCH_SQL, PROJECTS_SEARCH_SQL])
+    def test_candidates_are_ranked_before_the_cap(self, sql):
+        """Test the candidate cap keeps the best scanned matches, not an arbitrary $5"""
+        assert cte(sql, "matches").endswith("ORDER BY rank DESC, id DESC LIMIT $5")
+
+    @pytest.mark.integration
+    @pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+    def test_more_matches_than_the_cap(self):
+        """Test the best row survives the cap and pages neither skip nor repeat"""
+        pages = asyncio.run(
+            search_pages(TEST_DATABASE_URL, "lovelace", cap=10, page_size=3, scanned=100)
+        )
+        rows = [row for page in pages for row in page]
+
+        assert rows[0]["username"] == "lovelace"
+        assert len(rows) == 10
+        assert len({row["id"] for row in rows}) == 10
+        assert [row["rank"] for row in rows] == sorted((row["rank"] for row in rows), reverse=True)
+
+    @pytest.mark.integration
+    @pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+    def test_scan_cap_bounds_the_candidates(self):
+        """Test no more than $6 index matches are considered for a common term"""
+        pages = asyncio.run(
+            search_pages(TEST_DATABASE_URL, "lovelace", cap=10, page_size=3, scanned=5)
+        )
+
+        assert sum(len(page) for page in pages) == 5
@@ -0,0 +1,72 @@
+"""
+==============================================================================
+Unit Tests for the Production Server Launcher
+==============================================================================
+Location: tests/test_server.py
+Purpose: Verify CPU-quota detection, worker sizing and recycle limits
+Framework: pytest
+==============================================================================
+"""
+
+import pytest
+
+from src.server import cgroup_cpu_limit, recycle_limit, worker_count
+
+
+# ==============================================================================
+# SECTION 1: CGROUP CPU QUOTA
+# ==============================================================================
+
+class TestCgroupCpuLimit:
+    """Tests for reading the container CPU quota"""
+    
+    @pytest.mark.parametrize("content,expected", [
+        ("100000 100000\n", 1.0),   # cpus: '1.0'
+        ("150000 100000\n", 1.5),
+        ("max 100000\n", None),     # unlimited
+    ])
+    def test_cgroup_v2(self, tmp_path, content, expected):
+        """Test cpu.max parsing"""
+        (tmp_path / "cpu.max").write_text(content)
+        assert cgroup_cpu_limit(str(tmp_path)) == expected
+    
+    def test_cgroup_v1(self, tmp_path):
+        """Test cfs quota/period parsing"""
+        (tmp_path / "cpu").mkdir()
+        (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("200000\n")
+        (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+        assert cgroup_cpu_limit(str(tmp_path)) == 2.0
+    
+    def test_no_cgroup(self, tmp_path):
+        """Test hosts without cgroup files report no limit"""
+        assert cgroup_cpu_limit(str(tmp_path)) is None
+
+
+# ==============================================================================
+# SECTION 2: WORKER SIZING
+# ==============================================================================
+
+class TestWorkerCount:
+    """Tests for choosing the number of worker processes"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_env(self, monkeypatch):
+        """Ignore worker overrides from the surrounding environment"""
+        monkeypatch.delenv("API_WORKERS", raising=False)
+        monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    
+    @pytest.mark.parametrize("cpu_limit,expected", [(1.0, 1), (1.5, 2), (0.5, 1)])
+    def test_follows_cpu_quota(self, cpu_limit, expected):
+        """Test one worker per allowed core, rounded up"""
+        assert worker_count(cpu_limit=cpu_limit) == expected
+    
+    def test_env_override(self, monkeypatch):
+        """Test API_WORKERS wins over the quota"""
+        monkeypatch.setenv("API_WORKERS", "3")
+        assert worker_count(cpu_limit=1.0) == 3
+    
+    def test_recycle_limit_jitter(self):
+        """Test per-worker limits stay within max + jitter"""
+        limits = {recycle_limit(100, 10) for _ in range(50)}
+        assert all(100 <= limit <= 110 for limit in limits)
+        assert recycle_limit(0, 10) is None
@@ -0,0 +1,204 @@
+"""
+==============================================================================
+Unit Tests for Single-Flight Request Coalescing
+==============================================================================
+Location: tests/test_singleflight.py
+Purpose: Verify concurrent identical reads share one execution
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import pytest
+
+from src.deadlines import remaining, reset_deadline, set_deadline
+from src.singleflight import SingleFlight
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+def counting_call(result="row", delay=0.01, error=None):
+    """Return (factory, calls) where calls counts real executions"""
+    calls = []
+    
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+    
+    return fn, calls
+
+
+# ==============================================================================
+# SECTION 1: COALESCING
+# ==============================================================================
+
+class TestCoalescing:
+    """Tests for sharing one execution between callers"""
+    
+    def test_concurrent_calls_share_one_execution(self):
+        """Test identical concurrent calls run the function once"""
+        flight = SingleFlight()
+        fn, calls = counting_call()
+        
+        async def scenario():
+            return await asyncio.gather(*(flight.do("k", fn) for _ in range(50)))
+        
+        results = asyncio.run(scenario())
+        
+        assert results == ["row"] * 50
+        assert len(calls) == 1
+        stats = flight.stats()
+        assert stats["calls"] == 50
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 49
+        assert stats["inflight"] == 0
+    
+    def test_different_keys_run_independently(self):
+        """Test distinct keys are not coalesced"""
+        flight = SingleFlight()
+        fn, calls = counting_call()
+        
+        async def scenario():
+            await asyncio.gather(flight.do("a", fn), flight.do("b", fn))
+        
+        asyncio.run(scenario())
+        assert len(calls) == 2
+    
+    def test_sequential_calls_execute_again(self):
+        """Test a finished flight is not cached"""
+        flight = SingleFlight()
+        fn, calls = counting_call(delay=0)
+        
+        async def scenario():
+            await flight.do("k", fn)
+            await flight.do("k", fn)
+        
+        asyncio.run(scenario())
+        assert len(calls) == 2
+
+
+# ==============================================================================
+# SECTION 2: FAILURES
+# ==============================================================================
+
+class TestFailures:
+    """Tests for error and timeout propagation"""
+    
+    def test_error_reaches_every_waiter(self):
+        """Test an exception is re-raised in all coalesced callers"""
+        flight = SingleFlight()
+        fn, calls = counting_call(error=ValueError("boom"))
+        
+        async def scenario():
+            return await asyncio.gather(
+                *(flight.do("k", fn) for _ in range(5)), return_exceptions=True
+            )
+        
+        results = asyncio.run(scenario())
+        
+        assert len(calls) == 1
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.stats()["errors"] == 1
+    
+    def test_timeout_applies_per_key(self):
+        """Test a slow execution times out for all waiters"""
+        flight = SingleFlight(default_timeout=5)
+        slow, _ = counting_call(delay=1)
+        fast, _ = counting_call(delay=0)
+        
+        async def scenario():
+            return await asyncio.gather(
+                flight.do("slow", slow, timeout=0.01),
+                flight.do("slow", slow),
+                flight.do("fast", fast),
+                return_exceptions=True
+            )
+        
+        results = asyncio.run(scenario())
+        
+        assert isinstance(results[0], asyncio.TimeoutError)
+        assert isinstance(results[1], asyncio.TimeoutError)
+        assert results[2] == "row"
+        assert flight.stats()["timeouts"] == 1
+    
+    def test_cancelled_waiter_does_not_cancel_others(self):
+        """Test one caller going away leaves the shared call running"""
+        flight = SingleFlight()
+        fn, calls = counting_call(delay=0.05)
+        
+        async def scenario():
+            first = asyncio.ensure_future(flight.do("k", fn))
+            second = asyncio.ensure_future(flight.do("k", fn))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+        
+        assert asyncio.run(scenario()) == "row"
+        assert len(calls) == 1
+    
+    def test_last_waiter_leaving_cancels_the_call(self):
+        """Test the shared call is cancelled once nobody waits for it"""
+        flight = SingleFlight()
+        cancelled = []
+        
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+        
+        async def scenario():
+            waiters = [asyncio.ensure_future(flight.do("k", slow)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            await asyncio.sleep(0)
+        
+        asyncio.run(scenario())
+        
+        assert cancelled == [1]
+        assert flight.stats()["abandoned"] == 1
+        assert flight.inflight == 0
+
+
+# ==============================================================================
+# SECTION 3: REQUEST DEADLINES
+# ==============================================================================
+
+class TestDeadlines:
+    """Tests for how callers' request deadlines apply to a shared call"""
+    
+    def test_call_runs_under_the_latest_deadline(self):
+        """Test a leader's short deadline doesn't fail a patient waiter"""
+        flight = SingleFlight()
+        seen = []
+        
+        async def fn():
+            await asyncio.sleep(0.05)
+            seen.append(remaining())   # past the leader's deadline
+            return "row"
+        
+        async def call(timeout):
+            token = set_deadline(timeout)
+            try:
+                return await flight.do("k", fn)
+            finally:
+                reset_deadline(token)
+        
+        async def scenario():
+            leader = asyncio.ensure_future(call(0.01))
+            await asyncio.sleep(0)
+            return await asyncio.gather(leader, call(5), return_exceptions=True)
+        
+        leader, waiter = asyncio.run(scenario())
+        
+        assert isinstance(leader, asyncio.TimeoutError)
+        assert waiter == "row"
+        assert 4 < seen[0] <= 5
@@ -0,0 +1,159 @@
+"""
+==============================================================================
+Unit Tests for Request Tracing & Server-Timing
+==============================================================================
+Location: tests/test_tracing.py
+Purpose: Verify span aggregation, the Server-Timing header and JSONL export
+Framework: pytest (coroutines driven with asyncio.run)
+==============================================================================
+"""
+
+import asyncio
+import json
+import time
+import pytest
+
+from src.tracing import (
+    JsonlTraceExporter,
+    Trace,
+    TracedJSONResponse,
+    TracingMiddleware,
+    current_trace,
+    span,
+)
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+def run_app(app, exporter=None, path="/users"):
+    """Run `app` behind TracingMiddleware and return the sent messages"""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    middleware = TracingMiddleware(app, exporter=exporter)
+    scope = {"type": "http", "method": "GET", "path": path, "headers": []}
+    asyncio.run(middleware(scope, receive, send))
+    return messages
+
+
+async def traced_app(scope, receive, send):
+    """App recording two queries and a model span"""
+    for _ in range(2):
+        with span("query"):
+            await asyncio.sleep(0.001)
+    with span("models"):
+        pass
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"[]"})
+
+
+# ==============================================================================
+# SECTION 1: TRACE
+# ==============================================================================
+
+class TestTrace:
+    """Tests for span bookkeeping"""
+
+    def test_repeated_spans_are_summed(self):
+        """Test totals() adds up spans with the same name"""
+        trace = Trace()
+        trace.add("query", trace.start, 0.002)
+        trace.add("acquire", trace.start, 0.001)
+        trace.add("query", trace.start, 0.003)
+
+        totals = trace.totals()
+        assert list(totals) == ["query", "acquire"]
+        assert totals["query"] == pytest.approx(0.005)
+
+    def test_server_timing_format(self):
+        """Test the header lists each span in ms and ends with total"""
+        trace = Trace()
+        trace.add("query", trace.start, 0.0125)
+
+        metrics = trace.server_timing().split(", ")
+        assert metrics[0] == "query;dur=12.50"
+        assert metrics[-1].startswith("total;dur=")
+
+    def test_fields_are_flat(self):
+        """Test structured log fields use <span>_ms keys"""
+        trace = Trace()
+        trace.add("acquire", trace.start, 0.001)
+
+        fields = trace.fields()
+        assert fields["acquire_ms"] == 1.0
+        assert "total_ms" in fields and "trace_id" in fields
+
+    def test_span_outside_request_is_noop(self):
+        """Test span() works without an active trace"""
+        assert current_trace() is None
+        with span("query"):
+            pass
+
+
+# ==============================================================================
+# SECTION 2: MIDDLEWARE & RESPONSE
+# ==============================================================================
+
+class TestMiddleware:
+    """Tests for the ASGI wrapper"""
+
+    def test_server_timing_header_added(self):
+        """Test spans recorded by the app reach the response header"""
+        messages = run_app(traced_app)
+
+        headers = dict(messages[0]["headers"])
+        timing = headers[b"server-timing"].decode()
+        assert timing.startswith("query;dur=")
+        assert "models;dur=" in timing
+        assert "total;dur=" in timing
+        assert timing.count("query;") == 1
+
+    def test_json_rendering_is_traced(self):
+        """Test TracedJSONResponse records an encode span"""
+        async def app(scope, receive, send):
+            await TracedJSONResponse({"ok": True})(scope, receive, send)
+
+        messages = run_app(app)
+        timing = dict(messages[0]["headers"])[b"server-timing"].decode()
+        assert timing.startswith("encode;dur=")
+
+
+# ==============================================================================
+# SECTION 3: EXPORT
+# ==============================================================================
+
+class TestExporter:
+    """Tests for the JSONL exporter"""
+
+    def test_sampled_traces_are_written(self, tmp_path):
+        """Test every trace is written at sample_rate=1"""
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlTraceExporter(str(path), sample_rate=1.0)
+
+        run_app(traced_app, exporter=exporter)
+        run_app(traced_app, exporter=exporter, path="/projects")
+        exporter.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["path"] for line in lines] == ["/users", "/projects"]
+        assert lines[0]["status_code"] == 200
+        assert [s["name"] for s in lines[0]["spans"]] == ["query", "query", "models"]
+
+    def test_zero_sample_rate_exports_nothing(self, tmp_path):
+        """Test sample_rate=0 never starts the writer"""
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlTraceExporter(str(path), sample_rate=0.0)
+
+        run_app(traced_app, exporter=exporter)
+        exporter.close()
+
+        assert exporter.exported == 0
+        assert not path.exists()